@@ -0,0 +1,67 @@
+"""Debug endpoints (admin only, hidden from the OpenAPI schema)."""
+
+from dataclasses import asdict
+from typing import Any
+
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from fastapi.responses import FileResponse
+
+from app.config import get_settings
+from app.observability.profiling import (
+    PROFILE_FORMATS,
+    check_token,
+    get_profile_store,
+)
+from app.observability.startup import get_startup_report
+
+router = APIRouter()
+
+
+def _require_profiling_token(token: str | None) -> None:
+    """Fail with 404 unless the profiling token is configured and matches."""
+    if not check_token(token, get_settings().profiling_token):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+
+@router.get("/startup")
+async def startup_report(
+    top: int = Query(25, ge=1, le=500, description="Slowest modules to list"),
+    x_profile_token: str | None = Header(None),
+) -> dict[str, Any]:
+    """Import-time breakdown and phase timings of this worker's startup."""
+    _require_profiling_token(x_profile_token)
+    return get_startup_report().as_dict(top=top)
+
+
+@router.get("/profiles")
+async def list_profiles(
+    x_profile_token: str | None = Header(None),
+) -> list[dict[str, Any]]:
+    """List the stored request profiles, newest first."""
+    _require_profiling_token(x_profile_token)
+    return [asdict(record) for record in get_profile_store().list()]
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    format: str = Query("speedscope", description="speedscope or pstats"),
+    x_profile_token: str | None = Header(None),
+) -> FileResponse:
+    """Download a stored request profile."""
+    _require_profiling_token(x_profile_token)
+    path = get_profile_store().path(profile_id, format)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile '{profile_id}' not found in format '{format}'",
+        )
+    return FileResponse(
+        path,
+        media_type=(
+            "application/json"
+            if PROFILE_FORMATS[format].endswith(".json")
+            else "application/octet-stream"
+        ),
+        filename=path.name,
+    )
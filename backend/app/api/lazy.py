@@ -0,0 +1,30 @@
+"""Routers imported on their first request instead of at startup."""
+
+from importlib import import_module
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.observability.startup import get_startup_report
+
+
+class LazyRouter:
+    """ASGI app importing ``module:attribute`` router on first use.
+
+    Mount it under the router's prefix. Its routes are left out of the
+    OpenAPI schema, so only use it for routers hidden from the schema.
+    """
+
+    def __init__(self, target: str) -> None:
+        self.target = target
+        self._router: ASGIApp | None = None
+
+    def load(self) -> ASGIApp:
+        """Import the router (once), timed as a startup phase."""
+        if self._router is None:
+            module, _, attribute = self.target.partition(":")
+            with get_startup_report().phase(f"lazy_router {module}"):
+                self._router = getattr(import_module(module), attribute)
+        return self._router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.load()(scope, receive, send)
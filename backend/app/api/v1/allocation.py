@@ -1,12 +1,33 @@
 """Allocation API endpoints."""
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
+from app.domain.allocation.capacity import simulate_site_capacity
 from app.domain.allocation.naming import NamingConvention
-from app.domain.allocation.rules import AllocationRules, VlanCategory
+from app.domain.allocation.profiles import (
+    get_allocation_profile,
+    get_allocation_profiles,
+)
+from app.domain.allocation.rules import (
+    AllocationRules,
+    HostSubnetPlan,
+    PrefixRange,
+)
+from app.domain.services.naming_service import NamingService
+from app.domain.services.sequence_service import SequenceService
 from app.infrastructure.netbox.client import get_netbox_client
+from app.observability.budget import expect_netbox_calls, netbox_budget
+from app.observability.tracing import tracer
 from app.schemas.allocation import (
     AllocationPlanResponse,
+    AllocationProfileResponse,
+    BulkNamingRequest,
+    BulkNamingResponse,
+    CapacitySimulationRequest,
+    CapacitySimulationResponse,
+    CompactAllocationPlanResponse,
+    HostSubnetRangeRequest,
+    HostSubnetRangeResponse,
     PrefixAllocationRequest,
     PrefixAllocationResponse,
     SiteAllocationRequest,
@@ -19,9 +40,54 @@ from app.utils.slug import generate_slug
 router = APIRouter()
 
 
+def _get_rules(profile: str) -> type[AllocationRules]:
+    """Resolve an allocation profile name, or fail with 404."""
+    try:
+        return get_allocation_profile(profile)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Allocation profile '{profile}' not found",
+        ) from e
+
+
+def _plan_host_subnets(
+    rules: type[AllocationRules], request: PrefixAllocationRequest
+) -> HostSubnetPlan:
+    """Plan the host subnets of a request, or fail with 400."""
+    try:
+        return rules.plan_host_subnets(
+            request.base_network, request.rack_count, request.hosts_per_rack
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid host subnet plan: {e}",
+        ) from e
+
+
+@router.get("/profiles", response_model=list[AllocationProfileResponse])
+async def get_profiles() -> list[AllocationProfileResponse]:
+    """List the available allocation profiles."""
+    return [
+        AllocationProfileResponse(
+            name=name,
+            description=(rules.__doc__ or "").strip().splitlines()[0],
+            container_prefix_size=rules.CONTAINER_PREFIX_SIZE,
+            vlan_subnet_size=rules.VLAN_SUBNET_SIZE,
+            host_subnet_size=rules.HOST_SUBNET_SIZE,
+            vlan_count=len(rules.VLAN_DEFINITIONS),
+        )
+        for name, rules in get_allocation_profiles().items()
+    ]
+
+
 @router.get("/vlan-definitions", response_model=list[VlanDefinitionResponse])
-async def get_vlan_definitions() -> list[VlanDefinitionResponse]:
+async def get_vlan_definitions(
+    profile: str = Query("default", description="Allocation profile name"),
+) -> list[VlanDefinitionResponse]:
     """Get all predefined VLAN definitions."""
+    rules = _get_rules(profile)
     return [
         VlanDefinitionResponse(
             vid=vlan.vid,
@@ -29,13 +95,16 @@ async def get_vlan_definitions() -> list[VlanDefinitionResponse]:
             description=vlan.description,
             category=vlan.category.value,
         )
-        for vlan in AllocationRules.VLAN_DEFINITIONS
+        for vlan in rules.VLAN_DEFINITIONS
     ]
 
 
 @router.get("/vlan-ranges", response_model=list[VlanRangeResponse])
-async def get_vlan_ranges() -> list[VlanRangeResponse]:
+async def get_vlan_ranges(
+    profile: str = Query("default", description="Allocation profile name"),
+) -> list[VlanRangeResponse]:
     """Get VLAN ranges by category."""
+    rules = _get_rules(profile)
     return [
         VlanRangeResponse(
             category=category.value,
@@ -43,25 +112,29 @@ async def get_vlan_ranges() -> list[VlanRangeResponse]:
             end=vlan_range.end,
             description=vlan_range.description,
         )
-        for category, vlan_range in AllocationRules.VLAN_RANGES.items()
+        for category, vlan_range in rules.VLAN_RANGES.items()
     ]
 
 
-@router.post("/plan", response_model=AllocationPlanResponse)
-async def create_allocation_plan(
+def _plan_site(
     request: PrefixAllocationRequest,
-) -> AllocationPlanResponse:
+) -> tuple[
+    str, list[PrefixAllocationResponse], HostSubnetPlan, list[VlanDefinitionResponse]
+]:
     """
-    Generate an allocation plan for prefixes and VLANs.
+    Plan the prefixes and VLANs shared by /plan and /plan/compact.
 
-    This endpoint calculates all prefixes and VLANs that would be created
-    based on the allocation rules without actually creating them.
+    Returns:
+        (container prefix, VLAN and overflow subnets, host subnet plan,
+        VLANs to create)
     """
+    rules = _get_rules(request.profile)
+
     # Generate container and VLAN subnets
     vlan_subnets = []
     container_prefix = ""
 
-    for allocation in AllocationRules.generate_vlan_subnets(request.base_network):
+    for allocation in rules.generate_vlan_subnets(request.base_network):
         if allocation.is_container:
             container_prefix = allocation.prefix
         else:
@@ -75,29 +148,52 @@ async def create_allocation_plan(
                 )
             )
 
-    # Generate host subnets for each VLAN subnet
-    host_subnets = []
-    for vlan_subnet in vlan_subnets:
-        for host in AllocationRules.generate_host_subnets(
-            vlan_subnet.prefix, request.rack_count
-        ):
-            host_subnets.append(
-                PrefixAllocationResponse(
-                    prefix=host.prefix,
-                    description=host.description,
-                    parent_prefix=host.parent_prefix,
-                )
-            )
+    # Plan host subnets, spilling large sites into overflow VLAN blocks
+    host_plan = _plan_host_subnets(rules, request)
+    vlan_subnets.extend(
+        PrefixAllocationResponse(
+            prefix=overflow.prefix,
+            description=overflow.description,
+            vlan_vid=overflow.vlan_vid,
+            parent_prefix=overflow.parent_prefix,
+        )
+        for overflow in host_plan.overflow_subnets
+    )
 
     # VLAN definitions to create
-    vlans_to_create = [
-        VlanDefinitionResponse(
-            vid=vlan.vid,
-            name=vlan.name,
-            description=vlan.description,
-            category=vlan.category.value,
+    vlans_to_create = []
+    if request.create_vlans:
+        vlans_to_create = [
+            VlanDefinitionResponse(
+                vid=vlan.vid,
+                name=vlan.name,
+                description=vlan.description,
+                category=vlan.category.value,
+            )
+            for vlan in rules.VLAN_DEFINITIONS
+        ]
+
+    return container_prefix, vlan_subnets, host_plan, vlans_to_create
+
+
+@router.post("/plan", response_model=AllocationPlanResponse)
+async def create_allocation_plan(
+    request: PrefixAllocationRequest,
+) -> AllocationPlanResponse:
+    """
+    Generate an allocation plan for prefixes and VLANs.
+
+    This endpoint calculates all prefixes and VLANs that would be created
+    based on the allocation rules without actually creating them.
+    """
+    container_prefix, vlan_subnets, host_plan, vlans_to_create = _plan_site(request)
+    host_subnets = [
+        PrefixAllocationResponse(
+            prefix=host.prefix,
+            description=host.description,
+            parent_prefix=host.parent_prefix,
         )
-        for vlan in AllocationRules.VLAN_DEFINITIONS
+        for host in host_plan.iter_host_subnets()
     ]
 
     return AllocationPlanResponse(
@@ -105,9 +201,124 @@ async def create_allocation_plan(
         container_prefix=container_prefix,
         vlan_subnets=vlan_subnets,
         host_subnets=host_subnets,
-        vlans_to_create=vlans_to_create if request.create_vlans else [],
-        total_prefixes=1 + len(vlan_subnets) + len(host_subnets),  # container + vlan + host
-        total_vlans=len(vlans_to_create) if request.create_vlans else 0,
+        vlans_to_create=vlans_to_create,
+        # Container + VLAN subnets + host subnets
+        total_prefixes=1 + len(vlan_subnets) + len(host_subnets),
+        total_vlans=len(vlans_to_create),
+        warnings=host_plan.warnings,
+    )
+
+
+@router.post("/plan/compact", response_model=CompactAllocationPlanResponse)
+async def create_compact_allocation_plan(
+    request: PrefixAllocationRequest,
+) -> CompactAllocationPlanResponse:
+    """
+    Generate an allocation plan with range-encoded host subnets.
+
+    Each VLAN subnet's host subnets are described by a single range record
+    (parent, child length, start index, count) instead of one object per
+    rack. Use /plan/expand to materialize a range, or /plan for the full plan.
+    """
+    container_prefix, vlan_subnets, host_plan, vlans_to_create = _plan_site(request)
+    host_subnet_ranges = [
+        HostSubnetRangeResponse(
+            parent_prefix=host_range.parent_prefix,
+            prefix_length=host_range.prefix_length,
+            start_index=host_range.start_index,
+            count=host_range.count,
+            vlan_vid=host_range.vlan_vid,
+            rack_offset=host_range.rack_offset,
+        )
+        for host_range in host_plan.host_ranges
+    ]
+    total_hosts = sum(host_range.count for host_range in host_subnet_ranges)
+
+    return CompactAllocationPlanResponse(
+        base_network=request.base_network,
+        container_prefix=container_prefix,
+        vlan_subnets=vlan_subnets,
+        host_subnet_ranges=host_subnet_ranges,
+        vlans_to_create=vlans_to_create,
+        total_prefixes=1 + len(vlan_subnets) + total_hosts,  # container + vlan + host
+        total_vlans=len(vlans_to_create),
+        warnings=host_plan.warnings,
+    )
+
+
+@router.post("/plan/expand", response_model=list[PrefixAllocationResponse])
+async def expand_host_subnet_range(
+    host_range: HostSubnetRangeRequest,
+) -> list[PrefixAllocationResponse]:
+    """Expand a range-encoded host subnet record into individual prefixes."""
+    try:
+        hosts = AllocationRules.expand_host_subnet_range(
+            PrefixRange(
+                parent_prefix=host_range.parent_prefix,
+                prefix_length=host_range.prefix_length,
+                start_index=host_range.start_index,
+                count=host_range.count,
+                vlan_vid=host_range.vlan_vid,
+                rack_offset=host_range.rack_offset,
+            )
+        )
+        return [
+            PrefixAllocationResponse(
+                prefix=host.prefix,
+                description=host.description,
+                parent_prefix=host.parent_prefix,
+            )
+            for host in hosts
+        ]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid host subnet range: {e}",
+        ) from e
+
+
+@router.post("/simulate", response_model=CapacitySimulationResponse)
+async def simulate_capacity(
+    request: CapacitySimulationRequest,
+) -> CapacitySimulationResponse:
+    """
+    Simulate allocating many sites across a pool.
+
+    Replays hypothetical site allocations in memory, without touching
+    NetBox, and reports how many sites fit and the free space left.
+    """
+    rules = _get_rules(request.profile)
+    rack_counts = request.rack_counts or [request.rack_count] * request.site_count
+    try:
+        report = simulate_site_capacity(
+            request.pool,
+            rack_counts,
+            request.reserved_prefixes,
+            rules,
+            request.hosts_per_rack,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid simulation: {e}",
+        ) from e
+
+    return CapacitySimulationResponse(
+        pool=report.pool,
+        pool_addresses=report.pool_addresses,
+        requested_sites=report.requested_sites,
+        allocated_sites=report.allocated_sites,
+        exhausted_at=report.exhausted_at,
+        remaining_sites=report.remaining_sites,
+        container_addresses=report.container_addresses,
+        vlan_subnet_addresses=report.vlan_subnet_addresses,
+        host_subnet_addresses=report.host_subnet_addresses,
+        under_provisioned_sites=report.under_provisioned_sites,
+        free_addresses=report.free_addresses,
+        utilization=report.utilization,
+        host_utilization=report.host_utilization,
+        free_blocks=report.free_blocks,
+        largest_free_block=report.largest_free_block,
     )
 
 
@@ -126,52 +337,74 @@ async def execute_allocation(
     nb = get_netbox_client()
 
     # First, generate the plan
-    plan = await create_allocation_plan(request)
+    with tracer.start_as_current_span("allocation.execute.plan"):
+        plan = await create_allocation_plan(request)
+
+    # One NetBox create per planned object, on top of the usual budget
+    expect_netbox_calls("POST", "ipam/prefixes", plan.total_prefixes)
+    expect_netbox_calls("POST", "ipam/vlans", plan.total_vlans)
 
     try:
         # Create container prefix
-        nb.ipam.prefixes.create({
-            "prefix": plan.container_prefix,
-            "status": "container",
-            "description": f"Container prefix for {request.base_network}",
-            "site": request.site_id,
-            "tenant": request.tenant_id,
-        })
+        with tracer.start_as_current_span("allocation.execute.container"):
+            nb.ipam.prefixes.create({
+                "prefix": plan.container_prefix,
+                "status": "container",
+                "description": f"Container prefix for {request.base_network}",
+                "site": request.site_id,
+                "tenant": request.tenant_id,
+            })
 
         # Create VLANs if requested
         vlan_id_map = {}
         if request.create_vlans:
-            for vlan_def in plan.vlans_to_create:
-                vlan = nb.ipam.vlans.create({
-                    "vid": vlan_def.vid,
-                    "name": NamingConvention.generate_vlan_name(vlan_def.vid, vlan_def.name),
+            with tracer.start_as_current_span(
+                "allocation.execute.vlans",
+                attributes={"allocation.count": len(plan.vlans_to_create)},
+            ):
+                for vlan_def in plan.vlans_to_create:
+                    vlan = nb.ipam.vlans.create({
+                        "vid": vlan_def.vid,
+                        "name": NamingConvention.generate_vlan_name(
+                            vlan_def.vid, vlan_def.name
+                        ),
+                        "status": "active",
+                        "description": vlan_def.description,
+                        "site": request.site_id,
+                        "tenant": request.tenant_id,
+                    })
+                    vlan_id_map[vlan_def.vid] = vlan.id
+
+        # Create VLAN subnets
+        with tracer.start_as_current_span(
+            "allocation.execute.vlan_subnets",
+            attributes={"allocation.count": len(plan.vlan_subnets)},
+        ):
+            for subnet in plan.vlan_subnets:
+                nb.ipam.prefixes.create({
+                    "prefix": subnet.prefix,
                     "status": "active",
-                    "description": vlan_def.description,
+                    "description": subnet.description,
                     "site": request.site_id,
                     "tenant": request.tenant_id,
+                    "vlan": (
+                        vlan_id_map.get(subnet.vlan_vid) if subnet.vlan_vid else None
+                    ),
                 })
-                vlan_id_map[vlan_def.vid] = vlan.id
-
-        # Create VLAN subnets
-        for subnet in plan.vlan_subnets:
-            nb.ipam.prefixes.create({
-                "prefix": subnet.prefix,
-                "status": "active",
-                "description": subnet.description,
-                "site": request.site_id,
-                "tenant": request.tenant_id,
-                "vlan": vlan_id_map.get(subnet.vlan_vid) if subnet.vlan_vid else None,
-            })
 
         # Create host subnets
-        for host in plan.host_subnets:
-            nb.ipam.prefixes.create({
-                "prefix": host.prefix,
-                "status": "active",
-                "description": host.description,
-                "site": request.site_id,
-                "tenant": request.tenant_id,
-            })
+        with tracer.start_as_current_span(
+            "allocation.execute.host_subnets",
+            attributes={"allocation.count": len(plan.host_subnets)},
+        ):
+            for host in plan.host_subnets:
+                nb.ipam.prefixes.create({
+                    "prefix": host.prefix,
+                    "status": "active",
+                    "description": host.description,
+                    "site": request.site_id,
+                    "tenant": request.tenant_id,
+                })
 
         # Update status to created
         for subnet in plan.vlan_subnets:
@@ -183,7 +416,7 @@ async def execute_allocation(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to execute allocation: {e}",
-        )
+        ) from e
 
     return plan
 
@@ -199,22 +432,36 @@ async def allocate_site(
     all naming conventions and allocation patterns.
     """
     nb = get_netbox_client()
+    sequences = SequenceService()
 
-    # Generate names using conventions
-    tenant_name = request.tenant_name or NamingConvention.generate_tenant_name(
-        country="br",
-        region=request.region_code,
-        number=1,
-    )
-    facility_code = request.facility_code or NamingConvention.generate_facility_code(
-        city_code=request.region_code.upper(),
-        dc_number=1,
-    )
+    # Generate names using conventions, numbered after the region's existing
+    # tenants and facilities (numbers are only reserved for real runs)
+    leases = []
+    tenant_name = request.tenant_name
+    facility_code = request.facility_code
+    try:
+        if not tenant_name:
+            tenant_name, lease = sequences.next_tenant_name(
+                "br", request.region_code, reserve=not request.dry_run
+            )
+            leases.append(lease)
+        if not facility_code:
+            facility_code, lease = sequences.next_facility_code(
+                request.region_code, reserve=not request.dry_run
+            )
+            leases.append(lease)
+    except ValueError as e:
+        sequences.release(*leases)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Failed to number site: {e}",
+        ) from e
 
     site_data = {
         "name": request.site_name,
         "slug": generate_slug(request.site_name),
         "status": "planned",
+        "facility": facility_code,
         "description": f"Data center {request.site_name} - {facility_code}",
     }
     tenant_data = {
@@ -229,8 +476,10 @@ async def allocate_site(
             PrefixAllocationRequest(
                 base_network=request.base_network,
                 rack_count=request.rack_count,
+                hosts_per_rack=request.hosts_per_rack,
                 create_vlans=True,
                 dry_run=True,
+                profile=request.profile,
             )
         )
 
@@ -258,8 +507,10 @@ async def allocate_site(
                 site_id=site.id,
                 tenant_id=tenant.id,
                 rack_count=request.rack_count,
+                hosts_per_rack=request.hosts_per_rack,
                 create_vlans=True,
                 dry_run=False,
+                profile=request.profile,
             )
         )
 
@@ -271,10 +522,27 @@ async def allocate_site(
         )
 
     except Exception as e:
+        sequences.release(*leases)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to allocate site: {e}",
-        )
+        ) from e
+
+
+@router.post(
+    "/naming/bulk",
+    response_model=BulkNamingResponse,
+    dependencies=[Depends(netbox_budget(calls=None))],
+)
+async def generate_names_bulk(request: BulkNamingRequest) -> BulkNamingResponse:
+    """
+    Generate rack and device names and slugs in bulk.
+
+    Names are checked against the existing NetBox racks and devices and
+    against each other; collisions get deterministic "-2", "-3" suffixes,
+    so the returned list can be created without per-name failures.
+    """
+    return NamingService().generate_bulk(request.items)
 
 
 @router.get("/naming/preview")
@@ -288,16 +556,20 @@ async def preview_naming(
 
     Returns examples of all generated names following conventions.
     """
+    tenant_name = NamingConvention.generate_tenant_name("br", region_code, 1)
+    site_code = region_code + "1"
     return {
         "site": {
             "name": site_name,
             "slug": generate_slug(site_name),
         },
         "tenant": {
-            "name": NamingConvention.generate_tenant_name("br", region_code, 1),
-            "slug": generate_slug(NamingConvention.generate_tenant_name("br", region_code, 1)),
+            "name": tenant_name,
+            "slug": generate_slug(tenant_name),
         },
-        "facility_code": NamingConvention.generate_facility_code(region_code.upper(), 1),
+        "facility_code": NamingConvention.generate_facility_code(
+            region_code.upper(), 1
+        ),
         "vlans": [
             {
                 "vid": vlan.vid,
@@ -307,11 +579,11 @@ async def preview_naming(
             for vlan in AllocationRules.VLAN_DEFINITIONS[:4]  # Show first 4 as example
         ],
         "racks": [
-            NamingConvention.generate_rack_name(region_code.upper() + "1", "A", i)
+            NamingConvention.generate_rack_name(site_code.upper(), "A", i)
             for i in range(1, min(rack_count + 1, 6))
         ],
         "devices": {
-            "spine": NamingConvention.generate_device_name("spine", region_code + "1", 1),
-            "leaf": NamingConvention.generate_device_name("leaf", region_code + "1", 1),
+            "spine": NamingConvention.generate_device_name("spine", site_code, 1),
+            "leaf": NamingConvention.generate_device_name("leaf", site_code, 1),
         },
     }
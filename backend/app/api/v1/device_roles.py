@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, HTTPException, status
 
+from app.domain.services.reference_service import get_reference_data
 from app.infrastructure.netbox.client import get_netbox_client
 from app.schemas.device_role import DeviceRoleCreate, DeviceRoleResponse, DeviceRoleUpdate
 from app.utils.slug import generate_slug
@@ -38,7 +39,7 @@ async def list_device_roles(
 async def get_device_role(role_id: int) -> DeviceRoleResponse:
     """Get a specific device role by ID."""
     nb = get_netbox_client()
-    role = nb.dcim.device_roles.get(role_id)
+    role = get_reference_data().get(nb, "roles", role_id)
 
     if not role:
         raise HTTPException(
@@ -75,6 +76,7 @@ async def create_device_role(role_data: DeviceRoleCreate) -> DeviceRoleResponse:
 
     try:
         role = nb.dcim.device_roles.create(data)
+        get_reference_data().put("roles", role)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -107,6 +109,7 @@ async def delete_device_role(role_id: int) -> None:
 
     try:
         role.delete()
+        get_reference_data().invalidate("roles", role_id)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
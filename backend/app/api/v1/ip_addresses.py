@@ -0,0 +1,67 @@
+"""API routes for IP Address management."""
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.domain.services.ip_address_service import IpAddressService
+from app.schemas.ip_address import (
+    IpAddressCreate,
+    IpAddressResponse,
+    IpAddressUpdate,
+)
+
+router = APIRouter()
+
+
+@router.get("/", response_model=list[IpAddressResponse])
+async def list_ip_addresses(
+    parent: str | None = Query(None, description="Filter by parent prefix"),
+    tenant_id: int | None = Query(None, description="Filter by tenant"),
+    status: str | None = Query(None, description="Filter by status"),
+    limit: int = Query(50, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+) -> list[IpAddressResponse]:
+    """List IP addresses with optional filtering."""
+    service = IpAddressService()
+    return await service.list_ip_addresses(
+        parent=parent,
+        tenant_id=tenant_id,
+        status=status,
+        limit=limit,
+        offset=offset,
+    )
+
+
+@router.get("/{ip_id}", response_model=IpAddressResponse)
+async def get_ip_address(ip_id: int) -> IpAddressResponse:
+    """Get a specific IP address by ID."""
+    service = IpAddressService()
+    ip = await service.get_ip_address(ip_id)
+    if not ip:
+        raise HTTPException(status_code=404, detail="IP address not found")
+    return ip
+
+
+@router.post("/", response_model=IpAddressResponse, status_code=201)
+async def create_ip_address(data: IpAddressCreate) -> IpAddressResponse:
+    """Create a new IP address."""
+    service = IpAddressService()
+    return await service.create_ip_address(data)
+
+
+@router.patch("/{ip_id}", response_model=IpAddressResponse)
+async def update_ip_address(ip_id: int, data: IpAddressUpdate) -> IpAddressResponse:
+    """Update an existing IP address."""
+    service = IpAddressService()
+    ip = await service.update_ip_address(ip_id, data)
+    if not ip:
+        raise HTTPException(status_code=404, detail="IP address not found")
+    return ip
+
+
+@router.delete("/{ip_id}", status_code=204)
+async def delete_ip_address(ip_id: int) -> None:
+    """Delete an IP address."""
+    service = IpAddressService()
+    deleted = await service.delete_ip_address(ip_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="IP address not found")
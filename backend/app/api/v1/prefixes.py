@@ -1,11 +1,31 @@
 """API routes for IP Prefix management."""
 
-from fastapi import APIRouter, HTTPException, Query
-from app.schemas.prefix import PrefixCreate, PrefixUpdate, PrefixResponse
-from app.domain.services.prefix_service import PrefixService
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.domain.services.ip_address_service import IpAddressService
+from app.domain.services.lookup_service import PrefixLookupService
+from app.observability.budget import netbox_budget
+from app.schemas.ip_address import AvailableIpRequest, IpAddressResponse
+from app.schemas.prefix import (
+    AvailablePrefixRequest,
+    PrefixAuditResponse,
+    PrefixCreate,
+    PrefixLookupRequest,
+    PrefixLookupResult,
+    PrefixSummarizeRequest,
+    PrefixSummaryResponse,
+    PrefixUpdate,
+    PrefixResponse,
+    PrefixUtilizationResponse,
+)
+from app.domain.services.prefix_service import PrefixExhaustedError, PrefixService
 
 router = APIRouter()
 
+# Routes reading whole listings, whose page count grows with the inventory
+LISTING_BUDGET = [Depends(netbox_budget(calls=None))]
+
 
 @router.get("/", response_model=list[PrefixResponse])
 async def list_prefixes(
@@ -28,6 +48,104 @@ async def list_prefixes(
     )
 
 
+@router.get("/tree", dependencies=LISTING_BUDGET)
+async def get_prefix_tree(
+    site_id: int | None = Query(None, description="Site whose prefixes to nest"),
+    root_id: int | None = Query(None, description="Expand only this prefix"),
+    depth: int | None = Query(None, ge=0, description="Deepest level to return"),
+) -> StreamingResponse:
+    """
+    Stream the prefix hierarchy depth-first as newline-delimited JSON.
+
+    Each line is a PrefixTreeNodeResponse. Pass ``root_id`` (and usually
+    ``depth=0``) to lazily expand the children of a single node.
+    """
+    if site_id is None and root_id is None:
+        raise HTTPException(status_code=400, detail="site_id or root_id is required")
+
+    service = PrefixService()
+    nodes = await service.get_prefix_tree(site_id, root_id, depth)
+    if nodes is None:
+        raise HTTPException(status_code=404, detail="Prefix not found")
+
+    return StreamingResponse(
+        (node.model_dump_json() + "\n" for node in nodes),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/audit", response_model=PrefixAuditResponse, dependencies=LISTING_BUDGET)
+async def audit_prefixes(
+    limit: int = Query(1000, ge=0, le=100000, description="Max findings listed"),
+) -> PrefixAuditResponse:
+    """Find duplicate prefixes and prefixes nested across sites or tenants."""
+    service = PrefixService()
+    try:
+        return await service.audit(limit=limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+
+
+@router.post(
+    "/lookup",
+    response_model=list[PrefixLookupResult],
+    dependencies=LISTING_BUDGET,
+)
+async def lookup_prefixes(data: PrefixLookupRequest) -> list[PrefixLookupResult]:
+    """Map a batch of addresses to their most specific prefix, VLAN and site."""
+    service = PrefixLookupService()
+    return await service.lookup(data.addresses)
+
+
+@router.post(
+    "/summarize",
+    response_model=PrefixSummaryResponse,
+    dependencies=LISTING_BUDGET,
+)
+async def summarize_prefixes(data: PrefixSummarizeRequest) -> PrefixSummaryResponse:
+    """Collapse posted or filtered prefixes into the minimal covering CIDRs."""
+    service = PrefixService()
+    try:
+        return await service.summarize(
+            prefixes=data.prefixes,
+            site_id=data.site_id,
+            tenant_id=data.tenant_id,
+            status=data.status.value if data.status else None,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+@router.get(
+    "/summarize",
+    response_model=PrefixSummaryResponse,
+    dependencies=LISTING_BUDGET,
+)
+async def summarize_site_prefixes(
+    site_id: int | None = Query(None, description="Filter by site"),
+    tenant_id: int | None = Query(None, description="Filter by tenant"),
+    status: str | None = Query(None, description="Filter by status"),
+) -> PrefixSummaryResponse:
+    """Summarize the prefixes of a site and/or tenant for route export."""
+    service = PrefixService()
+    return await service.summarize(
+        site_id=site_id, tenant_id=tenant_id, status=status
+    )
+
+
+@router.get(
+    "/utilization",
+    response_model=list[PrefixUtilizationResponse],
+    dependencies=LISTING_BUDGET,
+)
+async def list_site_utilization(
+    site_id: int = Query(..., description="Site whose containers to report"),
+) -> list[PrefixUtilizationResponse]:
+    """Get utilization of every container prefix of a site."""
+    service = PrefixService()
+    return await service.list_site_utilization(site_id)
+
+
 @router.get("/{prefix_id}", response_model=PrefixResponse)
 async def get_prefix(prefix_id: int) -> PrefixResponse:
     """Get a specific IP prefix by ID."""
@@ -38,6 +156,16 @@ async def get_prefix(prefix_id: int) -> PrefixResponse:
     return prefix
 
 
+@router.get("/{prefix_id}/utilization", response_model=PrefixUtilizationResponse)
+async def get_prefix_utilization(prefix_id: int) -> PrefixUtilizationResponse:
+    """Get used/free space and free-block histogram of a prefix."""
+    service = PrefixService()
+    utilization = await service.get_utilization(prefix_id)
+    if not utilization:
+        raise HTTPException(status_code=404, detail="Prefix not found")
+    return utilization
+
+
 @router.post("/", response_model=PrefixResponse, status_code=201)
 async def create_prefix(data: PrefixCreate) -> PrefixResponse:
     """Create a new IP prefix."""
@@ -45,6 +173,48 @@ async def create_prefix(data: PrefixCreate) -> PrefixResponse:
     return await service.create_prefix(data)
 
 
+@router.post(
+    "/{prefix_id}/available-prefixes", response_model=PrefixResponse, status_code=201
+)
+async def allocate_available_prefix(
+    prefix_id: int, data: AvailablePrefixRequest
+) -> PrefixResponse:
+    """Allocate the next available child prefix within a parent prefix."""
+    service = PrefixService()
+    try:
+        prefix = await service.allocate_next_prefix(prefix_id, data)
+    except PrefixExhaustedError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    if not prefix:
+        raise HTTPException(status_code=404, detail="Prefix not found")
+    return prefix
+
+
+@router.post(
+    "/{prefix_id}/available-ips",
+    response_model=list[IpAddressResponse],
+    status_code=201,
+)
+async def allocate_available_ips(
+    prefix_id: int,
+    count: int = Query(1, ge=1, le=1024, description="Number of addresses"),
+    data: AvailableIpRequest | None = None,
+) -> list[IpAddressResponse]:
+    """Allocate the next available IP addresses within a prefix."""
+    service = IpAddressService()
+    try:
+        ips = await service.allocate_available_ips(
+            prefix_id, count, data or AvailableIpRequest()
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    if ips is None:
+        raise HTTPException(status_code=404, detail="Prefix not found")
+    return ips
+
+
 @router.patch("/{prefix_id}", response_model=PrefixResponse)
 async def update_prefix(prefix_id: int, data: PrefixUpdate) -> PrefixResponse:
     """Update an existing IP prefix."""
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, HTTPException, status
 
+from app.domain.services.reference_service import get_reference_data
 from app.infrastructure.netbox.client import get_netbox_client
 from app.schemas.site import SiteCreate, SiteResponse, SiteUpdate
 from app.utils.slug import generate_slug
@@ -46,7 +47,7 @@ async def list_sites(
 async def get_site(site_id: int) -> SiteResponse:
     """Get a specific site by ID."""
     nb = get_netbox_client()
-    site = nb.dcim.sites.get(site_id)
+    site = get_reference_data().get(nb, "sites", site_id)
 
     if not site:
         raise HTTPException(
@@ -86,6 +87,7 @@ async def create_site(site_data: SiteCreate) -> SiteResponse:
 
     try:
         site = nb.dcim.sites.create(data)
+        get_reference_data().put("sites", site)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -129,8 +131,15 @@ async def update_site(site_id: int, site_data: SiteUpdate) -> SiteResponse:
             detail=str(e),
         )
 
-    # Refresh site data
+    # Refresh site data (it may have been deleted since the update)
     site = nb.dcim.sites.get(site_id)
+    if not site:
+        get_reference_data().invalidate("sites", site_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Site with ID {site_id} not found",
+        )
+    get_reference_data().put("sites", site)
 
     return SiteResponse(
         id=site.id,
@@ -158,6 +167,7 @@ async def delete_site(site_id: int) -> None:
 
     try:
         site.delete()
+        get_reference_data().invalidate("sites", site_id)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, HTTPException, status
 
+from app.domain.services.reference_service import get_reference_data
 from app.infrastructure.netbox.client import get_netbox_client
 from app.schemas.tag import TagCreate, TagResponse, TagUpdate
 from app.utils.slug import generate_slug
@@ -37,7 +38,7 @@ async def list_tags(
 async def get_tag(tag_id: int) -> TagResponse:
     """Get a specific tag by ID."""
     nb = get_netbox_client()
-    tag = nb.extras.tags.get(tag_id)
+    tag = get_reference_data().get(nb, "tags", tag_id)
 
     if not tag:
         raise HTTPException(
@@ -72,6 +73,7 @@ async def create_tag(tag_data: TagCreate) -> TagResponse:
 
     try:
         tag = nb.extras.tags.create(data)
+        get_reference_data().put("tags", tag)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -103,6 +105,7 @@ async def delete_tag(tag_id: int) -> None:
 
     try:
         tag.delete()
+        get_reference_data().invalidate("tags", tag_id)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, HTTPException, status
 
+from app.domain.services.reference_service import get_reference_data
 from app.infrastructure.netbox.client import get_netbox_client
 from app.schemas.vlan_group import VlanGroupCreate, VlanGroupResponse, VlanGroupUpdate
 from app.utils.slug import generate_slug
@@ -38,7 +39,7 @@ async def list_vlan_groups(
 async def get_vlan_group(group_id: int) -> VlanGroupResponse:
     """Get a specific VLAN group by ID."""
     nb = get_netbox_client()
-    group = nb.ipam.vlan_groups.get(group_id)
+    group = get_reference_data().get(nb, "vlan_groups", group_id)
 
     if not group:
         raise HTTPException(
@@ -78,6 +79,7 @@ async def create_vlan_group(group_data: VlanGroupCreate) -> VlanGroupResponse:
 
     try:
         group = nb.ipam.vlan_groups.create(data)
+        get_reference_data().put("vlan_groups", group)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -110,6 +112,7 @@ async def delete_vlan_group(group_id: int) -> None:
 
     try:
         group.delete()
+        get_reference_data().invalidate("vlan_groups", group_id)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
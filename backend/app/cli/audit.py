@@ -0,0 +1,44 @@
+"""Audit the prefix inventory for duplicates and cross-owner overlaps.
+
+Usage:
+    python -m app.cli.audit [--limit 100] [--json]
+"""
+
+import argparse
+import json
+import time
+from dataclasses import asdict
+
+from app.domain.allocation.audit import audit_prefixes
+from app.domain.services.prefix_service import PrefixService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=100, help="Max findings listed")
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    args = parser.parse_args()
+
+    records = PrefixService().load_audit_records()
+    start = time.perf_counter()
+    report = audit_prefixes(records, limit=args.limit)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps(asdict(report), indent=2))
+        return
+
+    print(
+        f"{report.total_prefixes} prefixes audited in {elapsed_ms:.0f} ms: "
+        f"{report.duplicate_count} duplicates, {report.overlap_count} overlaps"
+    )
+    for finding in report.findings:
+        print(
+            f"{finding.kind:<9} vrf={finding.vrf_id} "
+            f"{finding.prefix} (#{finding.prefix_id}) vs "
+            f"{finding.other_prefix} (#{finding.other_prefix_id}) {finding.detail}"
+        )
+
+
+if __name__ == "__main__":
+    main()
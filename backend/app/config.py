@@ -2,8 +2,9 @@
 
 import json
 from functools import lru_cache
+from typing import Literal
 
-from pydantic import field_validator
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -24,6 +25,47 @@ class Settings(BaseSettings):
     # NetBox Integration
     netbox_url: str = "http://localhost:8000"
     netbox_token: str = ""
+    # Max keep-alive connections kept open to NetBox per worker
+    netbox_pool_size: int = Field(default=10, ge=1)
+
+    # Allocation leases (shared by all workers on a host)
+    lease_db_path: str = "/tmp/ipam-leases.sqlite3"
+    lease_ttl_seconds: float = 30.0
+
+    # Allocation profiles (YAML/JSON file or directory; "default" is built in)
+    allocation_profiles_path: str | None = None
+
+    # Observability
+    metrics_enabled: bool = True
+    # NetBox calls per API request; "raise" fails requests over budget (tests)
+    netbox_call_budget: int | None = 50
+    netbox_repeat_budget: int | None = 10
+    netbox_budget_mode: Literal["log", "raise"] = "log"
+    # Per-request profiling, enabled by setting an admin token
+    profiling_token: str | None = None
+    profiling_dir: str = "/tmp/ipam-profiles"
+    profiling_keep: int = 20
+    # Tracing ("file" and "otlp" need the tracing extra)
+    tracing_exporter: Literal["none", "file", "otlp"] = "none"
+    tracing_file_path: str = "/tmp/ipam-traces.jsonl"
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    tracing_sample_ratio: float = Field(default=1.0, ge=0.0, le=1.0)
+
+    # Startup: import hidden routers (/debug) on their first request
+    lazy_routers: bool = True
+    # Startup: open NetBox connections and cache reference data in the
+    # background; /ready reports 503 until then
+    warmup_enabled: bool = True
+    warmup_connections: int = Field(default=4, ge=0)
+    warmup_retry_seconds: float = 5.0
+
+    # Caching (per worker: writes through other workers, or made directly in
+    # NetBox, are seen once the entry expires)
+    utilization_cache_ttl_seconds: float = 300.0
+    lookup_refresh_seconds: float = 10.0
+    lookup_rebuild_seconds: float = 3600.0
+    name_index_ttl_seconds: float = 300.0
+    reference_cache_ttl_seconds: float = 300.0
 
     # Authentication
     secret_key: str = "change-me-in-production"
@@ -0,0 +1,418 @@
+"""Inventory-wide duplicate and overlap audit.
+
+Every prefix is loaded into NumPy arrays as (VRF, family, start, length),
+with IPv6 starts split into two uint64 halves. IPv4 prefixes are parsed in
+bulk from one byte buffer; IPv6 ones one at a time. Duplicates fall out of one
+lexicographic sort as equal neighbours. Overlaps are found per prefix
+length: the starts of all longer prefixes are masked to that length and
+binary-searched among the prefixes of that length, which yields each
+prefix's immediate parent without comparing pairs.
+
+CIDR blocks never partially overlap, so nesting on its own is the normal
+container -> VLAN subnet -> host subnet hierarchy. An overlap is reported
+when a prefix is nested directly in a prefix assigned to a different site
+or tenant, which is what stray manual edits typically look like.
+
+Requires the optional ``audit`` extra (NumPy).
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
+
+from app.domain.allocation.cidr import parse_prefix
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+    Indices = NDArray[np.int64]
+    Starts = NDArray[np.uint64]
+    Lengths = NDArray[np.uint8]
+
+_NONE = -1  # stands in for a missing VRF/site/tenant id
+_ALL_ONES_64 = (1 << 64) - 1
+# Separators of an "a.b.c.d/n" line, in order
+_IPV4_SEPARATORS = b".../\n"
+
+
+@dataclass(slots=True)
+class PrefixRecord:
+    """Minimal prefix attributes needed by the audit."""
+
+    id: int
+    prefix: str
+    vrf_id: int | None = None
+    site_id: int | None = None
+    tenant_id: int | None = None
+
+
+@dataclass
+class AuditFinding:
+    """A duplicate or overlapping pair of prefixes."""
+
+    kind: str  # "duplicate" or "overlap"
+    vrf_id: int | None
+    prefix_id: int
+    prefix: str
+    other_prefix_id: int
+    other_prefix: str
+    detail: str = ""
+
+
+@dataclass
+class AuditReport:
+    """Outcome of auditing a prefix inventory."""
+
+    total_prefixes: int
+    duplicate_count: int = 0
+    overlap_count: int = 0
+    findings: list[AuditFinding] = field(default_factory=list)
+
+
+def _require_numpy() -> None:
+    """Import NumPy as the module global ``np`` on first use, not at startup."""
+    if "np" in globals():
+        return
+    try:
+        import numpy
+    except ImportError as e:
+        raise RuntimeError(
+            "NumPy is required for the prefix audit; install ipam-backend[audit]"
+        ) from e
+    globals()["np"] = numpy
+
+
+def _parse(prefix: str) -> tuple[int, int, int, int]:
+    """Parse a prefix into (family, start high 64 bits, low 64 bits, length)."""
+    version, start, prefixlen = parse_prefix(prefix)
+    return version, start >> 64, start & _ALL_ONES_64, prefixlen
+
+
+def _parse_ipv4(prefixes: list[str]) -> "tuple[Starts, Lengths] | None":
+    """
+    Parse "a.b.c.d/n" prefixes into (start, length) arrays in one pass.
+
+    All prefixes are joined into one byte buffer and the decimal fields
+    are read at the separator offsets, without a Python call per prefix.
+
+    Returns:
+        The arrays, or None if any prefix is not a plain dotted quad with a
+        length (e.g. a bare address or leading zeros), to parse one by one
+    """
+    buffer = np.frombuffer(("\n".join(prefixes) + "\n").encode(), dtype=np.uint8)
+    separators = np.flatnonzero(buffer < ord("0"))  # '.', '/' and '\n'
+    if len(separators) != 5 * len(prefixes) or not np.array_equal(
+        buffer[separators].reshape(-1, 5),
+        np.broadcast_to(
+            np.frombuffer(_IPV4_SEPARATORS, np.uint8), (len(prefixes), 5)
+        ),
+    ):
+        return None
+    if (buffer > ord("9")).any():
+        return None
+
+    # Each field is 1-3 digits ending at a separator; digits map to their
+    # value and separators to 0, so a short field reads 0 before its start
+    starts = np.empty_like(separators)
+    starts[0] = 0
+    starts[1:] = separators[:-1] + 1
+    widths = separators - starts
+    if widths.min() < 1 or widths.max() > 3:
+        return None
+    if ((buffer[starts] == ord("0")) & (widths > 1)).any():
+        return None
+    digit_values = np.zeros(256, dtype=np.uint16)
+    digit_values[ord("0") : ord("9") + 1] = np.arange(10)
+    digits = digit_values[buffer]
+    values = (
+        digits[separators - 1]
+        + digits[separators - 2] * 10
+        + digits[separators - 3] * (widths > 2) * 100
+    )
+
+    fields = values.reshape(-1, 5).astype(np.uint64)
+    octets, lengths = fields[:, :4], fields[:, 4]
+    if (octets > 255).any() or (lengths > 32).any():
+        return None
+    address = (
+        (octets[:, 0] << np.uint64(24))
+        | (octets[:, 1] << np.uint64(16))
+        | (octets[:, 2] << np.uint64(8))
+        | octets[:, 3]
+    )
+    masks = (np.uint64(0xFFFFFFFF) << (np.uint64(32) - lengths)) & np.uint64(
+        0xFFFFFFFF
+    )
+    return address & masks, lengths.astype(np.uint8)
+
+
+def _masks(family: int, length: int) -> tuple[int, int]:
+    """Netmask of a prefix length as (high, low) uint64 halves."""
+    if family == 4:
+        return 0, (0xFFFFFFFF << (32 - length)) & 0xFFFFFFFF
+    mask = ((1 << 128) - 1) ^ ((1 << (128 - length)) - 1)
+    return mask >> 64, mask & _ALL_ONES_64
+
+
+def _keys(hi: "Starts", lo: "Starts", family: int) -> "NDArray[Any]":
+    """Sortable exact-match keys: plain uint64 for IPv4, (hi, lo) for IPv6."""
+    if family == 4:
+        return lo
+    keys = np.empty(len(lo), dtype=[("hi", "u8"), ("lo", "u8")])
+    keys["hi"] = hi
+    keys["lo"] = lo
+    return keys
+
+
+class PrefixArrays:
+    """Column-oriented copy of a prefix inventory."""
+
+    def __init__(self, records: Iterable[PrefixRecord]) -> None:
+        _require_numpy()
+        self.records = list(records)
+        count = len(self.records)
+        prefixes = list(map(attrgetter("prefix"), self.records))
+        self.family = np.full(count, 4, dtype=np.uint8)
+        self.hi = np.zeros(count, dtype=np.uint64)
+        self.lo = np.zeros(count, dtype=np.uint64)
+        self.length = np.zeros(count, dtype=np.uint8)
+
+        # IPv4 in bulk; IPv6 (and anything unusual) one prefix at a time
+        slow: list[int] = []
+        parsed = _parse_ipv4(prefixes) if count else None
+        if parsed is not None:
+            self.lo, self.length = parsed
+        elif count:
+            slow = [i for i, prefix in enumerate(prefixes) if ":" in prefix]
+            ipv4 = np.ones(count, dtype=bool)
+            ipv4[slow] = False
+            parsed = _parse_ipv4([prefixes[i] for i in np.flatnonzero(ipv4)])
+            if parsed is None:
+                slow = list(range(count))
+            elif len(slow) < count:
+                self.lo[ipv4], self.length[ipv4] = parsed
+        for i in slow:
+            self.family[i], self.hi[i], self.lo[i], self.length[i] = _parse(
+                prefixes[i]
+            )
+
+        self.vrf = self._ids("vrf_id")
+        self.site = self._ids("site_id")
+        self.tenant = self._ids("tenant_id")
+        self._groups: list[tuple[int, Indices]] | None = None
+
+    def _ids(self, attribute: str) -> "Indices":
+        values = list(map(attrgetter(attribute), self.records))
+        missing = values.count(None)
+        if missing == len(values):
+            return np.full(len(values), _NONE, dtype=np.int64)
+        if missing:
+            values = [_NONE if v is None else v for v in values]
+        return np.array(values, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def groups(self) -> "list[tuple[int, Indices]]":
+        """
+        (family, indices) per (VRF, family), sorted by (start, length).
+
+        Equal prefixes keep their input order. Sorted once, then shared by
+        the duplicate and overlap passes.
+        """
+        if self._groups is not None:
+            return self._groups
+        groups: list[tuple[int, int, Indices]] = []
+        for family in (4, 6):
+            members = np.flatnonzero(self.family == family)
+            if not len(members):
+                continue
+            vrf = self.vrf[members]
+            if family == 4:
+                order = self._sort_ipv4(members)
+            else:
+                order = np.lexsort(
+                    (self.length[members], self.lo[members], self.hi[members], vrf)
+                )
+            members, vrf = members[order], vrf[order]
+            boundaries = np.flatnonzero(vrf[1:] != vrf[:-1]) + 1
+            groups += [
+                (int(self.vrf[group[0]]), family, group)
+                for group in np.split(members, boundaries)
+            ]
+        groups.sort(key=lambda group: group[:2])
+        self._groups = [(family, group) for _, family, group in groups]
+        return self._groups
+
+    def _sort_ipv4(self, members: "Indices") -> "Indices":
+        """Order of IPv4 members by (VRF, start, length), stable."""
+        vrf = self.vrf[members]
+        if (vrf == vrf[0]).all():
+            ranks = np.zeros(len(members), dtype=np.uint64)
+        else:
+            ranks = np.unique(vrf, return_inverse=True)[1].astype(np.uint64)
+        # One uint64 key sorts several times faster than a lexsort
+        keys = (
+            (ranks << np.uint64(38))
+            | (self.lo[members] << np.uint64(6))
+            | self.length[members]
+        )
+        order = np.argsort(keys)
+        # The sort is not stable: put runs of equal keys back in input order
+        sorted_keys = keys[order]
+        tied = np.flatnonzero(sorted_keys[1:] == sorted_keys[:-1])
+        if len(tied):
+            positions = np.union1d(tied, tied + 1)
+            runs = order[positions]
+            order[positions] = runs[np.lexsort((runs, sorted_keys[positions]))]
+        return order
+
+
+def find_immediate_parents(
+    hi: "Starts", lo: "Starts", length: "Lengths", family: int
+) -> "Indices":
+    """
+    Index of each prefix's most specific strict ancestor, or -1.
+
+    Args:
+        hi, lo: uint64 arrays with the prefix starts (hi is zero for IPv4)
+        length: uint8 array with the prefix lengths
+        family: 4 or 6, shared by all prefixes
+
+    Returns:
+        int64 array of indices into the input arrays
+    """
+    parents = np.full(len(lo), -1, dtype=np.int64)
+    for parent_length in np.unique(length):
+        candidates = np.flatnonzero(length == parent_length)
+        children = np.flatnonzero(length > parent_length)
+        if not len(children):
+            break
+
+        mask_hi, mask_lo = _masks(family, int(parent_length))
+        candidate_keys = _keys(hi[candidates], lo[candidates], family)
+        order = np.argsort(candidate_keys, kind="stable")
+        sorted_keys = candidate_keys[order]
+
+        child_keys = _keys(
+            hi[children] & np.uint64(mask_hi),
+            lo[children] & np.uint64(mask_lo),
+            family,
+        )
+        positions = np.searchsorted(sorted_keys, child_keys)
+        positions[positions == len(sorted_keys)] = 0
+        found = sorted_keys[positions] == child_keys
+
+        # Longer parent lengths are visited later and overwrite shorter ones
+        parents[children[found]] = candidates[order[positions[found]]]
+    return parents
+
+
+def find_duplicates(arrays: PrefixArrays) -> "tuple[Indices, Indices]":
+    """
+    Pairs of (duplicate, first occurrence) indices within the same VRF.
+    """
+    duplicates: list[Indices] = []
+    originals: list[Indices] = []
+    for _, group in arrays.groups():
+        hi, lo, length = arrays.hi[group], arrays.lo[group], arrays.length[group]
+        same = (hi[1:] == hi[:-1]) & (lo[1:] == lo[:-1]) & (length[1:] == length[:-1])
+        run_start = np.where(np.r_[True, ~same], np.arange(len(group)), 0)
+        first = np.maximum.accumulate(run_start)
+        dup = np.flatnonzero(np.r_[False, same])
+        duplicates.append(group[dup])
+        originals.append(group[first[dup]])
+    if not duplicates:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    return np.concatenate(duplicates), np.concatenate(originals)
+
+
+def find_overlaps(arrays: PrefixArrays) -> "tuple[Indices, Indices]":
+    """
+    Pairs of (child, parent) indices nested across sites or tenants.
+    """
+    children: list[Indices] = []
+    parents: list[Indices] = []
+    for family, group in arrays.groups():
+        group_parents = find_immediate_parents(
+            arrays.hi[group], arrays.lo[group], arrays.length[group], family
+        )
+        nested = np.flatnonzero(group_parents >= 0)
+        child_idx, parent_idx = group[nested], group[group_parents[nested]]
+
+        site, tenant = arrays.site, arrays.tenant
+        conflicts = (
+            (site[child_idx] != _NONE)
+            & (site[parent_idx] != _NONE)
+            & (site[child_idx] != site[parent_idx])
+        ) | (
+            (tenant[child_idx] != _NONE)
+            & (tenant[parent_idx] != _NONE)
+            & (tenant[child_idx] != tenant[parent_idx])
+        )
+        children.append(child_idx[conflicts])
+        parents.append(parent_idx[conflicts])
+    if not children:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    return np.concatenate(children), np.concatenate(parents)
+
+
+def audit_prefixes(
+    records: Iterable[PrefixRecord],
+    limit: int | None = 1000,
+) -> AuditReport:
+    """
+    Find duplicate prefixes and cross-owner overlaps per VRF.
+
+    Args:
+        records: Every prefix of the inventory
+        limit: Maximum number of findings to materialize (counts are exact)
+
+    Returns:
+        AuditReport listing each duplicate (against the first occurrence)
+        and each prefix nested directly in a prefix of another site/tenant
+    """
+    arrays = PrefixArrays(records)
+    duplicates, originals = find_duplicates(arrays)
+    children, parents = find_overlaps(arrays)
+
+    report = AuditReport(
+        total_prefixes=len(arrays),
+        duplicate_count=len(duplicates),
+        overlap_count=len(children),
+    )
+    if limit is not None:
+        duplicates, originals = duplicates[:limit], originals[:limit]
+        remaining = limit - len(duplicates)
+        children, parents = children[:remaining], parents[:remaining]
+    pairs = [
+        ("duplicate", d, o)
+        for d, o in zip(duplicates.tolist(), originals.tolist(), strict=True)
+    ]
+    pairs += [
+        ("overlap", c, p)
+        for c, p in zip(children.tolist(), parents.tolist(), strict=True)
+    ]
+
+    for kind, inner_idx, outer_idx in pairs:
+        inner, outer = arrays.records[inner_idx], arrays.records[outer_idx]
+        detail = ""
+        if kind == "overlap":
+            if inner.site_id != outer.site_id:
+                detail = f"site {inner.site_id} inside site {outer.site_id}"
+            else:
+                detail = f"tenant {inner.tenant_id} inside tenant {outer.tenant_id}"
+        report.findings.append(
+            AuditFinding(
+                kind=kind,
+                vrf_id=inner.vrf_id,
+                prefix_id=inner.id,
+                prefix=inner.prefix,
+                other_prefix_id=outer.id,
+                other_prefix=outer.prefix,
+                detail=detail,
+            )
+        )
+    return report
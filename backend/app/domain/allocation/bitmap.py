@@ -0,0 +1,83 @@
+"""Per-prefix address usage bitmap for next-available IP allocation."""
+
+import ipaddress
+
+# Largest number of addresses tracked per prefix (128 KiB of bits). Larger
+# prefixes, e.g. IPv6 /64s, are only searched within their first block.
+MAX_TRACKED_ADDRESSES = 1 << 20
+
+
+class AddressBitmap:
+    """
+    Usage bitmap over the host addresses of a prefix.
+
+    One bit per address, filled from a single bulk read of the assigned
+    addresses. Full bytes are skipped when searching, so finding free
+    addresses in a mostly used prefix costs one pass over the byte array.
+
+    Example:
+        >>> bitmap = AddressBitmap("10.0.8.0/29")
+        >>> bitmap.mark("10.0.8.1/29")
+        >>> bitmap.allocate(2)
+        ['10.0.8.2/29', '10.0.8.3/29']
+    """
+
+    def __init__(self, prefix: str) -> None:
+        self.network = ipaddress.ip_network(prefix)
+        self.base = int(self.network.network_address)
+        self.size = min(self.network.num_addresses, MAX_TRACKED_ADDRESSES)
+        self._bits = bytearray((self.size + 7) // 8)
+        self._address_class = type(self.network.network_address)
+
+        # Network/broadcast (IPv4) and subnet-router anycast (IPv6) addresses
+        # are never handed out, except on point-to-point prefixes.
+        if self.network.num_addresses > 2:
+            self._set(0)
+            if self.network.version == 4:
+                self._set(self.network.num_addresses - 1)
+
+    def _set(self, index: int) -> None:
+        if 0 <= index < self.size:
+            self._bits[index >> 3] |= 1 << (index & 7)
+
+    def _is_set(self, index: int) -> bool:
+        return bool(self._bits[index >> 3] & (1 << (index & 7)))
+
+    def mark(self, address: str) -> None:
+        """Mark an address (with or without mask) as used."""
+        self._set(int(ipaddress.ip_interface(address).ip) - self.base)
+
+    def mark_many(self, addresses: list[str]) -> None:
+        """Mark several addresses as used."""
+        for address in addresses:
+            self.mark(address)
+
+    def free_count(self) -> int:
+        """Number of free addresses tracked by the bitmap."""
+        used = sum(bin(byte).count("1") for byte in self._bits)
+        return self.size - used
+
+    def allocate(self, count: int) -> list[str]:
+        """
+        Mark and return the lowest ``count`` free addresses.
+
+        Args:
+            count: Number of addresses wanted
+
+        Returns:
+            Addresses in CIDR form (e.g. "10.0.8.5/26"), fewer than
+            ``count`` if the prefix does not have enough free addresses
+        """
+        allocated: list[str] = []
+        for byte_index, byte in enumerate(self._bits):
+            if byte == 0xFF:
+                continue
+            for bit in range(8):
+                index = (byte_index << 3) | bit
+                if index >= self.size or len(allocated) == count:
+                    return allocated
+                if not self._is_set(index):
+                    self._set(index)
+                    address = self._address_class(self.base + index)
+                    allocated.append(f"{address}/{self.network.prefixlen}")
+        return allocated
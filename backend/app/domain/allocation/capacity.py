@@ -0,0 +1,192 @@
+"""Capacity planning simulation for site allocations.
+
+Replays hypothetical site allocations against a pool entirely in memory.
+Free space is kept as sorted integer intervals and site containers are
+placed first-fit on aligned boundaries, so no ``ipaddress`` objects are
+created per site and thousands of scenarios can be swept quickly.
+"""
+
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from app.domain.allocation.cidr import format_prefix, parse_prefix, range_to_cidrs
+from app.domain.allocation.rules import AllocationRules
+
+
+@dataclass
+class CapacityReport:
+    """Outcome of replaying site allocations against a pool."""
+
+    pool: str
+    pool_addresses: int
+    requested_sites: int
+    allocated_sites: int
+    exhausted_at: int | None  # index of the first site that did not fit
+    remaining_sites: int  # further containers that still fit afterwards
+    container_addresses: int
+    vlan_subnet_addresses: int
+    host_subnet_addresses: int
+    under_provisioned_sites: int  # sites whose racks do not all fit
+    free_addresses: int
+    free_blocks: dict[int, int] = field(default_factory=dict)  # length -> count
+    largest_free_block: str | None = None
+
+    @property
+    def utilization(self) -> float:
+        """Pool space taken by reservations and containers, as a percentage."""
+        used = self.pool_addresses - self.free_addresses
+        return round(100.0 * used / self.pool_addresses, 2)
+
+    @property
+    def host_utilization(self) -> float:
+        """Container space actually assigned to rack subnets, as a percentage."""
+        if not self.container_addresses:
+            return 0.0
+        return round(
+            100.0 * self.host_subnet_addresses / self.container_addresses, 2
+        )
+
+
+def _layout(
+    rules: type[AllocationRules], rack_count: int, hosts_per_rack: int | None
+) -> tuple[int, int, int]:
+    """Racks placed per VLAN, overflow blocks per VLAN and host subnet size."""
+    try:
+        length = rules.host_prefix_length(hosts_per_rack, rack_count)
+    except ValueError:
+        # Not every rack fits: the site is under-provisioned at the floor
+        length = max(rules.HOST_SUBNET_SIZE, rules.MIN_HOST_SUBNET_SIZE)
+    racks, overflow = rules.fit_racks(rack_count, length)
+    return racks, overflow, 1 << (32 - length)
+
+
+def simulate_site_capacity(
+    pool: str,
+    rack_counts: Iterable[int],
+    reserved: Iterable[str] = (),
+    rules: type[AllocationRules] = AllocationRules,
+    hosts_per_rack: int | None = None,
+) -> CapacityReport:
+    """
+    Replay site allocations against a pool without touching NetBox.
+
+    Each site takes one container prefix of the profile's
+    ``CONTAINER_PREFIX_SIZE`` holding one VLAN subnet per predefined VLAN,
+    and one host subnet per rack in each VLAN subnet, spilling into
+    overflow VLAN blocks and shrinking host subnets as
+    ``AllocationRules.plan_host_subnets`` does.
+
+    Args:
+        pool: IPv4 pool to carve site containers from (e.g., "10.0.0.0/8")
+        rack_counts: Rack count of each hypothetical site, in request order
+        reserved: Prefixes already in use within the pool
+        rules: Allocation profile the sites are laid out with
+        hosts_per_rack: Usable addresses needed per rack, or None to size
+            host subnets from the rack count
+
+    Returns:
+        CapacityReport with the exhaustion point and the free-space
+        distribution left after the replay
+
+    Raises:
+        ValueError: If the pool is not an IPv4 prefix that can hold a
+            container, or the per-rack demand does not fit in a VLAN subnet
+    """
+    if hosts_per_rack is not None:
+        rules.host_prefix_length(hosts_per_rack)
+    version, base, pool_length = parse_prefix(pool)
+    container_length = rules.CONTAINER_PREFIX_SIZE
+    if version != 4 or pool_length > container_length:
+        raise ValueError(
+            f"{pool} cannot hold a /{container_length} site container"
+        )
+    end = base + (1 << (32 - pool_length))
+    container_size = 1 << (32 - container_length)
+    vlan_subnet_size = 1 << (32 - rules.VLAN_SUBNET_SIZE)
+    vlan_count = len(rules.VLAN_DEFINITIONS)
+
+    # Free space: sorted, disjoint [start, stop) intervals
+    used = []
+    for prefix in reserved:
+        reserved_version, start, length = parse_prefix(prefix)
+        if reserved_version == 4:
+            stop = start + (1 << (32 - length))
+            if start < end and stop > base:
+                used.append((max(start, base), min(stop, end)))
+    used.sort()
+    free = []
+    cursor = base
+    for start, stop in used:
+        if start > cursor:
+            free.append([cursor, start])
+        cursor = max(cursor, stop)
+    if cursor < end:
+        free.append([cursor, end])
+
+    mask = ~(container_size - 1)
+    requested = allocated = under_provisioned = host_addresses = vlan_blocks = 0
+    layouts: dict[int, tuple[int, int, int]] = {}  # rack count -> _layout()
+    exhausted_at = None
+
+    for rack_count in rack_counts:
+        requested += 1
+        if exhausted_at is not None:
+            continue
+        for index, interval in enumerate(free):
+            start, stop = interval
+            aligned = (start + container_size - 1) & mask
+            if aligned + container_size > stop:
+                continue
+            # Split the interval around the container
+            tail = [aligned + container_size, stop]
+            if aligned > start:
+                interval[1] = aligned
+                if tail[0] < tail[1]:
+                    free.insert(index + 1, tail)
+            elif tail[0] < tail[1]:
+                free[index] = tail
+            else:
+                del free[index]
+            break
+        else:
+            exhausted_at = requested - 1
+            continue
+
+        allocated += 1
+        layout = layouts.get(rack_count)
+        if layout is None:
+            layout = _layout(rules, rack_count, hosts_per_rack)
+            layouts[rack_count] = layout
+        racks, overflow, host_subnet_size = layout
+        if racks < rack_count:
+            under_provisioned += 1
+        vlan_blocks += vlan_count * (1 + overflow)
+        host_addresses += vlan_count * racks * host_subnet_size
+
+    histogram: Counter[int] = Counter()
+    largest: tuple[int, int] | None = None  # (start, length)
+    remaining = 0
+    for start, stop in free:
+        for block, length in range_to_cidrs(start, stop, 32):
+            histogram[length] += 1
+            if largest is None or length < largest[1]:
+                largest = (block, length)
+            if length <= container_length:
+                remaining += 1 << (container_length - length)
+
+    return CapacityReport(
+        pool=format_prefix(4, base, pool_length),
+        pool_addresses=end - base,
+        requested_sites=requested,
+        allocated_sites=allocated,
+        exhausted_at=exhausted_at,
+        remaining_sites=remaining,
+        container_addresses=allocated * container_size,
+        vlan_subnet_addresses=vlan_blocks * vlan_subnet_size,
+        host_subnet_addresses=host_addresses,
+        under_provisioned_sites=under_provisioned,
+        free_addresses=sum(stop - start for start, stop in free),
+        free_blocks=dict(sorted(histogram.items())),
+        largest_free_block=format_prefix(4, *largest) if largest else None,
+    )
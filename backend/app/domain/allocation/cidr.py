@@ -0,0 +1,67 @@
+"""Integer helpers for CIDR arithmetic.
+
+Working on plain ints instead of ``ipaddress`` objects keeps bulk prefix
+operations (summaries, free-space sweeps, audits) fast on large inputs.
+"""
+
+import socket
+from collections.abc import Iterator
+
+MAX_PREFIXLEN = {4: 32, 6: 128}
+
+
+def parse_prefix(prefix: str) -> tuple[int, int, int]:
+    """
+    Parse a prefix into (version, network address as int, prefix length).
+
+    Host bits are cleared, so "10.0.8.5/21" parses as 10.0.8.0/21. A bare
+    address is treated as a host prefix.
+
+    Raises:
+        ValueError: If the prefix is not valid
+    """
+    address, _, length = prefix.strip().partition("/")
+    try:
+        if ":" in address:
+            version = 6
+            start = int.from_bytes(socket.inet_pton(socket.AF_INET6, address), "big")
+        else:
+            version = 4
+            # inet_aton accepts shorthand like "10.1", so insist on dotted quads
+            if address.count(".") != 3:
+                raise OSError
+            start = int.from_bytes(socket.inet_aton(address), "big")
+        max_prefixlen = MAX_PREFIXLEN[version]
+        prefixlen = int(length) if length else max_prefixlen
+    except (OSError, ValueError):
+        raise ValueError(f"Invalid prefix: {prefix!r}") from None
+    if not 0 <= prefixlen <= max_prefixlen:
+        raise ValueError(f"Invalid prefix length: {prefix!r}")
+
+    host_bits = max_prefixlen - prefixlen
+    return version, (start >> host_bits) << host_bits, prefixlen
+
+
+def format_prefix(version: int, start: int, prefixlen: int) -> str:
+    """Format an integer network address and length as a prefix."""
+    if version == 4:
+        address = socket.inet_ntoa(start.to_bytes(4, "big"))
+    else:
+        address = socket.inet_ntop(socket.AF_INET6, start.to_bytes(16, "big"))
+    return f"{address}/{prefixlen}"
+
+
+def range_to_cidrs(
+    start: int, stop: int, max_prefixlen: int
+) -> Iterator[tuple[int, int]]:
+    """
+    Decompose the address range [start, stop) into maximal aligned blocks.
+
+    Yields:
+        (network address, prefix length) in address order
+    """
+    while start < stop:
+        alignment = start & -start if start else 1 << max_prefixlen
+        size = min(alignment, 1 << ((stop - start).bit_length() - 1))
+        yield start, max_prefixlen - size.bit_length() + 1
+        start += size
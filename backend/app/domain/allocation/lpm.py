@@ -0,0 +1,103 @@
+"""Longest-prefix-match index for mapping addresses to prefixes.
+
+Prefixes are stored in one hash table per (address family, prefix length).
+A lookup masks the address with each length present, longest first, and
+stops at the first hit, so it costs at most one dict probe per distinct
+prefix length (a handful in practice, at most 33 for IPv4). Inserts and
+removals are O(1), which keeps incremental refreshes cheap.
+"""
+
+import ipaddress
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class PrefixIndex(Generic[T]):
+    """
+    Longest-prefix-match index from prefixes to arbitrary values.
+
+    Example:
+        >>> index = PrefixIndex()
+        >>> index.insert("10.0.0.0/16", "container")
+        >>> index.insert("10.0.8.0/21", "vlan")
+        >>> index.lookup("10.0.9.1")
+        ('10.0.8.0/21', 'vlan')
+    """
+
+    def __init__(self) -> None:
+        # version -> prefix length -> network address -> (prefix, value)
+        self._tables: dict[int, dict[int, dict[int, tuple[str, T]]]] = {
+            4: {},
+            6: {},
+        }
+        # version -> [(prefix length, netmask)] longest first
+        self._lengths: dict[int, list[tuple[int, int]]] = {4: [], 6: []}
+
+    def __len__(self) -> int:
+        return sum(
+            len(table)
+            for tables in self._tables.values()
+            for table in tables.values()
+        )
+
+    def _reindex_lengths(self, version: int) -> None:
+        max_prefixlen = 32 if version == 4 else 128
+        all_ones = (1 << max_prefixlen) - 1
+        self._lengths[version] = [
+            (length, all_ones ^ ((1 << (max_prefixlen - length)) - 1))
+            for length in sorted(self._tables[version], reverse=True)
+        ]
+
+    def insert(self, prefix: str, value: T) -> None:
+        """Insert or replace the value of a prefix."""
+        network = ipaddress.ip_network(prefix, strict=False)
+        tables = self._tables[network.version]
+        if network.prefixlen not in tables:
+            tables[network.prefixlen] = {}
+            self._reindex_lengths(network.version)
+        key = int(network.network_address)
+        tables[network.prefixlen][key] = (str(network), value)
+
+    def remove(self, prefix: str) -> None:
+        """Remove a prefix if present."""
+        network = ipaddress.ip_network(prefix, strict=False)
+        tables = self._tables[network.version]
+        table = tables.get(network.prefixlen)
+        if table is None:
+            return
+        table.pop(int(network.network_address), None)
+        if not table:
+            del tables[network.prefixlen]
+            self._reindex_lengths(network.version)
+
+    def clear(self) -> None:
+        """Remove all prefixes."""
+        for version in self._tables:
+            self._tables[version] = {}
+            self._lengths[version] = []
+
+    def lookup(self, address: str) -> tuple[str, T] | None:
+        """
+        Find the most specific prefix containing an address.
+
+        Args:
+            address: IPv4 or IPv6 address, with or without mask
+
+        Returns:
+            (prefix, value) of the longest match, or None
+
+        Raises:
+            ValueError: If the address is not valid
+        """
+        if "/" in address:
+            ip = ipaddress.ip_interface(address).ip
+        else:
+            ip = ipaddress.ip_address(address)
+        value = int(ip)
+        tables = self._tables[ip.version]
+        for length, netmask in self._lengths[ip.version]:
+            entry = tables[length].get(value & netmask)
+            if entry is not None:
+                return entry
+        return None
@@ -0,0 +1,211 @@
+"""Data-driven allocation profiles.
+
+A profile is a VLAN set, VLAN ranges and per-tier prefix lengths, loaded
+from a YAML or JSON file whose top level maps profile names to profiles::
+
+    edge:
+      description: Small edge site
+      prefix_sizes: {container: 20, vlan_subnet: 24, host_subnet: 27}
+      vlan_ranges:
+        management: {start: 100, end: 199, description: Management Fabric}
+      vlans:
+        - {vid: 100, name: oob_bmc, description: OOB/BMC, category: management}
+
+Profiles are validated once and compiled into ``AllocationRules``
+subclasses, whose VLAN lookups are dict/array indexed, so picking a
+profile per request costs a dict lookup. The built-in "default" profile
+is ``AllocationRules`` itself. YAML files need the optional ``profiles``
+extra (PyYAML); JSON files work without it.
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.config import get_settings
+from app.domain.allocation.rules import (
+    AllocationRules,
+    VlanCategory,
+    VlanDefinition,
+    VlanRange,
+)
+
+PROFILE_SUFFIXES = (".json", ".yaml", ".yml")
+
+
+class PrefixSizesConfig(BaseModel):
+    """Prefix length of each allocation tier."""
+
+    container: int = Field(default=16, ge=0, le=32)
+    vlan_subnet: int = Field(default=21, ge=0, le=32)
+    host_subnet: int = Field(default=26, ge=0, le=32)
+    # Host subnets shrink down to this length when racks do not fit
+    min_host_subnet: int = Field(default=28, ge=0, le=30)
+
+
+class VlanRangeConfig(BaseModel):
+    """VID range of a VLAN category."""
+
+    start: int = Field(..., ge=1, le=4094)
+    end: int = Field(..., ge=1, le=4094)
+    description: str = ""
+
+
+class VlanConfig(BaseModel):
+    """VLAN created for every site using the profile."""
+
+    vid: int = Field(..., ge=1, le=4094)
+    name: str = Field(..., min_length=1)
+    description: str = ""
+    category: VlanCategory
+
+
+class AllocationProfileConfig(BaseModel):
+    """Allocation profile as written in a profile file."""
+
+    description: str = ""
+    prefix_sizes: PrefixSizesConfig = Field(default_factory=PrefixSizesConfig)
+    vlan_ranges: dict[VlanCategory, VlanRangeConfig]
+    vlans: list[VlanConfig]
+
+    @model_validator(mode="after")
+    def check_layout(self) -> "AllocationProfileConfig":
+        """Check that VLANs and prefix tiers are consistent."""
+        sizes = self.prefix_sizes
+        if not sizes.container <= sizes.vlan_subnet <= sizes.host_subnet:
+            raise ValueError(
+                "prefix sizes must satisfy container <= vlan_subnet <= host_subnet"
+            )
+        # VLAN subnets follow one free VLAN-sized block in the container
+        if len(self.vlans) + 1 > 1 << (sizes.vlan_subnet - sizes.container):
+            raise ValueError(
+                f"{len(self.vlans)} /{sizes.vlan_subnet} VLAN subnets do not fit "
+                f"in a /{sizes.container} container"
+            )
+
+        ranges = sorted(self.vlan_ranges.values(), key=lambda r: r.start)
+        for vlan_range in ranges:
+            if vlan_range.start > vlan_range.end:
+                raise ValueError(
+                    f"VLAN range {vlan_range.start}-{vlan_range.end} is empty"
+                )
+        for previous, current in zip(ranges, ranges[1:], strict=False):
+            if current.start <= previous.end:
+                raise ValueError(
+                    f"VLAN ranges {previous.start}-{previous.end} and "
+                    f"{current.start}-{current.end} overlap"
+                )
+
+        vids: set[int] = set()
+        names: set[str] = set()
+        for vlan in self.vlans:
+            if vlan.vid in vids:
+                raise ValueError(f"duplicate VLAN {vlan.vid}")
+            if vlan.name in names:
+                raise ValueError(f"duplicate VLAN name {vlan.name!r}")
+            vids.add(vlan.vid)
+            names.add(vlan.name)
+            category_range = self.vlan_ranges.get(vlan.category)
+            if (
+                category_range is None
+                or not category_range.start <= vlan.vid <= category_range.end
+            ):
+                raise ValueError(
+                    f"VLAN {vlan.vid} is outside the {vlan.category.value} range"
+                )
+        return self
+
+
+def compile_profile(
+    name: str, config: AllocationProfileConfig
+) -> type[AllocationRules]:
+    """Compile a validated profile into an AllocationRules subclass."""
+    return type(
+        f"AllocationRules[{name}]",
+        (AllocationRules,),
+        {
+            "__doc__": config.description or f"Allocation profile {name!r}.",
+            "PROFILE_NAME": name,
+            "VLAN_DEFINITIONS": [
+                VlanDefinition(vlan.vid, vlan.name, vlan.description, vlan.category)
+                for vlan in config.vlans
+            ],
+            "VLAN_RANGES": {
+                category: VlanRange(r.start, r.end, category, r.description)
+                for category, r in config.vlan_ranges.items()
+            },
+            "CONTAINER_PREFIX_SIZE": config.prefix_sizes.container,
+            "VLAN_SUBNET_SIZE": config.prefix_sizes.vlan_subnet,
+            "HOST_SUBNET_SIZE": config.prefix_sizes.host_subnet,
+            "MIN_HOST_SUBNET_SIZE": config.prefix_sizes.min_host_subnet,
+        },
+    )
+
+
+def _read_profile_file(path: Path) -> dict[str, Any]:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        data: dict[str, Any] = json.loads(text) or {}
+        return data
+    try:
+        import yaml
+    except ImportError as e:  # pragma: no cover - exercised only without the extra
+        raise RuntimeError(
+            f"PyYAML is required to load {path}; install ipam-backend[profiles]"
+        ) from e
+    data = yaml.safe_load(text) or {}
+    return data
+
+
+def load_profiles(path: str | Path) -> dict[str, type[AllocationRules]]:
+    """
+    Load and compile the profiles of a file, or of every file in a directory.
+
+    Raises:
+        ValueError: If a profile is invalid or defined twice
+    """
+    path = Path(path)
+    files = (
+        sorted(p for p in path.iterdir() if p.suffix in PROFILE_SUFFIXES)
+        if path.is_dir()
+        else [path]
+    )
+
+    profiles: dict[str, type[AllocationRules]] = {}
+    for file in files:
+        for name, raw in _read_profile_file(file).items():
+            if name in profiles or name == AllocationRules.PROFILE_NAME:
+                raise ValueError(f"Allocation profile {name!r} is defined twice")
+            try:
+                config = AllocationProfileConfig.model_validate(raw)
+            except ValueError as e:
+                raise ValueError(
+                    f"Invalid allocation profile {name!r} in {file}: {e}"
+                ) from e
+            profiles[name] = compile_profile(name, config)
+    return profiles
+
+
+@lru_cache
+def get_allocation_profiles() -> dict[str, type[AllocationRules]]:
+    """Get the compiled allocation profiles, including "default"."""
+    profiles: dict[str, type[AllocationRules]] = {
+        AllocationRules.PROFILE_NAME: AllocationRules
+    }
+    path = get_settings().allocation_profiles_path
+    if path:
+        profiles.update(load_profiles(path))
+    return profiles
+
+
+def get_allocation_profile(name: str) -> type[AllocationRules]:
+    """
+    Get a compiled allocation profile by name.
+
+    Raises:
+        KeyError: If no profile has that name
+    """
+    return get_allocation_profiles()[name]
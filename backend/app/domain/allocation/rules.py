@@ -8,6 +8,9 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Iterator
 
+from app.domain.allocation.cidr import format_prefix, parse_prefix
+from app.observability.tracing import traced
+
 
 class VlanCategory(str, Enum):
     """VLAN category types with predefined ranges."""
@@ -47,6 +50,45 @@ class PrefixAllocation:
     parent_prefix: str | None = None
 
 
+@dataclass
+class PrefixRange:
+    """Contiguous run of equally sized child prefixes within a parent.
+
+    Describes ``count`` children of length ``prefix_length`` starting at
+    child index ``start_index`` of ``parent_prefix`` without materializing
+    each prefix.
+    """
+
+    parent_prefix: str
+    prefix_length: int
+    start_index: int
+    count: int
+    vlan_vid: int | None = None
+    rack_offset: int = 0  # racks numbered before this range
+
+
+@dataclass
+class HostSubnetPlan:
+    """Host subnets of a site, range-encoded per parent block.
+
+    When a VLAN subnet cannot hold one host subnet per rack, the remaining
+    racks spill into ``overflow_subnets``: extra VLAN-sized blocks taken
+    from the free part of the container. Host subnets are only materialized
+    by ``iter_host_subnets``.
+    """
+
+    host_prefix_length: int
+    racks_per_vlan: int
+    overflow_subnets: list[PrefixAllocation] = field(default_factory=list)
+    host_ranges: list[PrefixRange] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+    def iter_host_subnets(self) -> Iterator[PrefixAllocation]:
+        """Lazily expand every host subnet range."""
+        for host_range in self.host_ranges:
+            yield from AllocationRules.expand_host_subnet_range(host_range)
+
+
 class AllocationRules:
     """
     Allocation rules for network resources.
@@ -70,8 +112,14 @@ class AllocationRules:
     - Container: /16 (e.g., 10.0.0.0/16)
     - VLAN subnets: /21 per VLAN
     - Host subnets: /26 per rack
+
+    These class attributes form the "default" allocation profile; other
+    profiles are subclasses with their own attributes (see profiles.py),
+    and every class is compiled into indexed lookups when it is defined.
     """
 
+    PROFILE_NAME = "default"
+
     # Predefined VLAN definitions
     VLAN_DEFINITIONS: list[VlanDefinition] = [
         # Management Fabric (100-199)
@@ -99,21 +147,37 @@ class AllocationRules:
     CONTAINER_PREFIX_SIZE = 16  # /16 for site container
     VLAN_SUBNET_SIZE = 21  # /21 per VLAN
     HOST_SUBNET_SIZE = 26  # /26 per rack
+    # Longest host subnets racks are shrunk to when no host demand is given
+    MIN_HOST_SUBNET_SIZE = 28  # /28, 14 usable hosts per rack
+
+    # Compiled lookups, rebuilt for every profile by _compile()
+    _VLANS_BY_VID: dict[int, VlanDefinition] = {}
+    _CATEGORY_BY_VID: list[VlanCategory | None] = []
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._compile()
+
+    @classmethod
+    def _compile(cls) -> None:
+        """Index VLAN definitions by VID and VLAN categories by VID."""
+        cls._VLANS_BY_VID = {vlan.vid: vlan for vlan in cls.VLAN_DEFINITIONS}
+        categories: list[VlanCategory | None] = [None] * 4096
+        for category, vlan_range in cls.VLAN_RANGES.items():
+            start, end = max(vlan_range.start, 0), min(vlan_range.end, 4095)
+            categories[start : end + 1] = [category] * (end + 1 - start)
+        cls._CATEGORY_BY_VID = categories
 
     @classmethod
     def get_vlan_definition(cls, vid: int) -> VlanDefinition | None:
         """Get predefined VLAN definition by VID."""
-        for vlan in cls.VLAN_DEFINITIONS:
-            if vlan.vid == vid:
-                return vlan
-        return None
+        return cls._VLANS_BY_VID.get(vid)
 
     @classmethod
     def get_vlan_category(cls, vid: int) -> VlanCategory | None:
         """Determine VLAN category based on VID."""
-        for category, vlan_range in cls.VLAN_RANGES.items():
-            if vlan_range.start <= vid <= vlan_range.end:
-                return category
+        if 0 <= vid < len(cls._CATEGORY_BY_VID):
+            return cls._CATEGORY_BY_VID[vid]
         return None
 
     @classmethod
@@ -159,11 +223,14 @@ class AllocationRules:
         Returns:
             VLAN subnet (e.g., "10.0.8.0/21")
         """
-        # Each /21 contains 2048 addresses, offset by 8 in the third octet
-        third_octet = (subnet_offset + 1) * 8
-        return f"{base_network}.{third_octet}.0/{cls.VLAN_SUBNET_SIZE}"
+        # The first VLAN-sized block of the container is left free, so with
+        # the default /21s subnets start at offset 8 in the third octet
+        _, base, _ = parse_prefix(f"{base_network}.0.0")
+        start = base + (subnet_offset + 1) * (1 << (32 - cls.VLAN_SUBNET_SIZE))
+        return format_prefix(4, start, cls.VLAN_SUBNET_SIZE)
 
     @classmethod
+    @traced()
     def generate_vlan_subnets(
         cls,
         base_network: str,
@@ -196,6 +263,89 @@ class AllocationRules:
                 parent_prefix=container,
             )
 
+    @classmethod
+    @traced()
+    def generate_host_subnet_range(
+        cls,
+        vlan_subnet: str,
+        rack_count: int,
+        vlan_vid: int | None = None,
+    ) -> PrefixRange:
+        """
+        Describe the /26 host subnets of a VLAN subnet as a single range.
+
+        Args:
+            vlan_subnet: VLAN subnet (e.g., "10.0.8.0/21")
+            rack_count: Number of racks
+            vlan_vid: Optional VLAN ID the subnet belongs to
+
+        Returns:
+            PrefixRange covering one subnet per rack
+
+        Raises:
+            ValueError: If the racks need more /26 subnets than fit in the
+                VLAN subnet (see plan_host_subnets for larger sites)
+        """
+        network = ipaddress.ip_network(vlan_subnet)
+
+        # A /21 can contain up to 32 /26 subnets
+        capacity = 1 << (cls.HOST_SUBNET_SIZE - network.prefixlen)
+        if not 0 <= rack_count <= capacity:
+            raise ValueError(
+                f"{vlan_subnet} holds {capacity} /{cls.HOST_SUBNET_SIZE} host "
+                f"subnets, not {rack_count}"
+            )
+
+        return PrefixRange(
+            parent_prefix=vlan_subnet,
+            prefix_length=cls.HOST_SUBNET_SIZE,
+            start_index=0,
+            count=rack_count,
+            vlan_vid=vlan_vid,
+        )
+
+    @classmethod
+    @traced()
+    def expand_host_subnet_range(
+        cls,
+        prefix_range: PrefixRange,
+    ) -> Iterator[PrefixAllocation]:
+        """
+        Expand a host subnet range into individual rack subnets.
+
+        Args:
+            prefix_range: Range produced by generate_host_subnet_range
+
+        Yields:
+            PrefixAllocation for each rack subnet in the range
+        """
+        network = ipaddress.ip_network(prefix_range.parent_prefix)
+        base = int(network.network_address)
+        if not network.prefixlen <= prefix_range.prefix_length <= network.max_prefixlen:
+            raise ValueError(
+                f"/{prefix_range.prefix_length} does not fit in {network}"
+            )
+        capacity = 1 << (prefix_range.prefix_length - network.prefixlen)
+        if prefix_range.start_index + prefix_range.count > capacity:
+            raise ValueError(
+                f"{network} holds only {capacity} /{prefix_range.prefix_length} subnets"
+            )
+
+        step = 1 << (network.max_prefixlen - prefix_range.prefix_length)
+        address_class = type(network.network_address)
+
+        for index in range(
+            prefix_range.start_index,
+            prefix_range.start_index + prefix_range.count,
+        ):
+            address = address_class(base + index * step)
+            rack = prefix_range.rack_offset + index + 1
+            yield PrefixAllocation(
+                prefix=f"{address}/{prefix_range.prefix_length}",
+                description=f"Rack {rack:02d} subnet",
+                parent_prefix=prefix_range.parent_prefix,
+            )
+
     @classmethod
     def generate_host_subnets(
         cls,
@@ -212,20 +362,169 @@ class AllocationRules:
         Yields:
             PrefixAllocation for each rack subnet
         """
-        network = ipaddress.ip_network(vlan_subnet)
+        yield from cls.expand_host_subnet_range(
+            cls.generate_host_subnet_range(vlan_subnet, rack_count)
+        )
 
-        # A /21 can contain up to 32 /26 subnets
-        host_subnets = list(network.subnets(new_prefix=cls.HOST_SUBNET_SIZE))
+    @classmethod
+    def host_prefix_length(
+        cls, hosts_per_rack: int | None = None, rack_count: int | None = None
+    ) -> int:
+        """
+        Get the host subnet length for a per-rack host demand.
 
-        for rack_num in range(1, min(rack_count + 1, len(host_subnets) + 1)):
-            subnet = host_subnets[rack_num - 1]
-            yield PrefixAllocation(
-                prefix=str(subnet),
-                description=f"Rack {rack_num:02d} subnet",
-                parent_prefix=vlan_subnet,
+        Without a host demand, the profile's HOST_SUBNET_SIZE is used, or,
+        when ``rack_count`` racks do not fit in the VLAN subnets and their
+        overflow blocks at that size, the first smaller size (/27, /28, ...)
+        at which they do, down to MIN_HOST_SUBNET_SIZE.
+
+        Args:
+            hosts_per_rack: Usable addresses needed per rack, or None for
+                the profile's HOST_SUBNET_SIZE
+            rack_count: Number of racks the subnets must fit (optional)
+
+        Returns:
+            Longest prefix length whose usable addresses cover the demand
+
+        Raises:
+            ValueError: If the demand does not fit in a VLAN subnet, or,
+                without a demand, the racks do not fit even in
+                MIN_HOST_SUBNET_SIZE host subnets
+        """
+        if hosts_per_rack is None:
+            length = cls.HOST_SUBNET_SIZE
+            if rack_count is None:
+                return length
+            min_length = max(cls.HOST_SUBNET_SIZE, cls.MIN_HOST_SUBNET_SIZE)
+            while cls.fit_racks(rack_count, length)[0] < rack_count:
+                if length >= min_length:
+                    raise ValueError(
+                        f"{rack_count} racks do not fit in a "
+                        f"/{cls.CONTAINER_PREFIX_SIZE} site container with "
+                        f"/{length} host subnets; pass hosts_per_rack to size "
+                        f"them, or use a profile with a larger container"
+                    )
+                length += 1
+            return length
+        # Network and broadcast addresses are not usable
+        length = min(32 - (hosts_per_rack + 1).bit_length(), 30)
+        if length < cls.VLAN_SUBNET_SIZE:
+            raise ValueError(
+                f"{hosts_per_rack} hosts per rack do not fit in a "
+                f"/{cls.VLAN_SUBNET_SIZE} VLAN subnet"
             )
+        return length
 
     @classmethod
+    def fit_racks(cls, rack_count: int, host_prefix_length: int) -> tuple[int, int]:
+        """
+        Work out how many racks fit per VLAN, spilling into overflow blocks.
+
+        Every VLAN gets the same number of overflow blocks, drawn from the
+        container blocks left after the VLAN subnets.
+
+        Args:
+            rack_count: Number of racks
+            host_prefix_length: Length of each host subnet
+
+        Returns:
+            (racks placed per VLAN, overflow blocks per VLAN)
+        """
+        per_block = 1 << (host_prefix_length - cls.VLAN_SUBNET_SIZE)
+        vlan_count = len(cls.VLAN_DEFINITIONS)
+        # The first container block is left free, as in calculate_vlan_subnet
+        spare = (
+            (1 << (cls.VLAN_SUBNET_SIZE - cls.CONTAINER_PREFIX_SIZE)) - 1 - vlan_count
+        )
+        overflow = max(0, -(-rack_count // per_block) - 1)
+        if vlan_count:
+            overflow = min(overflow, spare // vlan_count)
+        return min(rack_count, (overflow + 1) * per_block), overflow
+
+    @classmethod
+    @traced()
+    def plan_host_subnets(
+        cls,
+        base_network: str,
+        rack_count: int,
+        hosts_per_rack: int | None = None,
+    ) -> HostSubnetPlan:
+        """
+        Plan the host subnets of every VLAN subnet for a site of any size.
+
+        Args:
+            base_network: Base network (e.g., "10.0")
+            rack_count: Number of racks
+            hosts_per_rack: Usable addresses needed per rack (optional)
+
+        Returns:
+            HostSubnetPlan with one host subnet range per parent block, a
+            warning when racks overflow and one when the default host
+            subnets were shrunk to fit the racks
+
+        Raises:
+            ValueError: If the per-rack demand does not fit in a VLAN subnet,
+                or not every rack fits in the container
+        """
+        host_length = cls.host_prefix_length(hosts_per_rack, rack_count)
+        racks, overflow = cls.fit_racks(rack_count, host_length)
+        container = cls.calculate_container_prefix(base_network)
+        if racks < rack_count:
+            raise ValueError(
+                f"Only {racks} of {rack_count} racks with {hosts_per_rack} hosts "
+                f"each fit in {container}"
+            )
+        per_block = 1 << (host_length - cls.VLAN_SUBNET_SIZE)
+        plan = HostSubnetPlan(host_prefix_length=host_length, racks_per_vlan=racks)
+
+        if hosts_per_rack is None and host_length != cls.HOST_SUBNET_SIZE:
+            plan.warnings.append(
+                f"{rack_count} racks do not fit with /{cls.HOST_SUBNET_SIZE} host "
+                f"subnets; using /{host_length}"
+            )
+        if overflow:
+            plan.warnings.append(
+                f"{rack_count} racks exceed one /{cls.VLAN_SUBNET_SIZE} per VLAN; "
+                f"added {overflow} overflow /{cls.VLAN_SUBNET_SIZE} block(s) "
+                f"per VLAN in {container}"
+            )
+
+        next_offset = len(cls.VLAN_DEFINITIONS)
+        for idx, vlan in enumerate(cls.VLAN_DEFINITIONS):
+            parents = [cls.calculate_vlan_subnet(base_network, vlan.vid, idx)]
+            for number in range(1, overflow + 1):
+                block = cls.calculate_vlan_subnet(base_network, vlan.vid, next_offset)
+                next_offset += 1
+                plan.overflow_subnets.append(
+                    PrefixAllocation(
+                        prefix=block,
+                        description=f"{vlan.description} (overflow {number})",
+                        vlan_vid=vlan.vid,
+                        parent_prefix=container,
+                    )
+                )
+                parents.append(block)
+
+            for block_index, parent in enumerate(parents):
+                rack_offset = block_index * per_block
+                count = min(per_block, racks - rack_offset)
+                if count <= 0:
+                    break
+                plan.host_ranges.append(
+                    PrefixRange(
+                        parent_prefix=parent,
+                        prefix_length=host_length,
+                        start_index=0,
+                        count=count,
+                        vlan_vid=vlan.vid,
+                        rack_offset=rack_offset,
+                    )
+                )
+
+        return plan
+
+    @classmethod
+    @traced()
     def validate_prefix_hierarchy(
         cls,
         parent: str,
@@ -249,6 +548,7 @@ class AllocationRules:
             return False
 
     @classmethod
+    @traced()
     def get_next_available_prefix(
         cls,
         parent_prefix: str,
@@ -281,3 +581,6 @@ class AllocationRules:
             return None
         except ValueError:
             return None
+
+
+AllocationRules._compile()
@@ -0,0 +1,62 @@
+"""Route summarization: minimal set of CIDRs covering a set of prefixes."""
+
+from collections.abc import Iterable
+
+from app.domain.allocation.cidr import (
+    MAX_PREFIXLEN,
+    format_prefix,
+    parse_prefix,
+    range_to_cidrs,
+)
+
+
+def summarize_prefixes(prefixes: Iterable[str]) -> list[str]:
+    """
+    Collapse prefixes into the minimal list of CIDRs covering exactly them.
+
+    Each prefix becomes an integer interval; intervals are sorted once,
+    overlapping or adjacent ones are merged in a linear pass, and each
+    merged run is split back into maximal aligned CIDR blocks. Unlike
+    ``ipaddress.collapse_addresses`` no address objects are created per
+    input, which keeps 100k-prefix inputs under a second.
+
+    Args:
+        prefixes: IPv4 and/or IPv6 prefixes, in any order
+
+    Returns:
+        Summary prefixes, IPv4 first, each family in address order
+
+    Raises:
+        ValueError: If any prefix is not valid
+
+    Example:
+        >>> summarize_prefixes(["10.0.0.0/25", "10.0.0.128/25", "10.0.1.0/24"])
+        ['10.0.0.0/23']
+    """
+    intervals = []
+    for prefix in prefixes:
+        version, start, prefixlen = parse_prefix(prefix)
+        intervals.append(
+            (version, start, start + (1 << (MAX_PREFIXLEN[version] - prefixlen)))
+        )
+    intervals.sort()
+
+    summary: list[str] = []
+
+    def flush(version: int, start: int, stop: int) -> None:
+        for block, length in range_to_cidrs(start, stop, MAX_PREFIXLEN[version]):
+            summary.append(format_prefix(version, block, length))
+
+    current: tuple[int, int, int] | None = None
+    for version, start, stop in intervals:
+        if current and version == current[0] and start <= current[2]:
+            if stop > current[2]:
+                current = (version, current[1], stop)
+            continue
+        if current:
+            flush(*current)
+        current = (version, start, stop)
+    if current:
+        flush(*current)
+
+    return summary
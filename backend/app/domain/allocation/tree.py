@@ -0,0 +1,87 @@
+"""Prefix hierarchy construction.
+
+Prefixes are sorted by (network address, prefix length), which places every
+parent before its children, then nested with a single stack-based sweep:
+the stack always holds the chain of ancestors of the current prefix.
+Building is O(n log n) for the sort plus O(n) for the sweep.
+"""
+
+import ipaddress
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+
+
+@dataclass
+class PrefixTreeNode:
+    """Node of a prefix hierarchy."""
+
+    index: int  # position of the prefix in the input sequence
+    prefix: str
+    children: list["PrefixTreeNode"] = field(default_factory=list)
+
+
+def build_prefix_tree(prefixes: Sequence[str]) -> list[PrefixTreeNode]:
+    """
+    Nest prefixes into a forest of parent/child trees.
+
+    Args:
+        prefixes: Prefixes in any order; IPv4 and IPv6 form separate trees
+
+    Returns:
+        Root nodes in address order, children nested in address order
+    """
+    keyed = []
+    for index, prefix in enumerate(prefixes):
+        network = ipaddress.ip_network(prefix, strict=False)
+        start = int(network.network_address)
+        keyed.append(
+            (
+                network.version,
+                start,
+                network.prefixlen,
+                start + network.num_addresses,
+                index,
+            )
+        )
+    keyed.sort()
+
+    roots: list[PrefixTreeNode] = []
+    stack: list[tuple[int, int, PrefixTreeNode]] = []  # (version, end, node)
+
+    for version, _start, _, end, index in keyed:
+        node = PrefixTreeNode(index=index, prefix=prefixes[index])
+        while stack and (stack[-1][0] != version or stack[-1][1] < end):
+            stack.pop()
+        if stack:
+            stack[-1][2].children.append(node)
+        else:
+            roots.append(node)
+        stack.append((version, end, node))
+
+    return roots
+
+
+def walk_prefix_tree(
+    roots: list[PrefixTreeNode],
+    max_depth: int | None = None,
+) -> Iterator[tuple[PrefixTreeNode, int, PrefixTreeNode | None]]:
+    """
+    Walk a prefix forest depth-first without recursion.
+
+    Args:
+        roots: Forest returned by build_prefix_tree
+        max_depth: Deepest level to yield (0 yields only the roots)
+
+    Yields:
+        (node, depth, parent) in pre-order
+    """
+    stack: list[tuple[PrefixTreeNode, int, PrefixTreeNode | None]] = [
+        (root, 0, None) for root in reversed(roots)
+    ]
+    while stack:
+        node, depth, parent = stack.pop()
+        yield node, depth, parent
+        if max_depth is None or depth < max_depth:
+            stack.extend(
+                (child, depth + 1, node) for child in reversed(node.children)
+            )
@@ -0,0 +1,136 @@
+"""Prefix utilization and free-space reporting.
+
+Children are converted to integer intervals, sorted once and swept
+linearly: gaps between covered intervals are the free space, which is
+decomposed into the maximal aligned CIDR blocks it could be allocated as.
+"""
+
+import ipaddress
+import time
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from app.domain.allocation.cidr import range_to_cidrs
+
+
+@dataclass
+class UtilizationReport:
+    """Used and free space of a parent prefix."""
+
+    prefix: str
+    total_addresses: int
+    used_addresses: int
+    free_blocks: dict[int, int] = field(default_factory=dict)  # length -> count
+    largest_free_block: str | None = None
+
+    @property
+    def free_addresses(self) -> int:
+        return self.total_addresses - self.used_addresses
+
+    @property
+    def utilization(self) -> float:
+        """Used space as a percentage of the parent."""
+        return round(100.0 * self.used_addresses / self.total_addresses, 2)
+
+
+def compute_utilization(parent: str, children: Iterable[str]) -> UtilizationReport:
+    """
+    Compute used/free space of a parent prefix in one sweep.
+
+    Args:
+        parent: Parent prefix (e.g., "10.0.0.0/16")
+        children: Prefixes within the parent; nested children (e.g. a /26
+            inside a /21) are only counted once
+
+    Returns:
+        UtilizationReport with a histogram of free CIDR blocks by length
+        and the lowest of the largest free blocks
+    """
+    network = ipaddress.ip_network(parent)
+    max_prefixlen = network.max_prefixlen
+    address_class = type(network.network_address)
+    base = int(network.network_address)
+    end = base + network.num_addresses
+
+    intervals = []
+    for child in children:
+        child_net = ipaddress.ip_network(child)
+        start = int(child_net.network_address)
+        stop = start + child_net.num_addresses
+        if child_net.version == network.version and base <= start and stop <= end:
+            intervals.append((start, stop))
+    intervals.sort()
+
+    histogram: Counter[int] = Counter()
+    largest: tuple[int, int] | None = None  # (length, start)
+
+    def add_gap(start: int, stop: int) -> None:
+        nonlocal largest
+        for block, length in range_to_cidrs(start, stop, max_prefixlen):
+            histogram[length] += 1
+            if largest is None or length < largest[0]:
+                largest = (length, block)
+
+    used = 0
+    cursor = base
+    for start, stop in intervals:
+        if stop <= cursor:
+            continue  # nested within an interval already counted
+        if start > cursor:
+            add_gap(cursor, start)
+        used += stop - max(start, cursor)
+        cursor = stop
+    add_gap(cursor, end)
+
+    return UtilizationReport(
+        prefix=str(network),
+        total_addresses=network.num_addresses,
+        used_addresses=used,
+        free_blocks=dict(sorted(histogram.items())),
+        largest_free_block=(
+            f"{address_class(largest[1])}/{largest[0]}" if largest else None
+        ),
+    )
+
+
+class UtilizationCache:
+    """
+    Per-process cache of utilization reports keyed by parent prefix.
+
+    Entries are dropped when a prefix inside the parent is created, updated
+    or deleted through this service. The TTL bounds staleness from edits
+    made directly in NetBox or by other workers.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, UtilizationReport]] = {}
+
+    def get(self, prefix: str) -> UtilizationReport | None:
+        entry = self._entries.get(prefix)
+        if entry is None:
+            return None
+        expires_at, report = entry
+        if expires_at <= time.monotonic():
+            del self._entries[prefix]
+            return None
+        return report
+
+    def put(self, report: UtilizationReport) -> None:
+        self._entries[report.prefix] = (time.monotonic() + self.ttl, report)
+
+    def invalidate(self, changed: str | None = None) -> None:
+        """Drop reports of every parent containing ``changed`` (all if None)."""
+        if changed is None:
+            self._entries.clear()
+            return
+        changed_net = ipaddress.ip_network(changed, strict=False)
+        for prefix in list(self._entries):
+            parent = ipaddress.ip_network(prefix)
+            if (
+                parent.version == changed_net.version
+                and changed_net.prefixlen >= parent.prefixlen
+                and changed_net.overlaps(parent)
+            ):
+                del self._entries[prefix]
@@ -0,0 +1,157 @@
+"""Service layer for IP Address operations."""
+
+from datetime import datetime
+
+from app.domain.allocation.bitmap import AddressBitmap
+from app.infrastructure.leases.store import get_lease_store
+from app.infrastructure.netbox.client import Record, get_netbox_client
+from app.schemas.ip_address import (
+    AvailableIpRequest,
+    IpAddressCreate,
+    IpAddressResponse,
+    IpAddressStatus,
+    IpAddressUpdate,
+)
+
+# One lease scope keyed by bare address, so allocations in nested parents
+# (e.g. 10.0.8.0/24 and 10.0.8.0/26) see each other's leases
+IP_LEASE_SCOPE = "ip"
+
+
+class IpAddressService:
+    """Business logic for IP Address management."""
+
+    def __init__(self) -> None:
+        self.client = get_netbox_client()
+        self.leases = get_lease_store()
+
+    def _to_response(self, ip: Record) -> IpAddressResponse:
+        """Convert NetBox IP address object to response schema."""
+        return IpAddressResponse(
+            id=ip.id,
+            address=str(ip.address),
+            status=IpAddressStatus(ip.status.value if ip.status else "active"),
+            description=ip.description,
+            dns_name=ip.dns_name or None,
+            tenant_id=ip.tenant.id if ip.tenant else None,
+            tags=[str(t) for t in (ip.tags or [])],
+            created=datetime.fromisoformat(str(ip.created)),
+            last_updated=datetime.fromisoformat(str(ip.last_updated)),
+        )
+
+    def _to_payload(
+        self, address: str, data: AvailableIpRequest | IpAddressCreate
+    ) -> dict[str, object]:
+        """Build a NetBox create payload for one address."""
+        payload = {
+            "address": address,
+            "status": data.status.value,
+            "description": data.description,
+            "dns_name": data.dns_name,
+            "tenant": data.tenant_id,
+            "tags": data.tags,
+        }
+        # Remove None values
+        return {k: v for k, v in payload.items() if v is not None}
+
+    async def list_ip_addresses(
+        self,
+        parent: str | None = None,
+        tenant_id: int | None = None,
+        status: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> list[IpAddressResponse]:
+        """List IP addresses with filtering."""
+        filters: dict[str, str | int] = {}
+        if parent:
+            filters["parent"] = parent
+        if tenant_id:
+            filters["tenant_id"] = tenant_id
+        if status:
+            filters["status"] = status
+
+        filters["limit"] = limit
+        filters["offset"] = offset
+
+        ips = self.client.list_ip_addresses(**filters)
+        return [self._to_response(ip) for ip in ips]
+
+    async def get_ip_address(self, ip_id: int) -> IpAddressResponse | None:
+        """Get a single IP address by ID."""
+        ip = self.client.get_ip_address(ip_id)
+        if ip:
+            return self._to_response(ip)
+        return None
+
+    async def create_ip_address(self, data: IpAddressCreate) -> IpAddressResponse:
+        """Create a new IP address."""
+        [ip] = self.client.create_ip_addresses(
+            [self._to_payload(data.address, data)]
+        )
+        return self._to_response(ip)
+
+    async def allocate_available_ips(
+        self, prefix_id: int, count: int, data: AvailableIpRequest
+    ) -> list[IpAddressResponse] | None:
+        """
+        Allocate and create the next ``count`` free addresses of a prefix.
+
+        Assigned addresses are read in one bulk request into a usage
+        bitmap; leased addresses from concurrent callers are marked too.
+        The chosen addresses are leased, then created in one bulk request.
+
+        Raises:
+            ValueError: If the prefix has fewer than ``count`` free addresses
+        """
+        prefix = self.client.get_prefix(prefix_id)
+        if not prefix:
+            return None
+
+        parent = str(prefix.prefix)
+        used = [str(ip.address) for ip in self.client.list_ip_addresses(parent=parent)]
+
+        length = parent.rsplit("/", 1)[1]
+
+        def choose(leased: set[str]) -> list[str]:
+            bitmap = AddressBitmap(parent)
+            bitmap.mark_many(used)
+            # Addresses outside the parent are ignored by the bitmap
+            bitmap.mark_many(list(leased))
+            addresses = bitmap.allocate(count)
+            if len(addresses) < count:
+                return []
+            return [address.split("/", 1)[0] for address in addresses]
+
+        leases = self.leases.reserve_many(IP_LEASE_SCOPE, choose)
+        if not leases:
+            raise ValueError(f"Fewer than {count} free addresses in {parent}")
+
+        try:
+            ips = self.client.create_ip_addresses(
+                [self._to_payload(f"{lease.key}/{length}", data) for lease in leases]
+            )
+        except Exception:
+            for lease in leases:
+                self.leases.release(lease)
+            raise
+        return [self._to_response(ip) for ip in ips]
+
+    async def update_ip_address(
+        self, ip_id: int, data: IpAddressUpdate
+    ) -> IpAddressResponse | None:
+        """Update an existing IP address."""
+        payload = data.model_dump(exclude_unset=True)
+        if payload.get("status"):
+            payload["status"] = payload["status"].value
+        if "tenant_id" in payload:
+            payload["tenant"] = payload.pop("tenant_id")
+
+        ip = self.client.update_ip_address(ip_id, payload)
+        if ip:
+            return self._to_response(ip)
+        return None
+
+    async def delete_ip_address(self, ip_id: int) -> bool:
+        """Delete an IP address."""
+        return self.client.delete_ip_address(ip_id)
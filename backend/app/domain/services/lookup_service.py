@@ -0,0 +1,152 @@
+"""Service layer for address-to-prefix lookups."""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+
+from app.config import get_settings
+from app.domain.allocation.lpm import PrefixIndex
+from app.infrastructure.netbox.client import NetBoxClient, Record, get_netbox_client
+from app.observability.metrics import record_cache
+from app.schemas.prefix import PrefixLookupResult
+
+
+@dataclass
+class PrefixOwner:
+    """Attributes of a prefix returned by lookups."""
+
+    prefix_id: int
+    vlan_id: int | None
+    vlan_vid: int | None
+    site_id: int | None
+    tenant_id: int | None
+
+
+class PrefixLookupIndex:
+    """
+    Process-wide longest-prefix-match index over all NetBox prefixes.
+
+    Built from one full listing, then kept current by fetching only the
+    prefixes changed since the newest ``last_updated`` seen. Deletions are
+    applied directly by the prefix service; deletions made elsewhere are
+    picked up by the periodic full rebuild. The same prefix may exist
+    several times (e.g. in different VRFs); lookups return its lowest ID,
+    and it stays in the index until its last owner is gone.
+    """
+
+    def __init__(self, refresh_seconds: float, rebuild_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self.index: PrefixIndex[PrefixOwner] = PrefixIndex()
+        self._prefixes: dict[int, str] = {}  # prefix id -> prefix
+        # prefix -> prefix id -> owner, for prefixes that exist more than once
+        self._owners: dict[str, dict[int, PrefixOwner]] = {}
+        self._watermark: datetime | None = None
+        self._built_at = 0.0
+        self._refreshed_at = 0.0
+
+    def _publish(self, prefix: str) -> None:
+        """Point the index at the prefix's lowest-ID owner, or drop it."""
+        owners = self._owners.get(prefix)
+        if owners:
+            self.index.insert(prefix, owners[min(owners)])
+        else:
+            self._owners.pop(prefix, None)
+            self.index.remove(prefix)
+
+    def _discard(self, prefix_id: int) -> str | None:
+        prefix = self._prefixes.pop(prefix_id, None)
+        if prefix is not None:
+            self._owners[prefix].pop(prefix_id, None)
+        return prefix
+
+    def _upsert(self, record: Record) -> None:
+        prefix = str(record.prefix)
+        previous = self._discard(record.id)
+        if previous is not None and previous != prefix:
+            self._publish(previous)
+        self._prefixes[record.id] = prefix
+        self._owners.setdefault(prefix, {})[record.id] = PrefixOwner(
+            prefix_id=record.id,
+            vlan_id=record.vlan.id if record.vlan else None,
+            vlan_vid=record.vlan.vid if record.vlan else None,
+            site_id=record.site.id if record.site else None,
+            tenant_id=record.tenant.id if record.tenant else None,
+        )
+        self._publish(prefix)
+        updated = datetime.fromisoformat(str(record.last_updated))
+        if self._watermark is None or updated > self._watermark:
+            self._watermark = updated
+
+    def remove(self, prefix_id: int) -> None:
+        """Drop a deleted prefix from the index."""
+        prefix = self._discard(prefix_id)
+        if prefix is not None:
+            self._publish(prefix)
+
+    def refresh(self, client: NetBoxClient) -> None:
+        """Rebuild or incrementally update the index when it is due."""
+        now = time.monotonic()
+        if now - self._built_at >= self.rebuild_seconds or self._watermark is None:
+            self.index.clear()
+            self._prefixes.clear()
+            self._owners.clear()
+            self._watermark = None
+            for record in client.list_prefixes():
+                self._upsert(record)
+            self._built_at = self._refreshed_at = now
+        elif now - self._refreshed_at >= self.refresh_seconds:
+            changed = client.list_prefixes(
+                last_updated__gte=self._watermark.isoformat()
+            )
+            for record in changed:
+                self._upsert(record)
+            self._refreshed_at = now
+        else:
+            record_cache("prefix_lookup_index", True)
+            return
+        record_cache("prefix_lookup_index", False)
+
+
+@lru_cache
+def get_prefix_lookup_index() -> PrefixLookupIndex:
+    """Get cached prefix lookup index instance."""
+    settings = get_settings()
+    return PrefixLookupIndex(
+        settings.lookup_refresh_seconds,
+        settings.lookup_rebuild_seconds,
+    )
+
+
+class PrefixLookupService:
+    """Business logic for mapping addresses to their owning prefixes."""
+
+    def __init__(self) -> None:
+        self.client = get_netbox_client()
+        self.lookup_index = get_prefix_lookup_index()
+
+    async def lookup(self, addresses: list[str]) -> list[PrefixLookupResult]:
+        """Resolve each address to its most specific prefix."""
+        self.lookup_index.refresh(self.client)
+        index = self.lookup_index.index
+
+        results = []
+        for address in addresses:
+            match = index.lookup(address)
+            if match is None:
+                results.append(PrefixLookupResult(address=address))
+                continue
+            prefix, owner = match
+            results.append(
+                PrefixLookupResult(
+                    address=address,
+                    prefix_id=owner.prefix_id,
+                    prefix=prefix,
+                    vlan_id=owner.vlan_id,
+                    vlan_vid=owner.vlan_vid,
+                    site_id=owner.site_id,
+                    tenant_id=owner.tenant_id,
+                )
+            )
+        return results
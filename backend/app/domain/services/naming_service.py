@@ -0,0 +1,125 @@
+"""Service layer for bulk rack and device naming."""
+
+import time
+from functools import lru_cache
+
+from app.config import get_settings
+from app.domain.allocation.naming import NamingConvention
+from app.infrastructure.netbox.client import NetBoxClient, get_netbox_client
+from app.observability.metrics import record_cache
+from app.schemas.allocation import (
+    BulkNameSpec,
+    BulkNamingResponse,
+    GeneratedName,
+    NameKind,
+)
+from app.utils.slug import generate_slug
+
+
+class ResourceNameIndex:
+    """
+    Process-wide set of the rack and device names and slugs in NetBox.
+
+    Built from one brief listing of all racks and one of all devices and
+    rebuilt when older than ``ttl`` seconds. Names are compared
+    case-insensitively, as NetBox does.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self.names: set[str] = set()
+        self.slugs: set[str] = set()
+        self._built_at: float | None = None
+
+    def refresh(self, client: NetBoxClient) -> None:
+        """Rebuild the index from NetBox when it is stale."""
+        now = time.monotonic()
+        fresh = self._built_at is not None and now - self._built_at < self.ttl
+        record_cache("resource_name_index", fresh)
+        if fresh:
+            return
+
+        names: set[str] = set()
+        for record in client.list_racks(brief=True):
+            names.add(str(record.name).lower())
+        for record in client.list_devices(brief=True):
+            if record.name:
+                names.add(str(record.name).lower())
+
+        self.names = names
+        self.slugs = {generate_slug(name) for name in names}
+        self._built_at = now
+
+
+@lru_cache
+def get_resource_name_index() -> ResourceNameIndex:
+    """Get cached resource name index instance."""
+    return ResourceNameIndex(get_settings().name_index_ttl_seconds)
+
+
+class NamingService:
+    """Business logic for generating many names before any write."""
+
+    def __init__(self) -> None:
+        self.client = get_netbox_client()
+        self.name_index = get_resource_name_index()
+
+    def generate_bulk(self, items: list[BulkNameSpec]) -> BulkNamingResponse:
+        """
+        Generate rack/device names and slugs, resolving collisions.
+
+        A name whose name or slug is taken, by NetBox or earlier in the
+        same request, gets the first free "-2", "-3", ... suffix. Items are
+        processed in request order, so the result is deterministic for a
+        given request and inventory.
+        """
+        self.name_index.refresh(self.client)
+        # Copies, so names generated here are not mistaken for existing ones
+        taken_names = set(self.name_index.names)
+        taken_slugs = set(self.name_index.slugs)
+
+        next_suffix: dict[str, int] = {}  # base slug -> last suffix tried
+        names = []
+        collisions = 0
+        for item in items:
+            for number in range(item.start, item.start + item.count):
+                # BulkNameSpec requires a row for racks and a role for devices
+                if item.kind == NameKind.RACK:
+                    assert item.row is not None
+                    base = NamingConvention.generate_rack_name(
+                        item.site_code, item.row, number
+                    )
+                else:
+                    assert item.role is not None
+                    base = NamingConvention.generate_device_name(
+                        item.role, item.site_code, number
+                    )
+
+                base_slug = generate_slug(base)
+                name, slug = base, base_slug
+                suffix = 1
+                if name.lower() in taken_names or slug in taken_slugs:
+                    # Suffixes below the last one tried for this base are taken
+                    suffix = next_suffix.get(base_slug, 1)
+                    while True:
+                        suffix += 1
+                        name = f"{base}-{suffix}"
+                        slug = f"{base_slug}-{suffix}"
+                        if name.lower() not in taken_names and slug not in taken_slugs:
+                            break
+                    next_suffix[base_slug] = suffix
+
+                taken_names.add(name.lower())
+                taken_slugs.add(slug)
+                collisions += suffix > 1
+                names.append(
+                    GeneratedName(
+                        kind=item.kind,
+                        name=name,
+                        slug=slug,
+                        base_name=base,
+                        renamed=suffix > 1,
+                    )
+                )
+
+        return BulkNamingResponse(names=names, total=len(names), collisions=collisions)
@@ -1,22 +1,64 @@
 """Service layer for IP Prefix operations."""
 
+import ipaddress
+from collections.abc import Iterator
 from datetime import datetime
 
-from app.infrastructure.netbox.client import get_netbox_client
+from app.config import get_settings
+from app.domain.allocation.audit import PrefixRecord, audit_prefixes
+from app.domain.allocation.rules import AllocationRules
+from app.domain.allocation.summarize import summarize_prefixes
+from app.domain.allocation.tree import build_prefix_tree, walk_prefix_tree
+from app.domain.allocation.utilization import UtilizationCache, compute_utilization
+from app.domain.services.lookup_service import get_prefix_lookup_index
+from app.infrastructure.leases.store import get_lease_store
+from app.infrastructure.netbox.client import Record, get_netbox_client
+from app.observability.metrics import record_cache
 from app.schemas.prefix import (
+    AvailablePrefixRequest,
     PrefixCreate,
     PrefixUpdate,
+    PrefixAuditFinding,
+    PrefixAuditResponse,
     PrefixResponse,
+    PrefixSummaryResponse,
+    PrefixTreeNodeResponse,
+    PrefixUtilizationResponse,
     NestedSite,
     NestedTenant,
 )
 
+_utilization_cache = UtilizationCache(get_settings().utilization_cache_ttl_seconds)
+
+# One lease scope for every parent, so blocks leased under overlapping
+# parents (e.g. 10.0.0.0/8 and 10.0.0.0/16) are seen by each other
+PREFIX_LEASE_SCOPE = "prefix"
+
+
+class PrefixExhaustedError(ValueError):
+    """No block of the requested length is free in the parent prefix."""
+
+
+def _leased_within(parent: str, leased: set[str]) -> list[str] | None:
+    """Leased blocks inside ``parent``, or None if one covers all of it."""
+    parent_net = ipaddress.ip_network(parent)
+    within = []
+    for key in leased:
+        block = ipaddress.ip_network(key)
+        if block.version != parent_net.version or not block.overlaps(parent_net):
+            continue
+        if block.prefixlen <= parent_net.prefixlen:  # block covers the parent
+            return None
+        within.append(key)
+    return within
+
 
 class PrefixService:
     """Business logic for IP Prefix management."""
 
     def __init__(self) -> None:
         self.client = get_netbox_client()
+        self.leases = get_lease_store()
 
     def _to_response(self, prefix) -> PrefixResponse:
         """Convert NetBox prefix object to response schema."""
@@ -71,6 +113,122 @@ class PrefixService:
         prefixes = self.client.list_prefixes(**filters)
         return [self._to_response(p) for p in prefixes]
 
+    async def get_prefix_tree(
+        self,
+        site_id: int | None = None,
+        root_id: int | None = None,
+        max_depth: int | None = None,
+    ) -> Iterator[PrefixTreeNodeResponse] | None:
+        """
+        Build the prefix hierarchy of a site or of one prefix's subtree.
+
+        All prefixes are read up front; the returned iterator then yields
+        nodes depth-first. With ``root_id`` only the descendants of that
+        prefix are returned, which lets clients expand subtrees lazily.
+
+        Returns:
+            Iterator of tree nodes, or None if ``root_id`` does not exist
+        """
+        root_parent_id = None
+        if root_id is not None:
+            root = self.client.get_prefix(root_id)
+            if not root:
+                return None
+            root_parent_id = root.id
+            records = list(self.client.list_child_prefixes(str(root.prefix)))
+        else:
+            records = list(self.client.list_prefixes(site_id=site_id))
+
+        roots = build_prefix_tree([str(record.prefix) for record in records])
+
+        def iter_nodes() -> Iterator[PrefixTreeNodeResponse]:
+            for node, depth, parent in walk_prefix_tree(roots, max_depth):
+                record = records[node.index]
+                yield PrefixTreeNodeResponse(
+                    id=record.id,
+                    prefix=node.prefix,
+                    status=record.status.value if record.status else "active",
+                    description=record.description,
+                    parent_id=(
+                        records[parent.index].id if parent else root_parent_id
+                    ),
+                    depth=depth,
+                    child_count=len(node.children),
+                )
+
+        return iter_nodes()
+
+    def load_audit_records(self) -> list[PrefixRecord]:
+        """Read every prefix with the attributes the audit needs."""
+        return [
+            PrefixRecord(
+                id=prefix.id,
+                prefix=str(prefix.prefix),
+                vrf_id=prefix.vrf.id if prefix.vrf else None,
+                site_id=prefix.site.id if prefix.site else None,
+                tenant_id=prefix.tenant.id if prefix.tenant else None,
+            )
+            for prefix in self.client.list_prefixes()
+        ]
+
+    async def audit(self, limit: int = 1000) -> PrefixAuditResponse:
+        """
+        Audit the whole prefix inventory for duplicates and overlaps.
+
+        Raises:
+            RuntimeError: If the optional NumPy dependency is missing
+        """
+        report = audit_prefixes(self.load_audit_records(), limit=limit)
+        return PrefixAuditResponse(
+            total_prefixes=report.total_prefixes,
+            duplicate_count=report.duplicate_count,
+            overlap_count=report.overlap_count,
+            findings=[
+                PrefixAuditFinding(
+                    kind=finding.kind,
+                    vrf_id=finding.vrf_id,
+                    prefix_id=finding.prefix_id,
+                    prefix=finding.prefix,
+                    other_prefix_id=finding.other_prefix_id,
+                    other_prefix=finding.other_prefix,
+                    detail=finding.detail,
+                )
+                for finding in report.findings
+            ],
+        )
+
+    async def summarize(
+        self,
+        prefixes: list[str] | None = None,
+        site_id: int | None = None,
+        tenant_id: int | None = None,
+        status: str | None = None,
+    ) -> PrefixSummaryResponse:
+        """
+        Summarize prefixes into the minimal covering set of CIDRs.
+
+        Uses the given prefixes, or every NetBox prefix matching the filters.
+
+        Raises:
+            ValueError: If a given prefix is not valid
+        """
+        if prefixes is None:
+            filters: dict[str, str | int] = {}
+            if site_id:
+                filters["site_id"] = site_id
+            if tenant_id:
+                filters["tenant_id"] = tenant_id
+            if status:
+                filters["status"] = status
+            prefixes = [str(p.prefix) for p in self.client.list_prefixes(**filters)]
+
+        summary = summarize_prefixes(prefixes)
+        return PrefixSummaryResponse(
+            input_count=len(prefixes),
+            summary_count=len(summary),
+            prefixes=summary,
+        )
+
     async def get_prefix(self, prefix_id: int) -> PrefixResponse | None:
         """Get a single prefix by ID."""
         prefix = self.client.get_prefix(prefix_id)
@@ -95,6 +253,70 @@ class PrefixService:
         payload = {k: v for k, v in payload.items() if v is not None}
 
         prefix = self.client.create_prefix(payload)
+        _utilization_cache.invalidate(str(prefix.prefix))
+        return self._to_response(prefix)
+
+    async def allocate_next_prefix(
+        self, parent_id: int, data: AvailablePrefixRequest
+    ) -> PrefixResponse | None:
+        """
+        Allocate and create the next available child prefix of a parent.
+
+        The chosen block is leased before it is created in NetBox, so
+        concurrent allocations in other workers skip it. On success the
+        lease is left to expire, covering readers that listed the children
+        before the new prefix became visible.
+
+        Raises:
+            ValueError: If the prefix length does not fit in the parent
+            PrefixExhaustedError: If no block of the requested length is free
+        """
+        parent = self.client.get_prefix(parent_id)
+        if not parent:
+            return None
+
+        parent_prefix = str(parent.prefix)
+        parent_net = ipaddress.ip_network(parent_prefix)
+        if not parent_net.prefixlen <= data.prefix_length <= parent_net.max_prefixlen:
+            raise ValueError(
+                f"/{data.prefix_length} is not a valid child length of {parent_prefix}"
+            )
+        used = [str(p.prefix) for p in self.client.list_child_prefixes(parent_prefix)]
+
+        def choose(leased: set[str]) -> str | None:
+            leased_here = _leased_within(parent_prefix, leased)
+            if leased_here is None:
+                return None
+            return AllocationRules.get_next_available_prefix(
+                parent_prefix, data.prefix_length, used + leased_here
+            )
+
+        lease = self.leases.reserve(PREFIX_LEASE_SCOPE, choose)
+        if lease is None:
+            raise PrefixExhaustedError(
+                f"No /{data.prefix_length} available in {parent_prefix}"
+            )
+
+        payload = {
+            "prefix": lease.key,
+            "status": data.status.value,
+            "description": data.description,
+            "site": data.site_id,
+            "tenant": data.tenant_id,
+            "vlan": data.vlan_id,
+            "role": data.role_id,
+            "is_pool": data.is_pool,
+            "tags": data.tags,
+        }
+        # Remove None values
+        payload = {k: v for k, v in payload.items() if v is not None}
+
+        try:
+            prefix = self.client.create_prefix(payload)
+        except Exception:
+            self.leases.release(lease)
+            raise
+        _utilization_cache.invalidate(lease.key)
         return self._to_response(prefix)
 
     async def update_prefix(
@@ -106,10 +328,56 @@ class PrefixService:
             payload["status"] = payload["status"].value
 
         prefix = self.client.update_prefix(prefix_id, payload)
-        if prefix:
-            return self._to_response(prefix)
-        return None
+        if not prefix:
+            return None
+        if "prefix" in payload:
+            # Moved: its old parents are not known without another NetBox read
+            _utilization_cache.invalidate()
+        else:
+            _utilization_cache.invalidate(str(prefix.prefix))
+        return self._to_response(prefix)
 
     async def delete_prefix(self, prefix_id: int) -> bool:
         """Delete a prefix."""
-        return self.client.delete_prefix(prefix_id)
+        deleted = self.client.delete_prefix(prefix_id)
+        if deleted:
+            _utilization_cache.invalidate()
+            get_prefix_lookup_index().remove(prefix_id)
+        return deleted
+
+    def _utilization(self, prefix: Record) -> PrefixUtilizationResponse:
+        """Get a (cached) utilization report for a NetBox prefix object."""
+        parent = str(prefix.prefix)
+        report = _utilization_cache.get(parent)
+        record_cache("utilization", report is not None)
+        if report is None:
+            children = self.client.list_child_prefixes(parent)
+            report = compute_utilization(parent, (str(c.prefix) for c in children))
+            _utilization_cache.put(report)
+
+        return PrefixUtilizationResponse(
+            prefix_id=prefix.id,
+            prefix=report.prefix,
+            total_addresses=report.total_addresses,
+            used_addresses=report.used_addresses,
+            free_addresses=report.free_addresses,
+            utilization=report.utilization,
+            free_blocks=report.free_blocks,
+            largest_free_block=report.largest_free_block,
+        )
+
+    async def get_utilization(
+        self, prefix_id: int
+    ) -> PrefixUtilizationResponse | None:
+        """Get used/free space of a prefix."""
+        prefix = self.client.get_prefix(prefix_id)
+        if prefix:
+            return self._utilization(prefix)
+        return None
+
+    async def list_site_utilization(
+        self, site_id: int
+    ) -> list[PrefixUtilizationResponse]:
+        """Get used/free space of every container prefix of a site."""
+        containers = self.client.list_prefixes(site_id=site_id, status="container")
+        return [self._utilization(prefix) for prefix in containers]
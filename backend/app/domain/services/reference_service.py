@@ -0,0 +1,72 @@
+"""Service layer for cached NetBox reference data."""
+
+import time
+from functools import lru_cache
+from typing import Any
+
+from app.config import get_settings
+from app.infrastructure.netbox.client import NetBoxClient, Record
+from app.observability.metrics import record_cache
+
+# Reference data kinds and their NetBox (app, endpoint)
+REFERENCE_KINDS = {
+    "roles": ("dcim", "device_roles"),
+    "tags": ("extras", "tags"),
+    "vlan_groups": ("ipam", "vlan_groups"),
+    "sites": ("dcim", "sites"),
+}
+
+
+def _endpoint(client: NetBoxClient, kind: str) -> Any:
+    app, endpoint = REFERENCE_KINDS[kind]
+    return getattr(getattr(client, app), endpoint)
+
+
+class ReferenceData:
+    """
+    Per-process read-through cache of rarely changing NetBox objects.
+
+    Holds device roles, tags, VLAN groups and sites by ID. ``prefetch``
+    loads a whole kind (done by the startup warmup); lookups of anything
+    else go to NetBox and are cached too. Writes through this API update
+    or drop entries, and the TTL bounds staleness from edits made directly
+    in NetBox or by other workers.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._entries: dict[tuple[str, int], tuple[float, Record]] = {}
+
+    def get(self, client: NetBoxClient, kind: str, object_id: int) -> Record | None:
+        """Get one object, from the cache when fresh, else from NetBox."""
+        entry = self._entries.get((kind, object_id))
+        if entry is not None and entry[0] > time.monotonic():
+            record_cache("reference_data", True)
+            return entry[1]
+
+        record_cache("reference_data", False)
+        record = _endpoint(client, kind).get(object_id)
+        if record:
+            self.put(kind, record)
+        else:
+            self.invalidate(kind, object_id)
+        return record
+
+    def put(self, kind: str, record: Record) -> None:
+        self._entries[(kind, record.id)] = (time.monotonic() + self.ttl, record)
+
+    def invalidate(self, kind: str, object_id: int) -> None:
+        self._entries.pop((kind, object_id), None)
+
+    def prefetch(self, client: NetBoxClient, kind: str) -> int:
+        """Load every object of a kind (one paginated listing); return the count."""
+        records = list(_endpoint(client, kind).all())
+        for record in records:
+            self.put(kind, record)
+        return len(records)
+
+
+@lru_cache
+def get_reference_data() -> ReferenceData:
+    """Get cached reference data instance."""
+    return ReferenceData(get_settings().reference_cache_ttl_seconds)
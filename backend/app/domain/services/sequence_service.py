@@ -0,0 +1,179 @@
+"""Service layer for tenant and facility sequence numbers."""
+
+import time
+from collections import defaultdict
+from functools import lru_cache
+
+from app.config import get_settings
+from app.domain.allocation.naming import NamingConvention
+from app.infrastructure.leases.store import Lease, get_lease_store
+from app.infrastructure.netbox.client import NetBoxClient, get_netbox_client
+from app.observability.metrics import record_cache
+
+MAX_FACILITY_NUMBER = 99  # facility codes carry a two-digit DC number
+
+
+class NameIndex:
+    """
+    Process-wide index of the sequence numbers already used in NetBox.
+
+    Built from one listing of all tenants and one of all sites, parsed with
+    ``NamingConvention.parse_tenant_name`` / ``parse_facility_code``, and
+    rebuilt when older than ``ttl`` seconds. Numbers handed out by this
+    process are added directly, so it does not need a rebuild per site.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self.tenants: dict[tuple[str, str], set[int]] = defaultdict(set)
+        self.facilities: dict[str, set[int]] = defaultdict(set)
+        self._built_at: float | None = None
+
+    def refresh(self, client: NetBoxClient) -> None:
+        """Rebuild the index from NetBox when it is stale."""
+        now = time.monotonic()
+        fresh = self._built_at is not None and now - self._built_at < self.ttl
+        record_cache("name_index", fresh)
+        if fresh:
+            return
+
+        tenants: dict[tuple[str, str], set[int]] = defaultdict(set)
+        for tenant in client.list_tenants():
+            parsed = NamingConvention.parse_tenant_name(str(tenant.name))
+            if parsed:
+                key = (str(parsed["country"]), str(parsed["region"]))
+                tenants[key].add(int(parsed["number"]))
+
+        facilities: dict[str, set[int]] = defaultdict(set)
+        for site in client.list_sites():
+            parsed = NamingConvention.parse_facility_code(site.facility or "")
+            if parsed:
+                facilities[str(parsed["city_code"])].add(int(parsed["dc_number"]))
+
+        self.tenants, self.facilities = tenants, facilities
+        self._built_at = now
+
+    def invalidate(self) -> None:
+        """Force a rebuild on next use."""
+        self._built_at = None
+
+
+@lru_cache
+def get_name_index() -> NameIndex:
+    """Get cached name index instance."""
+    return NameIndex(get_settings().name_index_ttl_seconds)
+
+
+def _first_free(
+    used: set[int], leased: set[str], limit: int | None = None
+) -> str | None:
+    """Get the lowest positive number, as a lease key, not used or leased."""
+    taken = used | {int(key) for key in leased}
+    number = 1
+    while number in taken:
+        number += 1
+    if limit is not None and number > limit:
+        return None
+    return str(number)
+
+
+class SequenceService:
+    """
+    Hands out the next free tenant and facility numbers per region.
+
+    Numbers are reserved in the shared lease store before the tenant or
+    site is created, so concurrent workers never pick the same one. Leases
+    live as long as the name index, which covers the window in which
+    another worker's index may not yet show the new name.
+    """
+
+    def __init__(self) -> None:
+        self.client = get_netbox_client()
+        self.leases = get_lease_store()
+        self.name_index = get_name_index()
+
+    def next_tenant_name(
+        self,
+        country: str,
+        region: str,
+        reserve: bool = True,
+    ) -> tuple[str, Lease | None]:
+        """
+        Get the tenant name with the next free number in a region.
+
+        Args:
+            country: Country code (e.g., "br")
+            region: Region code (e.g., "ne")
+            reserve: Lease the number; if False only preview it
+
+        Returns:
+            (tenant name, lease) - the lease is None when previewing
+
+        Raises:
+            ValueError: If no number could be reserved
+        """
+        country, region = country.lower(), region.lower()
+        self.name_index.refresh(self.client)
+        used = self.name_index.tenants[(country, region)]
+        number, lease = self._next(f"tenant:{country}-{region}", used, None, reserve)
+        if number is None:
+            raise ValueError(f"Could not reserve a tenant number for {region}")
+        return NamingConvention.generate_tenant_name(country, region, number), lease
+
+    def next_facility_code(
+        self,
+        city_code: str,
+        reserve: bool = True,
+    ) -> tuple[str, Lease | None]:
+        """
+        Get the facility code with the next free DC number for a city.
+
+        Args:
+            city_code: City or region code (e.g., "NE")
+            reserve: Lease the number; if False only preview it
+
+        Returns:
+            (facility code, lease) - the lease is None when previewing
+
+        Raises:
+            ValueError: If all DC numbers of the city are taken
+        """
+        city_code = city_code.upper()
+        self.name_index.refresh(self.client)
+        used = self.name_index.facilities[city_code]
+        number, lease = self._next(
+            f"facility:{city_code}", used, MAX_FACILITY_NUMBER, reserve
+        )
+        if number is None:
+            raise ValueError(f"No free facility number left for {city_code}")
+        return NamingConvention.generate_facility_code(city_code, number), lease
+
+    def _next(
+        self,
+        scope: str,
+        used: set[int],
+        limit: int | None,
+        reserve: bool,
+    ) -> tuple[int | None, Lease | None]:
+        """Lease (or just peek at) the lowest free number of a scope."""
+        if not reserve:
+            key = _first_free(used, self.leases.leased_keys(scope), limit)
+            return (int(key) if key else None), None
+
+        lease = self.leases.reserve(
+            scope,
+            lambda leased: _first_free(used, leased, limit),
+            ttl=self.name_index.ttl,
+        )
+        if lease is None:
+            return None, None
+        used.add(int(lease.key))
+        return int(lease.key), lease
+
+    def release(self, *leases: Lease | None) -> None:
+        """Give back numbers whose tenant or site was not created."""
+        for lease in leases:
+            if lease is not None:
+                self.leases.release(lease)
+                self.name_index.invalidate()
+
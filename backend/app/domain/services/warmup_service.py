@@ -0,0 +1,104 @@
+"""Service layer for warming a worker up before it takes traffic."""
+
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import Any
+
+from app.config import get_settings
+from app.domain.services.reference_service import (
+    REFERENCE_KINDS,
+    get_reference_data,
+)
+from app.infrastructure.netbox.client import get_netbox_client
+from app.observability.startup import get_startup_report
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """
+    Warmup state of this worker, reported by /ready.
+
+    One attempt creates the NetBox client, pre-opens ``connections``
+    keep-alive connections, then prefetches every reference data kind in
+    parallel. Failed attempts (NetBox down or slow) are retried every
+    ``retry_seconds`` until one succeeds; the worker is ready from then on.
+    Every step is timed as a startup phase.
+    """
+
+    def __init__(self, connections: int, retry_seconds: float) -> None:
+        self.connections = connections
+        self.retry_seconds = retry_seconds
+        self.ready = False
+        self.attempts = 0
+        self.error: str | None = None
+        self.opened_connections = 0
+        self.reference: dict[str, int] = {}
+        self.seconds: float | None = None
+
+    async def warm_up(self) -> None:
+        """Make one warmup attempt, raising on failure."""
+        report = get_startup_report()
+        started = time.perf_counter()
+        with report.phase("warmup netbox_client"):
+            client = get_netbox_client()
+        with report.phase("warmup connections"):
+            self.opened_connections = await asyncio.to_thread(
+                client.warm_connections, self.connections
+            )
+
+        reference = get_reference_data()
+
+        def prefetch(kind: str) -> int:
+            with report.phase(f"warmup {kind}"):
+                return reference.prefetch(client, kind)
+
+        counts = await asyncio.gather(
+            *(asyncio.to_thread(prefetch, kind) for kind in REFERENCE_KINDS)
+        )
+        self.reference = dict(zip(REFERENCE_KINDS, counts, strict=True))
+        self.seconds = time.perf_counter() - started
+
+    async def run(self) -> None:
+        """Attempt warmup until it succeeds, then mark the worker ready."""
+        while True:
+            self.attempts += 1
+            try:
+                await self.warm_up()
+            except Exception as error:
+                self.error = f"{type(error).__name__}: {error}"
+                logger.warning(
+                    "Warmup attempt %d failed (%s), retrying in %.0fs",
+                    self.attempts,
+                    self.error,
+                    self.retry_seconds,
+                )
+                await asyncio.sleep(self.retry_seconds)
+            else:
+                self.error = None
+                self.ready = True
+                return
+
+    def skip(self) -> None:
+        """Mark the worker ready without warming up."""
+        self.ready = True
+
+    def status(self) -> dict[str, Any]:
+        """JSON-ready readiness report."""
+        return {
+            "status": "ready" if self.ready else "warming_up",
+            "attempts": self.attempts,
+            "error": self.error,
+            "connections": self.opened_connections,
+            "reference_data": self.reference,
+            "warmup_seconds": self.seconds,
+        }
+
+
+@lru_cache
+def get_warmup() -> Warmup:
+    """Get cached warmup instance."""
+    settings = get_settings()
+    return Warmup(settings.warmup_connections, settings.warmup_retry_seconds)
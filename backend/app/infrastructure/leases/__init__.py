@@ -0,0 +1,5 @@
+"""Cross-worker lease store."""
+
+from app.infrastructure.leases.store import Lease, LeaseStore
+
+__all__ = ["Lease", "LeaseStore"]
@@ -0,0 +1,176 @@
+"""SQLite-backed lease store for coordinating allocations across workers.
+
+Uvicorn workers are separate processes, so in-memory locks cannot stop two
+of them from picking the same free block. Allocators instead reserve the
+block here (a short write transaction on a WAL-mode SQLite file shared by
+all workers on the host) before committing it to NetBox.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from app.config import get_settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (scope, key)
+)
+"""
+
+
+@dataclass
+class Lease:
+    """Reservation of a key within a scope until ``expires_at``."""
+
+    scope: str
+    key: str
+    owner: str
+    expires_at: float
+
+
+class LeaseStore:
+    """
+    Atomic, TTL-bound reservations shared by all workers on a host.
+
+    Scopes group keys that compete for the same space (e.g. all prefix
+    blocks, whose choosers skip leased blocks overlapping their parent).
+    Reservations are made inside ``BEGIN IMMEDIATE`` transactions, so the
+    choice of key and its insertion are atomic with respect to every other
+    worker using the same database file.
+    """
+
+    def __init__(self, path: str, default_ttl: float = 30.0) -> None:
+        self.path = path
+        self.default_ttl = default_ttl
+        self.owner = f"{os.getpid()}"
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, creating the schema on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def reserve(
+        self,
+        scope: str,
+        choose: Callable[[set[str]], str | None],
+        ttl: float | None = None,
+    ) -> Lease | None:
+        """
+        Atomically choose and reserve a key within a scope.
+
+        Args:
+            scope: Namespace the keys compete in (e.g. "prefix")
+            choose: Called with the currently leased keys of the scope;
+                returns the key to reserve or None if nothing is available
+            ttl: Lease lifetime in seconds (defaults to ``default_ttl``)
+
+        Returns:
+            The new lease, or None if ``choose`` found nothing to reserve
+        """
+
+        def choose_one(leased: set[str]) -> list[str]:
+            key = choose(leased)
+            return [key] if key is not None else []
+
+        leases = self.reserve_many(scope, choose_one, ttl)
+        return leases[0] if leases else None
+
+    def reserve_many(
+        self,
+        scope: str,
+        choose: Callable[[set[str]], list[str]],
+        ttl: float | None = None,
+    ) -> list[Lease]:
+        """
+        Atomically choose and reserve several keys within a scope.
+
+        Args:
+            scope: Namespace the keys compete in (e.g. "ip")
+            choose: Called with the currently leased keys of the scope;
+                returns the keys to reserve (empty if none are available)
+            ttl: Lease lifetime in seconds (defaults to ``default_ttl``)
+
+        Returns:
+            The new leases, or an empty list if nothing was reserved
+        """
+        conn = self._connection()
+        now = time.time()
+        expires_at = now + (ttl if ttl is not None else self.default_ttl)
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM leases WHERE scope = ? AND expires_at <= ?",
+                (scope, now),
+            )
+            leased = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT key FROM leases WHERE scope = ?", (scope,)
+                )
+            }
+            keys = choose(leased)
+            if not keys or not leased.isdisjoint(keys):
+                conn.execute("ROLLBACK")
+                return []
+            conn.executemany(
+                "INSERT INTO leases (scope, key, owner, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(scope, key, self.owner, expires_at) for key in keys],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        return [
+            Lease(scope=scope, key=key, owner=self.owner, expires_at=expires_at)
+            for key in keys
+        ]
+
+    def reserve_key(
+        self,
+        scope: str,
+        key: str,
+        ttl: float | None = None,
+    ) -> Lease | None:
+        """Reserve a specific key, or return None if it is already leased."""
+        return self.reserve(scope, lambda leased: key, ttl)
+
+    def leased_keys(self, scope: str) -> set[str]:
+        """Get the keys with an active lease in a scope."""
+        rows = self._connection().execute(
+            "SELECT key FROM leases WHERE scope = ? AND expires_at > ?",
+            (scope, time.time()),
+        )
+        return {row[0] for row in rows}
+
+    def release(self, lease: Lease) -> None:
+        """Release a lease before it expires (e.g. after a failed commit)."""
+        self._connection().execute(
+            "DELETE FROM leases WHERE scope = ? AND key = ? AND owner = ?",
+            (lease.scope, lease.key, lease.owner),
+        )
+
+
+@lru_cache
+def get_lease_store() -> LeaseStore:
+    """Get cached lease store instance."""
+    settings = get_settings()
+    return LeaseStore(settings.lease_db_path, settings.lease_ttl_seconds)
@@ -1,17 +1,32 @@
 """NetBox API Client using pynetbox."""
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-
-import pynetbox
-from pynetbox.core.api import Api
+from typing import TYPE_CHECKING, Any, TypeAlias
 
 from app.config import get_settings
+from app.observability.budget import track_session
+from app.observability.metrics import instrument_session
+from app.observability.tracing import trace_session
+
+if TYPE_CHECKING:
+    from pynetbox.core.api import Api
+
+# pynetbox has no type hints, so its records and record sets (lazy,
+# paginated iterators of records) are Any
+Record: TypeAlias = Any
+RecordSet: TypeAlias = Any
 
 
 class NetBoxClient:
     """Wrapper around pynetbox for NetBox API interactions."""
 
     def __init__(self) -> None:
+        # Imported here so pynetbox (and requests) stay out of app startup
+        import pynetbox
+        from requests.adapters import DEFAULT_POOLSIZE
+
         settings = get_settings()
         self._api: Api = pynetbox.api(
             url=settings.netbox_url,
@@ -19,6 +34,13 @@ class NetBoxClient:
         )
         # Disable SSL verification for development
         self._api.http_session.verify = False
+        instrument_session(self._api.http_session)
+        track_session(self._api.http_session)
+        trace_session(self._api.http_session)
+        # Keep up to pool_size connections per host open for reuse
+        self.pool_size = settings.netbox_pool_size
+        for adapter in set(self._api.http_session.adapters.values()):
+            adapter.init_poolmanager(DEFAULT_POOLSIZE, self.pool_size)
 
     @property
     def ipam(self):
@@ -35,23 +57,54 @@ class NetBoxClient:
         """Access Tenancy endpoints."""
         return self._api.tenancy
 
+    @property
+    def extras(self) -> Any:
+        """Access Extras endpoints (tags, etc.)."""
+        return self._api.extras
+
+    def warm_connections(self, count: int) -> int:
+        """
+        Open up to ``count`` keep-alive connections to NetBox.
+
+        Sends that many status requests at once, so each opens its own
+        pooled connection for later requests to reuse. Returns the number
+        of connections opened (capped at the pool size).
+        """
+        count = min(count, self.pool_size)
+        if count <= 0:
+            return 0
+        # Released together, so no request can reuse another's connection
+        barrier = threading.Barrier(count)
+
+        def status(_: int) -> None:
+            barrier.wait()
+            self._api.status()
+
+        with ThreadPoolExecutor(count) as pool:
+            return len(list(pool.map(status, range(count))))
+
     def get_prefix(self, prefix_id: int):
         """Get a single prefix by ID."""
         return self.ipam.prefixes.get(prefix_id)
 
-    def list_prefixes(self, **filters):
+    def list_prefixes(self, **filters: str | int | None) -> RecordSet:
         """List prefixes with optional filters."""
         return self.ipam.prefixes.filter(**filters)
 
+    def list_child_prefixes(self, parent: str) -> RecordSet:
+        """List all prefixes nested within a parent prefix."""
+        return self.ipam.prefixes.filter(within=parent)
+
     def create_prefix(self, data: dict):
         """Create a new prefix."""
         return self.ipam.prefixes.create(data)
 
     def update_prefix(self, prefix_id: int, data: dict):
-        """Update an existing prefix."""
+        """Update an existing prefix; returns it as refreshed by the PATCH."""
         prefix = self.get_prefix(prefix_id)
         if prefix:
-            return prefix.update(data)
+            prefix.update(data)
+            return prefix
         return None
 
     def delete_prefix(self, prefix_id: int) -> bool:
@@ -61,6 +114,49 @@ class NetBoxClient:
             return prefix.delete()
         return False
 
+    def get_ip_address(self, ip_id: int) -> Record | None:
+        """Get a single IP address by ID."""
+        return self.ipam.ip_addresses.get(ip_id)
+
+    def list_ip_addresses(self, **filters: str | int) -> RecordSet:
+        """List IP addresses with optional filters."""
+        return self.ipam.ip_addresses.filter(**filters)
+
+    def create_ip_addresses(self, data: list[dict[str, object]]) -> list[Record]:
+        """Create several IP addresses in a single bulk request."""
+        return list(self.ipam.ip_addresses.create(data))
+
+    def update_ip_address(self, ip_id: int, data: dict[str, object]) -> Record | None:
+        """Update an existing IP address; returns it as refreshed by the PATCH."""
+        ip = self.get_ip_address(ip_id)
+        if ip:
+            ip.update(data)
+            return ip
+        return None
+
+    def delete_ip_address(self, ip_id: int) -> bool:
+        """Delete an IP address."""
+        ip = self.get_ip_address(ip_id)
+        if ip:
+            return bool(ip.delete())
+        return False
+
+    def list_tenants(self, **filters: str | int | None) -> RecordSet:
+        """List tenants with optional filters."""
+        return self.tenancy.tenants.filter(**filters)
+
+    def list_sites(self, **filters: str | int | None) -> RecordSet:
+        """List sites with optional filters."""
+        return self.dcim.sites.filter(**filters)
+
+    def list_racks(self, **filters: str | int | bool | None) -> RecordSet:
+        """List racks with optional filters."""
+        return self.dcim.racks.filter(**filters)
+
+    def list_devices(self, **filters: str | int | bool | None) -> RecordSet:
+        """List devices with optional filters."""
+        return self.dcim.devices.filter(**filters)
+
 
 @lru_cache
 def get_netbox_client() -> NetBoxClient:
@@ -1,18 +1,80 @@
 """FastAPI Application Entry Point."""
 
-from fastapi import FastAPI
+# ruff: noqa: E402 - the import timer must be installed before other imports
+from app.observability.startup import get_startup_report
+
+startup = get_startup_report()
+startup.imports.install()
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from importlib.util import find_spec
+from typing import Any
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
-from app.api.v1 import prefixes, vlans, devices, sites, tenants, vlan_groups, device_roles, tags, allocation
+from app.api.lazy import LazyRouter
+from app.api.v1 import (
+    allocation,
+    device_roles,
+    devices,
+    ip_addresses,
+    prefixes,
+    sites,
+    tags,
+    tenants,
+    vlan_groups,
+    vlans,
+)
 from app.config import get_settings
+from app.domain.allocation.profiles import get_allocation_profiles
+from app.domain.services.warmup_service import get_warmup
+from app.observability.budget import CallBudgetMiddleware
+from app.observability.metrics import MetricsMiddleware, lru_caches
+from app.observability.profiling import ProfilingMiddleware
+from app.observability.tracing import TracingMiddleware, configure_tracing
+from app.utils.slug import slug_cache_info
+
+startup.imports.uninstall()
 
 settings = get_settings()
 
+# Export spans when a tracing exporter is configured (no-op spans otherwise)
+if settings.tracing_exporter != "none":
+    with startup.phase("configure_tracing"):
+        configure_tracing(settings)
+
+# Validate and compile allocation profiles once, failing fast on bad files
+with startup.phase("allocation_profiles"):
+    get_allocation_profiles()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start warming up NetBox connections and reference data in the background."""
+    warmup = get_warmup()
+    task = None
+    if settings.warmup_enabled:
+        # Not awaited, so /health answers even while NetBox is down; /ready
+        # says 503 until the warmup (retried until it succeeds) is done
+        task = asyncio.create_task(warmup.run())
+    else:
+        warmup.skip()
+    startup.mark_ready()
+    yield
+    if task is not None:
+        task.cancel()
+
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS Middleware
@@ -24,8 +86,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Profiling of requests carrying the admin token (not installed otherwise)
+if settings.profiling_token:
+    app.add_middleware(ProfilingMiddleware, token=settings.profiling_token)
+
+# NetBox call budget and Server-Timing header per request
+app.add_middleware(
+    CallBudgetMiddleware,
+    max_calls=settings.netbox_call_budget,
+    max_repeats=settings.netbox_repeat_budget,
+    mode=settings.netbox_budget_mode,
+)
+
+# Tracing Middleware (one server span per request), unless FastAPI has
+# built-in telemetry, which already creates it
+if settings.tracing_exporter != "none" and find_spec("fastapi.telemetry") is None:
+    app.add_middleware(TracingMiddleware)
+
+# Metrics Middleware (outermost, so it also times CORS handling)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    lru_caches.register("slug", slug_cache_info)
+
 # Include routers - IPAM
 app.include_router(prefixes.router, prefix="/api/v1/prefixes", tags=["IPAM - Prefixes"])
+app.include_router(ip_addresses.router, prefix="/api/v1/ip-addresses", tags=["IPAM - IP Addresses"])
 app.include_router(vlans.router, prefix="/api/v1/vlans", tags=["IPAM - VLANs"])
 app.include_router(vlan_groups.router, prefix="/api/v1/vlan-groups", tags=["IPAM - VLAN Groups"])
 
@@ -43,8 +128,31 @@ app.include_router(tags.router, prefix="/api/v1/tags", tags=["Extras - Tags"])
 # Include routers - Allocation
 app.include_router(allocation.router, prefix="/api/v1/allocation", tags=["Allocation"])
 
+# Include routers - Debug (hidden, so imported on first use unless disabled)
+if settings.lazy_routers:
+    app.mount("/debug", LazyRouter("app.api.debug:router"))
+else:
+    from app.api import debug
+
+    app.include_router(debug.router, prefix="/debug", include_in_schema=False)
+
 
 @app.get("/health")
 async def health_check() -> dict[str, str]:
     """Health check endpoint."""
     return {"status": "healthy", "version": settings.app_version}
+
+
+@app.get("/ready")
+async def readiness_check(response: Response) -> dict[str, Any]:
+    """Readiness probe: 503 until NetBox connections and reference data are warm."""
+    warmup = get_warmup()
+    if not warmup.ready:
+        response.status_code = 503
+    return warmup.status()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus metrics endpoint."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
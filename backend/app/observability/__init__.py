@@ -0,0 +1 @@
+"""Observability: metrics and request instrumentation."""
@@ -0,0 +1,248 @@
+"""Per-request NetBox call budget and N+1 detection.
+
+Every NetBox call made while an API request is handled is added to a
+per-request tally (calls, response bytes, time spent waiting on NetBox),
+which is returned in the ``Server-Timing`` response header::
+
+    Server-Timing: netbox;dur=41.7, netbox-calls;desc=3, netbox-bytes;desc=5120
+
+A request over its budget - too many calls in total, or too many calls of
+the same kind, the signature of an N+1 loop (e.g. one ``GET
+/dcim/devices/{id}/`` per rack) - is logged, or, with
+``NETBOX_BUDGET_MODE=raise`` as in the test suite, fails with
+``NetBoxBudgetExceededError`` so call-count regressions break CI. Routes whose
+call count legitimately grows with their input declare their own budget
+with the ``netbox_budget`` dependency, or, once they know their input size,
+allow the calls it needs with ``expect_netbox_calls``.
+"""
+
+import logging
+import re
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Final
+from urllib.parse import parse_qs, urlsplit
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+if TYPE_CHECKING:
+    from requests import Response, Session
+
+logger = logging.getLogger(__name__)
+
+_OBJECT_ID = re.compile(r"/\d+(?=/|$)")
+
+
+class _Keep(Enum):
+    """Sentinel type of ``_KEEP``."""
+
+    KEEP = "keep"
+
+
+_KEEP: Final = _Keep.KEEP  # netbox_budget: leave this budget as configured
+
+
+class NetBoxBudgetExceededError(RuntimeError):
+    """An API request made more NetBox calls than its budget allows."""
+
+
+@dataclass
+class CallUsage:
+    """NetBox calls made while handling one API request."""
+
+    calls: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    by_signature: Counter[str] = field(default_factory=Counter)
+    # Budgets of the request, None meaning unlimited
+    max_calls: int | None = None
+    max_repeats: int | None = None
+    # Extra repeats allowed per (method, endpoint), see expect_netbox_calls
+    expected: Counter[tuple[str, str]] = field(default_factory=Counter)
+
+    def add(self, signature: str | None, size: int, seconds: float) -> None:
+        """Record one NetBox call."""
+        self.calls += 1
+        self.bytes += size
+        self.seconds += seconds
+        if signature is not None:
+            self.by_signature[signature] += 1
+
+    def violations(self) -> list[str]:
+        """Describe how the request exceeded its budgets, if it did."""
+        problems = []
+        if self.max_calls is not None and self.calls > self.max_calls:
+            problems.append(f"{self.calls} NetBox calls (budget {self.max_calls})")
+        if self.max_repeats is not None:
+            for signature, count in self.by_signature.most_common():
+                budget = self.max_repeats + self._expected(signature)
+                if count > budget:
+                    problems.append(
+                        f"{count} x {signature} (possible N+1, budget {budget})"
+                    )
+                    break
+        return problems
+
+    def _expected(self, signature: str) -> int:
+        """Extra repeats allowed for calls with this signature."""
+        method, _, path = signature.partition(" ")
+        path = path.removesuffix("{id}/")
+        return sum(
+            count
+            for (expected_method, endpoint), count in self.expected.items()
+            if expected_method == method and path.endswith(f"/{endpoint}/")
+        )
+
+    def server_timing(self) -> str:
+        """Format the tally as a ``Server-Timing`` header value."""
+        return (
+            f"netbox;dur={self.seconds * 1000:.1f}, "
+            f"netbox-calls;desc={self.calls}, "
+            f"netbox-bytes;desc={self.bytes}"
+        )
+
+
+current_usage: ContextVar[CallUsage | None] = ContextVar(
+    "current_usage", default=None
+)
+
+
+def call_signature(method: str, url: str) -> str | None:
+    """
+    Group NetBox calls that differ only in object ID.
+
+    Follow-up pages of a listing (``offset`` > 0) are part of one logical
+    call rather than repeats, and get no signature.
+
+    Example: ("GET", ".../api/dcim/devices/12/?brief=1")
+        -> "GET /api/dcim/devices/{id}/"
+    """
+    parts = urlsplit(url)
+    if parse_qs(parts.query).get("offset", ["0"])[0] != "0":
+        return None
+    return f"{method} {_OBJECT_ID.sub('/{id}', parts.path)}"
+
+
+def record_netbox_usage(response: "Response", *args: Any, **kwargs: Any) -> None:
+    """``requests`` response hook adding a NetBox call to the request's tally."""
+    usage = current_usage.get()
+    if usage is None:
+        return
+    length = response.headers.get("Content-Length")
+    usage.add(
+        call_signature(response.request.method or "", response.request.url or ""),
+        int(length) if length else len(response.content),
+        response.elapsed.total_seconds(),
+    )
+
+
+def track_session(session: "Session") -> None:
+    """Tally every NetBox call made through a ``requests`` session."""
+    hooks = session.hooks.setdefault("response", [])
+    if record_netbox_usage not in hooks:
+        hooks.append(record_netbox_usage)
+
+
+def netbox_budget(
+    calls: int | None | _Keep = _KEEP, repeats: int | None | _Keep = _KEEP
+) -> Callable[[], Awaitable[None]]:
+    """
+    Dependency overriding the NetBox call budgets of a route.
+
+    Budgets not passed keep their configured value.
+
+    Args:
+        calls: Max NetBox calls per request, None for unlimited
+        repeats: Max calls with the same signature, None for unlimited
+
+    Example:
+        @router.get("/audit", dependencies=[Depends(netbox_budget(calls=None))])
+    """
+
+    async def override() -> None:
+        usage = current_usage.get()
+        if usage is None:
+            return
+        if calls is not _KEEP:
+            usage.max_calls = calls
+        if repeats is not _KEEP:
+            usage.max_repeats = repeats
+
+    return override
+
+
+def expect_netbox_calls(method: str, endpoint: str, count: int) -> None:
+    """
+    Allow ``count`` more NetBox calls of one kind in the current request.
+
+    For calls that scale with the request, such as one create per planned
+    object: the total budget and the repeat budget of that call both grow by
+    ``count``, while every other call keeps the configured budgets, so a
+    per-object lookup added next to the creates is still caught.
+
+    Args:
+        method: HTTP method of the calls, e.g. "POST"
+        endpoint: NetBox endpoint path, e.g. "ipam/prefixes"
+        count: Number of calls to allow
+
+    Example:
+        expect_netbox_calls("POST", "ipam/prefixes", len(plan.host_subnets))
+    """
+    usage = current_usage.get()
+    if usage is None:
+        return
+    if usage.max_calls is not None:
+        usage.max_calls += count
+    usage.expected[method, endpoint.strip("/")] += count
+
+
+class CallBudgetMiddleware:
+    """ASGI middleware tallying NetBox calls per request and enforcing budgets."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_calls: int | None = 50,
+        max_repeats: int | None = 10,
+        mode: str = "log",
+    ) -> None:
+        self.app = app
+        self.max_calls = max_calls
+        self.max_repeats = max_repeats
+        self.mode = mode
+
+    def _check(self, scope: Scope, usage: CallUsage) -> None:
+        problems = usage.violations()
+        if not problems:
+            return
+        message = (
+            f"{scope['method']} {scope['path']} exceeded its NetBox call budget: "
+            + "; ".join(problems)
+        )
+        if self.mode == "raise":
+            raise NetBoxBudgetExceededError(message)
+        logger.warning(message)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        usage = CallUsage(max_calls=self.max_calls, max_repeats=self.max_repeats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                self._check(scope, usage)
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", usage.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = current_usage.set(usage)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_usage.reset(token)
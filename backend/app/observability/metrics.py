@@ -0,0 +1,190 @@
+"""Prometheus metrics for API routes, NetBox calls and caches.
+
+Route metrics come from a plain ASGI middleware labelled by route
+template (e.g. ``/api/v1/prefixes/{prefix_id}``), so label cardinality is
+bounded by the number of routes. NetBox calls are observed by a response
+hook on the pynetbox ``requests`` session and attributed to the route in
+flight through a context variable. Each observation is a few dict lookups
+and a histogram bucket increment, cheap enough to leave on in production.
+"""
+
+import re
+import time
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, Metric
+from prometheus_client.registry import REGISTRY, Collector
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+if TYPE_CHECKING:
+    from functools import _CacheInfo
+
+    from requests import Response, Session
+
+UNMATCHED_ROUTE = "<unmatched>"
+NO_ROUTE = "<none>"  # NetBox calls made outside a request (e.g. CLI, startup)
+
+REQUEST_LATENCY = Histogram(
+    "ipam_http_request_duration_seconds",
+    "API request latency by route.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "ipam_http_requests_in_progress",
+    "API requests currently being handled, by route.",
+    ["method", "route"],
+)
+NETBOX_CALLS = Counter(
+    "ipam_netbox_calls_total",
+    "NetBox API calls, by the API route that made them.",
+    ["route", "endpoint"],
+)
+NETBOX_LATENCY = Histogram(
+    "ipam_netbox_request_duration_seconds",
+    "NetBox API call latency by endpoint and status.",
+    ["endpoint", "method", "status"],
+)
+CACHE_REQUESTS = Counter(
+    "ipam_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+
+current_route: ContextVar[str] = ContextVar("current_route", default=NO_ROUTE)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup."""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def netbox_endpoint(url: str) -> str:
+    """
+    Map a NetBox API URL to an endpoint label.
+
+    Example: ".../api/ipam/prefixes/12/available-ips/" -> "ipam.prefixes"
+    """
+    parts = [part for part in urlsplit(url).path.split("/") if part]
+    if "api" in parts:
+        parts = parts[parts.index("api") + 1 :]
+    return ".".join(parts[:2]) or "root"
+
+
+def observe_netbox_response(response: "Response", *args: Any, **kwargs: Any) -> None:
+    """``requests`` response hook recording a NetBox call."""
+    endpoint = netbox_endpoint(response.request.url or "")
+    NETBOX_CALLS.labels(current_route.get(), endpoint).inc()
+    NETBOX_LATENCY.labels(
+        endpoint, response.request.method, str(response.status_code)
+    ).observe(response.elapsed.total_seconds())
+
+
+def instrument_session(session: "Session") -> None:
+    """Record every NetBox call made through a ``requests`` session."""
+    hooks = session.hooks.setdefault("response", [])
+    if observe_netbox_response not in hooks:
+        hooks.append(observe_netbox_response)
+
+
+class LruCacheCollector(Collector):
+    """Expose hits and misses of ``functools.lru_cache`` caches."""
+
+    def __init__(self) -> None:
+        self.caches: dict[str, Callable[[], _CacheInfo]] = {}
+
+    def register(self, name: str, cache_info: Callable[[], "_CacheInfo"]) -> None:
+        """Track an ``functools.lru_cache`` cache, given its ``cache_info``."""
+        self.caches[name] = cache_info
+
+    def collect(self) -> Iterator[Metric]:
+        family = CounterMetricFamily(
+            "ipam_lru_cache_requests",
+            "In-process LRU cache lookups by cache and result (hit or miss).",
+            labels=["cache", "result"],
+        )
+        for name, cache_info in self.caches.items():
+            info = cache_info()
+            family.add_metric([name, "hit"], info.hits)
+            family.add_metric([name, "miss"], info.misses)
+        yield family
+
+
+lru_caches = LruCacheCollector()
+REGISTRY.register(lru_caches)
+
+
+class RouteTemplates:
+    """Resolve request paths to their route templates (one per middleware)."""
+
+    def __init__(self) -> None:
+        self._routes: list[tuple[re.Pattern[str], str, set[str]]] | None = None
+
+    def __call__(self, scope: Scope) -> str:
+        if self._routes is None:
+            # Full path templates, in declaration order, from the OpenAPI
+            # schema, which does not depend on how routers are mounted
+            paths = scope["app"].openapi()["paths"]
+            self._routes = [
+                (compile_path(template)[0], template, {m.upper() for m in operations})
+                for template, operations in paths.items()
+            ]
+        return self._match(scope["method"], scope["path"])
+
+    @lru_cache(maxsize=1024)  # noqa: B019 - one instance per middleware
+    def _match(self, method: str, path: str) -> str:
+        assert self._routes is not None  # built by __call__ before matching
+        fallback = UNMATCHED_ROUTE
+        for regex, template, methods in self._routes:
+            if regex.match(path):
+                if method in methods:
+                    return template
+                if fallback == UNMATCHED_ROUTE:
+                    fallback = template
+        return fallback
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and in-flight requests per route."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        clock: Callable[[], float] = time.perf_counter,
+        exclude: tuple[str, ...] = ("/metrics",),
+    ) -> None:
+        self.app = app
+        self.clock = clock
+        self.exclude = exclude
+        self.routes = RouteTemplates()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self.routes(scope)
+        status = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        token = current_route.set(route)
+        start = self.clock()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_LATENCY.labels(method, route, status).observe(self.clock() - start)
+            current_route.reset(token)
+            in_progress.dec()
@@ -0,0 +1,253 @@
+"""Opt-in cProfile capture of single API requests.
+
+A request carrying the admin profiling token, in the ``X-Profile-Token``
+header or the ``profile_token`` query parameter, runs under cProfile. The
+profile is written to disk as pstats (for ``python -m pstats`` or
+snakeviz) and speedscope JSON (for https://www.speedscope.app), its ID is
+returned in the ``X-Profile-Id`` response header, and the last N profiles
+are kept, oldest deleted first, for download from ``/debug/profiles``.
+
+The middleware is only installed when ``PROFILING_TOKEN`` is set, so
+profiling costs nothing when disabled. cProfile only sees the event loop
+thread, which runs the async route handlers and their NetBox calls; one
+request is profiled at a time, other requests in flight at the same time
+show up in its profile.
+"""
+
+import asyncio
+import hmac
+import json
+import pstats
+import re
+import secrets
+import threading
+import time
+from cProfile import Profile
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, TypeAlias
+from urllib.parse import parse_qs
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+
+PROFILE_HEADER = "x-profile-token"
+PROFILE_QUERY = "profile_token"
+PROFILE_FORMATS = {"pstats": ".pstats", "speedscope": ".speedscope.json"}
+
+_PROFILE_ID = re.compile(r"[0-9a-f]{16}")
+
+Func: TypeAlias = tuple[str, int, str]  # cProfile's (file, line, function)
+
+
+@dataclass
+class ProfileRecord:
+    """A stored request profile."""
+
+    id: str
+    method: str
+    path: str
+    status: int
+    duration_ms: float
+    created_at: float
+
+
+def to_speedscope(
+    stats: pstats.Stats, name: str, max_depth: int = 64, min_share: float = 0.001
+) -> dict[str, Any]:
+    """
+    Convert cProfile statistics to a speedscope "sampled" profile.
+
+    cProfile records time per caller/callee pair rather than stacks, so
+    stacks are rebuilt top-down, splitting each function's time between
+    its callees in proportion to the time they spent called from it.
+    Branches below ``min_share`` of the total time are dropped.
+    """
+    # {func: (cc, nc, tt, ct, {caller: (cc, nc, tt, ct)})}; stats and
+    # total_tt are missing from the pstats type stubs
+    raw = stats.stats  # type: ignore[attr-defined]
+    min_time = stats.total_tt * min_share  # type: ignore[attr-defined]
+    callees: dict[Func, list[tuple[Func, float]]] = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, (_, _, _, caller_ct) in callers.items():
+            callees.setdefault(caller, []).append((func, caller_ct))
+
+    frames: list[dict[str, str | int]] = []
+    frame_index: dict[Func, int] = {}
+    samples: list[list[int]] = []
+    weights: list[float] = []
+
+    def frame(func: Func) -> int:
+        if func not in frame_index:
+            file, line, function = func
+            frame_index[func] = len(frames)
+            frames.append({"name": function, "file": file, "line": line})
+        return frame_index[func]
+
+    def walk(func: Func, time_spent: float, stack: list[int]) -> None:
+        _, _, tt, ct, _ = raw[func]
+        stack = [*stack, frame(func)]
+        scale = time_spent / ct if ct else 0.0
+        if tt * scale > 0:
+            samples.append(stack)
+            weights.append(tt * scale)
+        if len(stack) >= max_depth:
+            return
+        for callee, edge_ct in callees.get(func, ()):
+            if frame_index.get(callee) not in stack and edge_ct * scale > min_time:
+                walk(callee, edge_ct * scale, stack)
+
+    for func, (_, _, _, ct, callers) in raw.items():
+        if not callers:
+            walk(func, ct, [])
+
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "ipam-backend",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+    }
+
+
+class ProfileStore:
+    """
+    Ring buffer of request profiles in a directory.
+
+    Each profile is ``<id>.json`` (its ProfileRecord) plus one file per
+    format. The directory is the only state, so every worker sharing it
+    can list and serve all profiles.
+    """
+
+    def __init__(self, directory: str, keep: int) -> None:
+        self.directory = Path(directory)
+        self.keep = keep
+
+    def save(self, record: ProfileRecord, stats: pstats.Stats) -> None:
+        """Store a profile, deleting the oldest beyond ``keep``."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stats.dump_stats(self.directory / f"{record.id}.pstats")
+        speedscope = to_speedscope(stats, f"{record.method} {record.path}")
+        (self.directory / f"{record.id}.speedscope.json").write_text(
+            json.dumps(speedscope), encoding="utf-8"
+        )
+        (self.directory / f"{record.id}.json").write_text(
+            json.dumps(asdict(record)), encoding="utf-8"
+        )
+        for old in self.list()[self.keep :]:
+            self.delete(old.id)
+
+    def list(self) -> list[ProfileRecord]:
+        """Get the stored profiles, newest first."""
+        if not self.directory.is_dir():
+            return []
+        records = []
+        for path in self.directory.glob("*.json"):
+            if _PROFILE_ID.fullmatch(path.stem):
+                try:
+                    records.append(ProfileRecord(**json.loads(path.read_text())))
+                except (OSError, ValueError, TypeError):
+                    continue  # deleted or being written by another worker
+        return sorted(records, key=lambda r: r.created_at, reverse=True)
+
+    def path(self, profile_id: str, fmt: str) -> Path | None:
+        """Get the file of a stored profile in a format, if it exists."""
+        if not _PROFILE_ID.fullmatch(profile_id) or fmt not in PROFILE_FORMATS:
+            return None
+        path = self.directory / f"{profile_id}{PROFILE_FORMATS[fmt]}"
+        return path if path.is_file() else None
+
+    def delete(self, profile_id: str) -> None:
+        """Delete a stored profile."""
+        for suffix in (".json", *PROFILE_FORMATS.values()):
+            (self.directory / f"{profile_id}{suffix}").unlink(missing_ok=True)
+
+
+@lru_cache
+def get_profile_store() -> ProfileStore:
+    """Get cached profile store instance."""
+    settings = get_settings()
+    return ProfileStore(settings.profiling_dir, settings.profiling_keep)
+
+
+def check_token(token: str | None, expected: str | None) -> bool:
+    """Check a profiling token in constant time; False when profiling is off."""
+    if not token or not expected:
+        return False
+    return hmac.compare_digest(token.encode(), expected.encode())
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests that carry the profiling token."""
+
+    def __init__(
+        self, app: ASGIApp, token: str, store: ProfileStore | None = None
+    ) -> None:
+        self.app = app
+        self.token = token
+        self.store = store or get_profile_store()
+        self._busy = threading.Lock()
+
+    def _requested(self, scope: Scope) -> bool:
+        token = dict(scope["headers"]).get(PROFILE_HEADER.encode(), b"").decode()
+        if not token and PROFILE_QUERY.encode() in scope["query_string"]:
+            query = parse_qs(scope["query_string"].decode())
+            token = query.get(PROFILE_QUERY, [""])[0]
+        return check_token(token, self.token)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._busy.acquire(blocking=False):
+            # Another request is being profiled; serve this one normally
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = secrets.token_hex(8)
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = Profile()
+        created_at = time.time()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                profiler.disable()
+            record = ProfileRecord(
+                id=profile_id,
+                method=scope["method"],
+                path=scope["path"],
+                status=status,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                created_at=created_at,
+            )
+            # Building and writing the profile is slow: keep it off the loop
+            await asyncio.to_thread(
+                lambda: self.store.save(record, pstats.Stats(profiler))
+            )
+        finally:
+            self._busy.release()
@@ -0,0 +1,198 @@
+"""Cold start instrumentation: import times and startup phase timings.
+
+``get_startup_report().imports`` is a meta path finder that, while
+installed, times the execution of every imported module (self time
+excluding nested imports, and cumulative time), like ``python -X
+importtime`` but in-process. app.main installs it before its own imports
+and removes it once they are done, and wraps the remaining startup steps
+in ``phase()`` blocks, so /debug/startup can show where a cold start went.
+This module imports only the standard library, so it can be loaded first.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+from typing import Any
+
+
+@dataclass
+class ModuleImport:
+    """Time spent executing one module."""
+
+    name: str
+    self_seconds: float
+    cumulative_seconds: float
+
+
+@dataclass
+class Phase:
+    """One timed startup step, relative to the start of the report."""
+
+    name: str
+    offset_seconds: float
+    duration_seconds: float
+
+
+class _TimedLoader(Loader):
+    """Loader wrapper timing ``exec_module`` of the loader it wraps."""
+
+    def __init__(self, loader: Loader, timer: "ImportTimer") -> None:
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType | None:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        # Module code (and anyone after it) sees the real loader
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        with self._timer.timing(module.__name__):
+            self._loader.exec_module(module)
+
+
+class ImportTimer(MetaPathFinder):
+    """Meta path finder timing every module imported while it is installed."""
+
+    def __init__(self) -> None:
+        self.modules: list[ModuleImport] = []
+        self.seconds = 0.0
+        self._started = 0.0
+        self._local = threading.local()
+
+    @property
+    def installed(self) -> bool:
+        return self in sys.meta_path
+
+    def install(self) -> None:
+        """Start timing imports."""
+        if not self.installed:
+            sys.meta_path.insert(0, self)
+            self._started = time.perf_counter()
+
+    def uninstall(self) -> None:
+        """Stop timing imports."""
+        if self.installed:
+            sys.meta_path.remove(self)
+            self.seconds += time.perf_counter() - self._started
+
+    def find_spec(
+        self,
+        name: str,
+        path: Sequence[str] | None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        # Let the other finders locate the module, then wrap its loader
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+            if (
+                spec.origin is not None
+                and spec.loader is not None
+                and hasattr(spec.loader, "exec_module")
+            ):
+                spec.loader = _TimedLoader(spec.loader, self)
+            return spec
+        return None
+
+    @contextmanager
+    def timing(self, name: str) -> Iterator[None]:
+        """Record the self and cumulative time of one module execution."""
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)  # time spent in nested imports
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            cumulative = time.perf_counter() - started
+            nested = stack.pop()
+            if stack:
+                stack[-1] += cumulative
+            self.modules.append(ModuleImport(name, cumulative - nested, cumulative))
+
+    def by_package(self, app_depth: int = 3) -> dict[str, float]:
+        """Self time per top-level package (per ``app.x.y`` module for ours)."""
+        totals: dict[str, float] = {}
+        for module in self.modules:
+            parts = module.name.split(".")
+            key = ".".join(parts[:app_depth] if parts[0] == "app" else parts[:1])
+            totals[key] = totals.get(key, 0.0) + module.self_seconds
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def _process_age() -> float | None:
+    """Seconds since this process started (Linux only, else None)."""
+    try:
+        with open("/proc/self/stat", encoding="ascii") as stat:
+            # Fields after the parenthesized command name; starttime is #22
+            started_ticks = int(stat.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", encoding="ascii") as uptime:
+            uptime_seconds = float(uptime.read().split()[0])
+    except (OSError, IndexError, ValueError):
+        return None
+    return uptime_seconds - started_ticks / os.sysconf("SC_CLK_TCK")
+
+
+class StartupReport:
+    """Import breakdown and phase timings of one application start."""
+
+    def __init__(self) -> None:
+        self.imports = ImportTimer()
+        self.phases: list[Phase] = []
+        self.started = time.perf_counter()
+        # Interpreter and server start-up before the app was imported
+        self.process_age = _process_age()
+        self.ready_seconds: float | None = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a startup step."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append(
+                Phase(name, started - self.started, time.perf_counter() - started)
+            )
+
+    def mark_ready(self) -> None:
+        """Record that startup finished and the app serves requests."""
+        self.imports.uninstall()
+        if self.ready_seconds is None:
+            self.ready_seconds = time.perf_counter() - self.started
+
+    def as_dict(self, top: int = 25) -> dict[str, Any]:
+        """JSON-ready report with the ``top`` slowest modules and packages."""
+        slowest = sorted(self.imports.modules, key=lambda m: -m.cumulative_seconds)
+        return {
+            "process_age_at_import_seconds": self.process_age,
+            "ready_seconds": self.ready_seconds,
+            "imports": {
+                "seconds": self.imports.seconds,
+                "modules": len(self.imports.modules),
+                "by_package": dict(list(self.imports.by_package().items())[:top]),
+                "slowest": [asdict(module) for module in slowest[:top]],
+            },
+            "phases": [asdict(phase) for phase in self.phases],
+        }
+
+
+@lru_cache
+def get_startup_report() -> StartupReport:
+    """Get the startup report of this process."""
+    return StartupReport()
@@ -0,0 +1,201 @@
+"""OpenTelemetry tracing of routes, allocation stages and NetBox calls.
+
+Code is instrumented against the OpenTelemetry API only: spans are no-ops
+(a context switch, no allocation of span data) until ``configure_tracing``
+installs an SDK tracer provider, which needs the optional ``tracing`` extra.
+Spans are exported as JSON lines to a file or to an OTLP/HTTP collector,
+sampled by trace ID ratio unless the caller's ``traceparent`` says
+otherwise. Outbound NetBox requests carry the W3C trace context, so a
+NetBox instance that traces too joins the same trace.
+"""
+
+import functools
+import inspect
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from opentelemetry import propagate, trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import Settings
+from app.observability.metrics import RouteTemplates, netbox_endpoint
+
+if TYPE_CHECKING:
+    from requests import PreparedRequest, Response, Session
+    from requests.adapters import HTTPAdapter
+
+tracer = trace.get_tracer("ipam")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def configure_tracing(settings: Settings) -> None:
+    """
+    Install the SDK tracer provider and span exporter set up in settings.
+
+    Raises:
+        RuntimeError: If the ``tracing`` extra is not installed
+    """
+    try:
+        from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+            SpanExporter,
+        )
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError as e:
+        raise RuntimeError(
+            "opentelemetry-sdk is required for tracing; "
+            "install ipam-backend[tracing]"
+        ) from e
+
+    exporter: SpanExporter
+    if settings.tracing_exporter == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+        except ImportError as e:
+            raise RuntimeError(
+                "The OTLP exporter is required for TRACING_EXPORTER=otlp; "
+                "install ipam-backend[tracing]"
+            ) from e
+        exporter = OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+    else:
+        exporter = ConsoleSpanExporter(
+            out=open(settings.tracing_file_path, "a", buffering=1),  # noqa: SIM115
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+
+    provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: settings.app_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+
+def traced(name: str | None = None) -> Callable[[F], F]:
+    """
+    Decorator running a function, or consuming a generator, in a span.
+
+    Example:
+        @classmethod
+        @traced()
+        def plan_host_subnets(cls, ...): ...
+    """
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def generator_wrapper(*args: Any, **kwargs: Any) -> Iterator[Any]:
+                # The span is current only while the generator runs, not
+                # while it is suspended in the caller's loop
+                span = tracer.start_span(span_name)
+                try:
+                    iterator = func(*args, **kwargs)
+                    while True:
+                        with trace.use_span(span, end_on_exit=False):
+                            try:
+                                item = next(iterator)
+                            except StopIteration:
+                                return
+                        yield item
+                finally:
+                    span.end()
+
+            return generator_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with tracer.start_as_current_span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+@functools.cache
+def _tracing_adapter() -> type["HTTPAdapter"]:
+    """The adapter class, defined on first use to keep ``requests`` out of startup."""
+    from requests.adapters import HTTPAdapter
+
+    class TracingAdapter(HTTPAdapter):
+        """``requests`` adapter tracing NetBox calls and propagating context."""
+
+        def send(
+            self, request: "PreparedRequest", *args: Any, **kwargs: Any
+        ) -> "Response":
+            method, url = request.method or "", request.url or ""
+            endpoint = netbox_endpoint(url)
+            with tracer.start_as_current_span(
+                f"NetBox {method} {endpoint}",
+                kind=SpanKind.CLIENT,
+                attributes={
+                    "http.request.method": method,
+                    "url.full": url,
+                    "netbox.endpoint": endpoint,
+                },
+            ) as span:
+                propagate.inject(request.headers)
+                response = super().send(request, *args, **kwargs)
+                span.set_attribute("http.response.status_code", response.status_code)
+                if response.status_code >= 400:
+                    span.set_status(Status(StatusCode.ERROR))
+                return response
+
+    return TracingAdapter
+
+
+def trace_session(session: "Session") -> None:
+    """Trace every NetBox call made through a ``requests`` session."""
+    adapter = _tracing_adapter()
+    for scheme in ("http://", "https://"):
+        if not isinstance(session.adapters.get(scheme), adapter):
+            session.mount(scheme, adapter())
+
+
+class TracingMiddleware:
+    """ASGI middleware running each request in a server span named by route."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.routes = RouteTemplates()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self.routes(scope)
+        carrier = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in scope["headers"]
+        }
+        with tracer.start_as_current_span(
+            f"{method} {route}",
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={
+                "http.request.method": method,
+                "http.route": route,
+                "url.path": scope["path"],
+            },
+        ) as span:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
@@ -1,6 +1,9 @@
 """Allocation schemas for API validation."""
 
-from pydantic import BaseModel, Field
+from enum import Enum
+from typing import Annotated
+
+from pydantic import BaseModel, Field, model_validator
 
 
 class VlanDefinitionResponse(BaseModel):
@@ -12,6 +15,17 @@ class VlanDefinitionResponse(BaseModel):
     category: str
 
 
+class AllocationProfileResponse(BaseModel):
+    """Allocation profile summary response."""
+
+    name: str
+    description: str
+    container_prefix_size: int
+    vlan_subnet_size: int
+    host_subnet_size: int
+    vlan_count: int
+
+
 class VlanRangeResponse(BaseModel):
     """VLAN range response."""
 
@@ -27,9 +41,13 @@ class PrefixAllocationRequest(BaseModel):
     base_network: str = Field(..., description="Base network (e.g., '10.0')")
     site_id: int | None = Field(None, description="Site ID to associate prefixes")
     tenant_id: int | None = Field(None, description="Tenant ID to associate prefixes")
-    rack_count: int = Field(default=20, ge=1, le=50, description="Number of racks")
+    rack_count: int = Field(default=20, ge=1, le=1024, description="Number of racks")
+    hosts_per_rack: int | None = Field(
+        None, ge=1, description="Usable addresses per rack (sizes host subnets)"
+    )
     create_vlans: bool = Field(default=True, description="Also create VLANs")
     dry_run: bool = Field(default=False, description="Preview without creating")
+    profile: str = Field(default="default", description="Allocation profile name")
 
 
 class PrefixAllocationResponse(BaseModel):
@@ -53,6 +71,39 @@ class AllocationPlanResponse(BaseModel):
     vlans_to_create: list[VlanDefinitionResponse]
     total_prefixes: int
     total_vlans: int
+    warnings: list[str] = Field(default_factory=list)
+
+
+class HostSubnetRangeResponse(BaseModel):
+    """Range-encoded host subnets of a single VLAN subnet."""
+
+    parent_prefix: str = Field(..., description="VLAN subnet the hosts are carved from")
+    prefix_length: int = Field(..., description="Length of each host subnet")
+    start_index: int = Field(..., ge=0, description="Index of the first child subnet")
+    count: int = Field(..., ge=0, description="Number of consecutive child subnets")
+    vlan_vid: int | None = None
+    rack_offset: int = Field(0, ge=0, description="Racks numbered before this range")
+
+
+class HostSubnetRangeRequest(HostSubnetRangeResponse):
+    """Host subnet range to expand, capped at one VLAN's racks per request."""
+
+    count: int = Field(
+        ..., ge=0, le=1024, description="Number of consecutive child subnets"
+    )
+
+
+class CompactAllocationPlanResponse(BaseModel):
+    """Allocation plan with host subnets encoded as ranges."""
+
+    base_network: str
+    container_prefix: str
+    vlan_subnets: list[PrefixAllocationResponse]
+    host_subnet_ranges: list[HostSubnetRangeResponse]
+    vlans_to_create: list[VlanDefinitionResponse]
+    total_prefixes: int
+    total_vlans: int
+    warnings: list[str] = Field(default_factory=list)
 
 
 class SiteAllocationRequest(BaseModel):
@@ -63,8 +114,12 @@ class SiteAllocationRequest(BaseModel):
     base_network: str = Field(..., description="Base network (e.g., '10.0')")
     facility_code: str | None = Field(None, description="Facility code (e.g., 'NE-DC-01')")
     tenant_name: str | None = Field(None, description="Tenant name (auto-generated if not provided)")
-    rack_count: int = Field(default=20, ge=1, le=50, description="Number of racks")
+    rack_count: int = Field(default=20, ge=1, le=1024, description="Number of racks")
+    hosts_per_rack: int | None = Field(
+        None, ge=1, description="Usable addresses per rack (sizes host subnets)"
+    )
     dry_run: bool = Field(default=False, description="Preview without creating")
+    profile: str = Field(default="default", description="Allocation profile name")
 
 
 class SiteAllocationResponse(BaseModel):
@@ -74,3 +129,114 @@ class SiteAllocationResponse(BaseModel):
     tenant: dict | None
     allocation_plan: AllocationPlanResponse
     created: bool
+
+
+class CapacitySimulationRequest(BaseModel):
+    """Request for an in-memory capacity planning simulation."""
+
+    pool: str = Field(..., description="Pool to carve sites from (e.g., '10.0.0.0/8')")
+    site_count: int = Field(
+        default=1, ge=1, le=1000000, description="Number of hypothetical sites"
+    )
+    rack_count: int = Field(default=20, ge=1, le=1024, description="Racks per site")
+    rack_counts: list[Annotated[int, Field(ge=1, le=1024)]] | None = Field(
+        None,
+        max_length=1000000,
+        description="Per-site rack counts; overrides site_count/rack_count",
+    )
+    hosts_per_rack: int | None = Field(
+        None, ge=1, description="Usable addresses per rack (sizes host subnets)"
+    )
+    reserved_prefixes: list[str] = Field(
+        default_factory=list, description="Prefixes already in use within the pool"
+    )
+    profile: str = Field(default="default", description="Allocation profile name")
+
+
+class CapacitySimulationResponse(BaseModel):
+    """Capacity planning simulation result."""
+
+    pool: str
+    pool_addresses: int
+    requested_sites: int
+    allocated_sites: int
+    exhausted_at: int | None = Field(
+        None, description="Index of the first site that did not fit"
+    )
+    remaining_sites: int = Field(
+        ..., description="Additional sites that still fit after the replay"
+    )
+    container_addresses: int
+    vlan_subnet_addresses: int
+    host_subnet_addresses: int
+    under_provisioned_sites: int
+    free_addresses: int
+    utilization: float
+    host_utilization: float
+    free_blocks: dict[int, int] = Field(
+        default_factory=dict, description="Free CIDR block count by prefix length"
+    )
+    largest_free_block: str | None = None
+
+
+MAX_BULK_NAMES = 100000
+
+
+class NameKind(str, Enum):
+    """Kinds of names generated in bulk."""
+
+    RACK = "rack"
+    DEVICE = "device"
+
+
+class BulkNameSpec(BaseModel):
+    """A numbered series of rack or device names."""
+
+    kind: NameKind
+    site_code: str = Field(..., min_length=1, description="Site code (e.g., 'NE1')")
+    row: str | None = Field(None, description="Rack row (racks only, e.g., 'A')")
+    role: str | None = Field(
+        None, description="Device role (devices only, e.g., 'leaf')"
+    )
+    start: int = Field(default=1, ge=1, description="First number of the series")
+    count: int = Field(default=1, ge=1, le=10000, description="Names in the series")
+
+    @model_validator(mode="after")
+    def check_kind_fields(self) -> "BulkNameSpec":
+        """Check that racks have a row and devices a role."""
+        if self.kind == NameKind.RACK and not self.row:
+            raise ValueError("rack names need a row")
+        if self.kind == NameKind.DEVICE and not self.role:
+            raise ValueError("device names need a role")
+        return self
+
+
+class BulkNamingRequest(BaseModel):
+    """Request for bulk name and slug generation."""
+
+    items: list[BulkNameSpec] = Field(..., min_length=1, max_length=1000)
+
+    @model_validator(mode="after")
+    def check_total(self) -> "BulkNamingRequest":
+        """Cap the number of names generated in one call."""
+        if sum(item.count for item in self.items) > MAX_BULK_NAMES:
+            raise ValueError(f"at most {MAX_BULK_NAMES} names per request")
+        return self
+
+
+class GeneratedName(BaseModel):
+    """A generated name and slug, suffixed if the base name was taken."""
+
+    kind: NameKind
+    name: str
+    slug: str
+    base_name: str
+    renamed: bool = False
+
+
+class BulkNamingResponse(BaseModel):
+    """Bulk naming result, in request order."""
+
+    names: list[GeneratedName]
+    total: int
+    collisions: int
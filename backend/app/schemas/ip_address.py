@@ -0,0 +1,74 @@
+"""Pydantic schemas for IP Address (IPAM)."""
+
+import ipaddress
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+class IpAddressStatus(str, Enum):
+    """Valid status values for IP addresses."""
+
+    ACTIVE = "active"
+    RESERVED = "reserved"
+    DEPRECATED = "deprecated"
+    DHCP = "dhcp"
+    SLAAC = "slaac"
+
+
+class IpAddressBase(BaseModel):
+    """Base schema for IP Address."""
+
+    address: str = Field(..., description="Address with mask (e.g., 10.0.8.5/26)")
+    status: IpAddressStatus = Field(default=IpAddressStatus.ACTIVE)
+    description: str | None = Field(default=None, max_length=200)
+    dns_name: str | None = Field(default=None, max_length=255)
+    tenant_id: int | None = None
+    tags: list[str] = Field(default_factory=list)
+
+    @field_validator("address")
+    @classmethod
+    def validate_address(cls, v: str) -> str:
+        """Validate that address is a valid interface notation."""
+        try:
+            ipaddress.ip_interface(v)
+        except ValueError as e:
+            raise ValueError(f"Invalid IP address: {e}") from e
+        return v
+
+
+class IpAddressCreate(IpAddressBase):
+    """Schema for creating a new IP address."""
+
+    pass
+
+
+class IpAddressUpdate(BaseModel):
+    """Schema for updating an existing IP address."""
+
+    status: IpAddressStatus | None = None
+    description: str | None = None
+    dns_name: str | None = None
+    tenant_id: int | None = None
+    tags: list[str] | None = None
+
+
+class AvailableIpRequest(BaseModel):
+    """Schema for attributes applied to allocated available IPs."""
+
+    status: IpAddressStatus = Field(default=IpAddressStatus.ACTIVE)
+    description: str | None = Field(default=None, max_length=200)
+    dns_name: str | None = Field(default=None, max_length=255)
+    tenant_id: int | None = None
+    tags: list[str] = Field(default_factory=list)
+
+
+class IpAddressResponse(IpAddressBase):
+    """Schema for IP address response."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    created: datetime
+    last_updated: datetime
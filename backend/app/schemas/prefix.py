@@ -49,6 +49,7 @@ class PrefixCreate(PrefixBase):
 class PrefixUpdate(BaseModel):
     """Schema for updating an existing prefix."""
 
+    prefix: str | None = Field(default=None, description="New CIDR (moves it)")
     status: PrefixStatus | None = None
     description: str | None = None
     site_id: int | None = None
@@ -58,6 +59,26 @@ class PrefixUpdate(BaseModel):
     is_pool: bool | None = None
     tags: list[str] | None = None
 
+    @field_validator("prefix")
+    @classmethod
+    def validate_prefix(cls, v: str | None) -> str | None:
+        """Validate that a new prefix is a valid CIDR notation."""
+        return v if v is None else PrefixBase.validate_prefix(v)
+
+
+class AvailablePrefixRequest(BaseModel):
+    """Schema for allocating the next available child prefix."""
+
+    prefix_length: int = Field(..., ge=1, le=128, description="Desired prefix length")
+    status: PrefixStatus = Field(default=PrefixStatus.ACTIVE)
+    description: str | None = Field(default=None, max_length=200)
+    site_id: int | None = None
+    tenant_id: int | None = None
+    vlan_id: int | None = None
+    role_id: int | None = None
+    is_pool: bool = Field(default=False)
+    tags: list[str] = Field(default_factory=list)
+
 
 class NestedSite(BaseModel):
     """Nested site representation."""
@@ -83,3 +104,103 @@ class PrefixResponse(PrefixBase):
     tenant: NestedTenant | None = None
     created: datetime
     last_updated: datetime
+
+
+class PrefixUtilizationResponse(BaseModel):
+    """Schema for prefix utilization and free-space report."""
+
+    prefix_id: int
+    prefix: str
+    total_addresses: int
+    used_addresses: int
+    free_addresses: int
+    utilization: float = Field(..., description="Used space in percent")
+    free_blocks: dict[int, int] = Field(
+        default_factory=dict,
+        description="Count of maximal free CIDR blocks by prefix length",
+    )
+    largest_free_block: str | None = None
+
+
+class PrefixTreeNodeResponse(BaseModel):
+    """Schema for one node of a streamed prefix tree."""
+
+    id: int
+    prefix: str
+    status: str
+    description: str | None = None
+    parent_id: int | None = None
+    depth: int
+    child_count: int
+
+
+class PrefixLookupRequest(BaseModel):
+    """Schema for a batch longest-prefix-match lookup."""
+
+    addresses: list[str] = Field(..., max_length=100000)
+
+    @field_validator("addresses")
+    @classmethod
+    def validate_addresses(cls, v: list[str]) -> list[str]:
+        """Validate that every entry is an IP address."""
+        for address in v:
+            try:
+                ipaddress.ip_interface(address)
+            except ValueError as e:
+                raise ValueError(f"Invalid IP address: {e}") from e
+        return v
+
+
+class PrefixLookupResult(BaseModel):
+    """Schema for the most specific prefix owning an address."""
+
+    address: str
+    prefix_id: int | None = None
+    prefix: str | None = None
+    vlan_id: int | None = None
+    vlan_vid: int | None = None
+    site_id: int | None = None
+    tenant_id: int | None = None
+
+
+class PrefixAuditFinding(BaseModel):
+    """Schema for one duplicate or overlapping prefix pair."""
+
+    kind: str = Field(..., description="'duplicate' or 'overlap'")
+    vrf_id: int | None = None
+    prefix_id: int
+    prefix: str
+    other_prefix_id: int
+    other_prefix: str
+    detail: str = ""
+
+
+class PrefixAuditResponse(BaseModel):
+    """Schema for the prefix inventory audit."""
+
+    total_prefixes: int
+    duplicate_count: int
+    overlap_count: int
+    findings: list[PrefixAuditFinding]
+
+
+class PrefixSummarizeRequest(BaseModel):
+    """Schema for summarizing posted prefixes or prefixes matching filters."""
+
+    prefixes: list[str] | None = Field(
+        default=None,
+        max_length=1000000,
+        description="Prefixes to summarize; if omitted, NetBox prefixes "
+        "matching the filters below are used",
+    )
+    site_id: int | None = None
+    tenant_id: int | None = None
+    status: PrefixStatus | None = None
+
+
+class PrefixSummaryResponse(BaseModel):
+    """Schema for a route summary."""
+
+    input_count: int
+    summary_count: int
+    prefixes: list[str]
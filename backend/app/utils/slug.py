@@ -1,7 +1,60 @@
-"""Slug generation utilities with Portuguese accent handling."""
+"""Slug generation utilities with Portuguese accent handling.
+
+Most names are ASCII or Latin with accents (São Paulo, Produção), so a
+translation table precomputed from the general algorithm (NFKD, drop
+non-ASCII, lowercase, non-alphanumerics to hyphens) slugs them with one
+``str.translate``. Anything the table does not cover falls back to NFKD,
+which yields the same slug the general algorithm would.
+"""
 
 import re
 import unicodedata
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from functools import _CacheInfo
+
+SLUG_CACHE_SIZE = 4096
+_SLUG_PATTERN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _slug_chars(char: str) -> str:
+    """Slug characters of a single character under the general algorithm."""
+    ascii_text = (
+        unicodedata.normalize("NFKD", char).encode("ascii", "ignore").decode("ascii")
+    )
+    return _NON_ALNUM.sub("-", ascii_text.lower())
+
+
+# ASCII, Latin-1 and Latin Extended-A/B, which cover Portuguese names
+_TRANSLATION = str.maketrans(
+    {chr(code): _slug_chars(chr(code)) for code in range(0x250)}
+)
+
+
+def _build_slug(name: str) -> str:
+    """Convert a name to a slug, without caching."""
+    text = name.translate(_TRANSLATION)
+    if not text.isascii():
+        # Characters outside the table: decompose them, then translate again
+        text = (
+            unicodedata.normalize("NFKD", text)
+            .encode("ascii", "ignore")
+            .decode("ascii")
+            .translate(_TRANSLATION)
+        )
+    return "-".join(filter(None, text.split("-")))
+
+
+_cached_slug = lru_cache(maxsize=SLUG_CACHE_SIZE)(_build_slug)
+
+
+def slug_cache_info() -> "_CacheInfo":
+    """Hits, misses and size of the ``generate_slug`` cache."""
+    return _cached_slug.cache_info()
 
 
 def generate_slug(name: str, slug: str | None = None) -> str:
@@ -25,24 +78,22 @@ def generate_slug(name: str, slug: str | None = None) -> str:
     """
     if slug:
         return slug
+    return _cached_slug(name)
 
-    # Normalize unicode and remove accents
-    normalized = unicodedata.normalize("NFKD", name)
-    ascii_text = normalized.encode("ascii", "ignore").decode("ascii")
-
-    # Convert to lowercase
-    lowercase = ascii_text.lower()
 
-    # Replace spaces and special chars with hyphens
-    slug_text = re.sub(r"[^a-z0-9]+", "-", lowercase)
+def generate_slugs(names: Iterable[str]) -> list[str]:
+    """
+    Generate slugs for many names, e.g. during bulk imports.
 
-    # Remove leading/trailing hyphens
-    slug_text = slug_text.strip("-")
+    Bypasses the LRU cache, which mostly-unique bulk input would only churn.
 
-    # Remove consecutive hyphens
-    slug_text = re.sub(r"-+", "-", slug_text)
+    Args:
+        names: Names to convert
 
-    return slug_text
+    Returns:
+        Slugs in the same order as the names
+    """
+    return list(map(_build_slug, names))
 
 
 def validate_slug(slug: str) -> bool:
@@ -55,5 +106,4 @@ def validate_slug(slug: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    pattern = r"^[a-z0-9]+(?:-[a-z0-9]+)*$"
-    return bool(re.match(pattern, slug))
+    return _SLUG_PATTERN.fullmatch(slug) is not None
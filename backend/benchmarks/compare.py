@@ -0,0 +1,102 @@
+"""Compare pytest-benchmark results against a stored JSON baseline.
+
+Matches benchmarks by full name, compares one statistic (median by
+default, the least sensitive to scheduler noise) and exits with status 1
+when any benchmark got slower than the threshold allows, so it can gate
+CI. Baselines are only comparable with runs on the same kind of machine.
+
+Usage:
+    python -m benchmarks.compare benchmarks/baselines/baseline.json \\
+        benchmarks/results/latest.json [--threshold 15] [--stat median]
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+STATS = ("min", "median", "mean")
+
+
+@dataclass
+class Comparison:
+    """One benchmark in the baseline, the current run, or both."""
+
+    name: str
+    baseline: float | None
+    current: float | None
+
+    @property
+    def change(self) -> float | None:
+        """Relative change of the statistic, e.g. 0.25 for 25% slower."""
+        if self.baseline is None or self.current is None or not self.baseline:
+            return None
+        return self.current / self.baseline - 1
+
+
+def load_results(path: str | Path, stat: str = "median") -> dict[str, float]:
+    """Get one statistic, in seconds, of every benchmark in a result file."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {bench["fullname"]: bench["stats"][stat] for bench in data["benchmarks"]}
+
+
+def compare(baseline: dict[str, float], current: dict[str, float]) -> list[Comparison]:
+    """Pair up the benchmarks of two runs, in baseline order."""
+    names = list(baseline) + [name for name in current if name not in baseline]
+    return [
+        Comparison(name, baseline.get(name), current.get(name)) for name in names
+    ]
+
+
+def _format_time(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", help="pytest-benchmark JSON of the baseline")
+    parser.add_argument("current", help="pytest-benchmark JSON of the new run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=15.0,
+        help="Max slowdown in percent before a benchmark counts as regressed",
+    )
+    parser.add_argument("--stat", choices=STATS, default="median")
+    args = parser.parse_args(argv)
+
+    comparisons = compare(
+        load_results(args.baseline, args.stat), load_results(args.current, args.stat)
+    )
+    width = max(len(c.name) for c in comparisons) if comparisons else 4
+    print(f"{'benchmark':<{width}}  {'baseline':>10}  {'current':>10}  change")
+
+    regressions = 0
+    for c in comparisons:
+        if c.change is None:
+            verdict = "missing" if c.current is None else "new"
+        else:
+            verdict = f"{c.change:+7.1%}"
+            if c.change * 100 > args.threshold:
+                verdict += "  REGRESSION"
+                regressions += 1
+        print(
+            f"{c.name:<{width}}  {_format_time(c.baseline):>10}  "
+            f"{_format_time(c.current):>10}  {verdict}"
+        )
+
+    print(
+        f"\n{regressions} regression(s) beyond {args.threshold:g}% "
+        f"({args.stat}, {len(comparisons)} benchmarks)"
+    )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
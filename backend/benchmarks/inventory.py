@@ -0,0 +1,393 @@
+"""Seeded synthetic NetBox inventory for scale testing.
+
+Builds sites the way /allocation/site does: a tenant and facility named by
+NamingConvention, a VLAN group with the profile's VLANs, and the container,
+VLAN subnets (with overflow blocks) and per-rack host subnets planned by
+AllocationRules, plus racks and spine/leaf/server devices named by
+convention and tagged at random. The same seed always gives the same
+inventory. Default rules give 12 + 11 x racks prefixes per site, so e.g.
+``--sites 300 --racks 32 --devices 4`` is ~109k prefixes and ~39k devices.
+
+Output is either a fake NetBox snapshot (``python -m fake_netbox
+--snapshot``) or a bulk file whose objects reference each other by natural
+key (slug, or e.g. VLAN ID within a group), loadable into a real NetBox
+with the ``load`` command.
+
+Usage:
+    python -m benchmarks.inventory generate --sites 300 --racks 32 \\
+        --devices 4 [--seed 42] [--format snapshot|bulk] --output inv.json
+    python -m benchmarks.inventory load inv.json --url http://netbox:8000 \\
+        --token TOKEN [--chunk 500]
+"""
+
+import argparse
+import ipaddress
+import json
+import random
+from collections import Counter
+from itertools import islice
+from pathlib import Path
+
+import httpx
+
+from app.domain.allocation.naming import NamingConvention, RegionCode
+from app.domain.allocation.rules import AllocationRules
+from app.utils.slug import generate_slug
+from fake_netbox import FakeNetBox
+
+# Fixed timestamp, so snapshots of the same seed are identical
+CREATED = "2025-01-01T00:00:00+00:00"
+
+# Site containers are /16s carved from these, in order
+SUPERNETS = ["10.0.0.0/8", "100.64.0.0/10", "172.16.0.0/12"]
+
+CITIES = {
+    RegionCode.NORDESTE: ["REC", "SSA", "FOR", "NAT"],
+    RegionCode.SUDESTE: ["SP", "RJ", "BH", "VIX"],
+    RegionCode.SUL: ["POA", "CWB", "FLN"],
+    RegionCode.NORTE: ["MAO", "BEL"],
+    RegionCode.CENTRO_OESTE: ["BSB", "GYN"],
+}
+RACKS_PER_ROW = 20
+SPINES_PER_SITE = 2
+LEAVES_PER_RACK = 2
+
+ENVIRONMENT_TAGS = {"production": 0.8, "staging": 0.2}
+WORKLOAD_TAGS = ["compute", "ceph", "swift", "pci", "edge", "legacy"]
+MANUFACTURERS = {
+    "Arista": ["DCS-7280CR3-32P4", "DCS-7050SX3-48YC8"],
+    "Dell": ["PowerEdge R650", "PowerEdge R750"],
+    "HPE": ["ProLiant DL360 Gen10"],
+}
+DEVICE_MODELS = {
+    "spine": ["DCS-7280CR3-32P4"],
+    "leaf": ["DCS-7050SX3-48YC8"],
+    "server": ["PowerEdge R650", "PowerEdge R750", "ProLiant DL360 Gen10"],
+}
+
+# Creation order of the bulk format, parents before children
+BULK_ORDER = [
+    "extras/tags",
+    "tenancy/tenants",
+    "ipam/roles",
+    "dcim/manufacturers",
+    "dcim/device-types",
+    "dcim/device-roles",
+    "dcim/sites",
+    "ipam/vlan-groups",
+    "ipam/vlans",
+    "ipam/prefixes",
+    "dcim/racks",
+    "dcim/devices",
+]
+# Fields identifying an object in bulk references (foreign keys by slug)
+NATURAL_KEYS = {
+    "ipam/vlans": ("vid", "group"),
+    "dcim/racks": ("name", "site"),
+}
+
+
+def base_networks(count: int) -> list[str]:
+    """First ``count`` "a.b" base networks of /16 containers in SUPERNETS."""
+    size = AllocationRules.CONTAINER_PREFIX_SIZE
+    blocks = (
+        block
+        for supernet in SUPERNETS
+        for block in ipaddress.ip_network(supernet).subnets(new_prefix=size)
+    )
+    bases = [
+        ".".join(str(block.network_address).split(".")[:2])
+        for block in islice(blocks, count)
+    ]
+    if len(bases) < count:
+        raise ValueError(f"Only {len(bases)} site containers fit in {SUPERNETS}")
+    return bases
+
+
+class InventoryBuilder:
+    """Fills the tables of a fake NetBox with a synthetic inventory."""
+
+    def __init__(self, seed: int = 42) -> None:
+        self.fake = FakeNetBox()
+        self.tables = self.fake.tables
+        self.random = random.Random(seed)
+        self.ids: dict[tuple[str, str], int] = {}
+
+    def add(self, table: str, key: str | None = None, **fields) -> int:
+        """Insert a row, remembering its ID under ``key`` if given."""
+        row = self.tables[table].insert(
+            {"created": CREATED, "last_updated": CREATED, **fields}
+        )
+        if key is not None:
+            self.ids[table, key] = row["id"]
+        return row["id"]
+
+    def add_named(self, table: str, name: str, **fields) -> int:
+        """Insert a row with a name and its slug, remembered by slug."""
+        slug = generate_slug(name)
+        return self.add(table, slug, name=name, slug=slug, **fields)
+
+    def reference_data(self) -> None:
+        """Tags, roles, manufacturers and device types shared by all sites."""
+        for name in [*ENVIRONMENT_TAGS, *WORKLOAD_TAGS]:
+            self.add_named("extras/tags", name)
+        categories = dict.fromkeys(v.category for v in AllocationRules.VLAN_DEFINITIONS)
+        for category in categories:
+            self.add_named("ipam/roles", category.value.title())
+        for role in DEVICE_MODELS:
+            self.add_named("dcim/device-roles", role.title())
+        for manufacturer, models in MANUFACTURERS.items():
+            manufacturer_id = self.add_named("dcim/manufacturers", manufacturer)
+            for model in models:
+                slug = generate_slug(model)
+                self.add(
+                    "dcim/device-types",
+                    slug,
+                    manufacturer=manufacturer_id,
+                    model=model,
+                    slug=slug,
+                )
+
+    def site(
+        self,
+        base_network: str,
+        region: RegionCode,
+        number: int,
+        city: str,
+        dc_number: int,
+        racks: int,
+        devices: int,
+    ) -> None:
+        """One site with its tenant, VLANs, prefixes, racks and devices."""
+        rng = self.random
+        environment = rng.choices(
+            list(ENVIRONMENT_TAGS), weights=list(ENVIRONMENT_TAGS.values())
+        )[0]
+        env_tag = [self.ids["extras/tags", environment]]
+
+        tenant_name = NamingConvention.generate_tenant_name("br", region.value, number)
+        tenant = self.add_named(
+            "tenancy/tenants", tenant_name, description=f"Tenant for {city}"
+        )
+        facility = NamingConvention.generate_facility_code(city, dc_number)
+        site_name = NamingConvention.generate_site_name(region.value, city=facility)
+        site = self.add_named(
+            "dcim/sites",
+            site_name,
+            status=rng.choices(["active", "planned"], weights=[0.9, 0.1])[0],
+            facility=facility,
+            tenant=tenant,
+            description=f"Data center {site_name} - {facility}",
+            tags=env_tag,
+        )
+        owner = {"site": site, "tenant": tenant}
+
+        group = self.add_named("ipam/vlan-groups", f"VLANs {facility}")
+        vlans = {}
+        for vlan in AllocationRules.VLAN_DEFINITIONS:
+            vlans[vlan.vid] = self.add(
+                "ipam/vlans",
+                vid=vlan.vid,
+                name=NamingConvention.generate_vlan_name(vlan.vid, vlan.name),
+                description=vlan.description,
+                group=group,
+                role=self.ids["ipam/roles", vlan.category.value],
+                **owner,
+            )
+        roles = {
+            v.vid: self.ids["ipam/roles", v.category.value]
+            for v in AllocationRules.VLAN_DEFINITIONS
+        }
+
+        vlan_subnets = list(AllocationRules.generate_vlan_subnets(base_network))
+        plan = AllocationRules.plan_host_subnets(base_network, racks)
+        for subnet in [*vlan_subnets, *plan.overflow_subnets]:
+            self.add(
+                "ipam/prefixes",
+                prefix=subnet.prefix,
+                status="container" if subnet.is_container else "active",
+                description=subnet.description,
+                vlan=vlans.get(subnet.vlan_vid),
+                role=roles.get(subnet.vlan_vid),
+                tags=env_tag,
+                **owner,
+            )
+        for host_range in plan.host_ranges:
+            for host in AllocationRules.expand_host_subnet_range(host_range):
+                self.add(
+                    "ipam/prefixes",
+                    prefix=host.prefix,
+                    description=host.description,
+                    role=roles[host_range.vlan_vid],
+                    tags=env_tag,
+                    **owner,
+                )
+
+        site_code = f"{city}{dc_number}"
+        rack_ids = [
+            self.add(
+                "dcim/racks",
+                name=NamingConvention.generate_rack_name(
+                    site_code,
+                    chr(ord("A") + index // RACKS_PER_ROW),
+                    index % RACKS_PER_ROW + 1,
+                ),
+                **owner,
+            )
+            for index in range(racks)
+        ]
+        placements = [("spine", rack_ids[0] if rack_ids else None)] * SPINES_PER_SITE
+        for rack in rack_ids:
+            for slot in range(devices):
+                placements.append(
+                    ("leaf" if slot < LEAVES_PER_RACK else "server", rack)
+                )
+
+        numbers: Counter[str] = Counter()
+        for role, rack in placements:
+            numbers[role] += 1
+            workload = rng.sample(WORKLOAD_TAGS, rng.randint(0, 2))
+            self.add(
+                "dcim/devices",
+                name=NamingConvention.generate_device_name(
+                    role, site_code, numbers[role]
+                ),
+                device_type=self.ids[
+                    "dcim/device-types", generate_slug(rng.choice(DEVICE_MODELS[role]))
+                ],
+                role=self.ids["dcim/device-roles", role],
+                rack=rack,
+                serial=f"{rng.getrandbits(40):010X}",
+                tags=env_tag + [self.ids["extras/tags", tag] for tag in workload],
+                **owner,
+            )
+
+
+def generate(sites: int, racks: int, devices: int, seed: int = 42) -> FakeNetBox:
+    """
+    Build a synthetic inventory.
+
+    Args:
+        sites: Number of sites, one /16 container each
+        racks: Racks per site
+        devices: Devices per rack, the first two of them leaves
+        seed: Seed of every random choice
+
+    Returns:
+        Fake NetBox holding the inventory
+    """
+    if racks > 26 * RACKS_PER_ROW:
+        raise ValueError(f"At most {26 * RACKS_PER_ROW} racks per site")
+    builder = InventoryBuilder(seed)
+    builder.reference_data()
+
+    regions = list(CITIES)
+    tenants: Counter[RegionCode] = Counter()
+    facilities: Counter[str] = Counter()
+    for base in base_networks(sites):
+        region = builder.random.choice(regions)
+        city = builder.random.choice(CITIES[region])
+        tenants[region] += 1
+        facilities[city] += 1
+        if facilities[city] > 99:
+            raise ValueError(f"More than 99 data centers in {city}")
+        builder.site(
+            base, region, tenants[region], city, facilities[city], racks, devices
+        )
+    return builder.fake
+
+
+def to_bulk(fake: FakeNetBox) -> list[dict]:
+    """
+    Objects of every table, in creation order, with natural-key references.
+
+    Prefixes keep the NetBox 4.1 ``site`` reference; NetBox 4.2 needs
+    ``scope_type``/``scope_id``, which cannot be given by natural key.
+    """
+    tables = fake.tables
+
+    def reference(table: str, row_id: int) -> dict:
+        row = tables[table].rows[row_id]
+        key = {}
+        for field in NATURAL_KEYS.get(table, ("slug",)):
+            target = tables[table].spec.foreign.get(field)
+            if target:
+                key[f"{field}__slug"] = tables[target].rows[row[field]]["slug"]
+            else:
+                key[field] = row[field]
+        return key
+
+    bulk = []
+    for name in BULK_ORDER:
+        table = tables[name]
+        objects = []
+        for row in table.rows.values():
+            data = {}
+            for field, value in row.items():
+                if field in ("id", "created", "last_updated") or value is None:
+                    continue
+                if field in table.spec.foreign:
+                    value = reference(table.spec.foreign[field], value)
+                elif field == "tags":
+                    value = [reference("extras/tags", tag) for tag in value]
+                data[field] = value
+            objects.append(data)
+        bulk.append({"endpoint": name, "objects": objects})
+    return bulk
+
+
+def load_bulk(bulk: list[dict], url: str, token: str, chunk: int = 500) -> None:
+    """Create the objects of a bulk file in NetBox, in chunks."""
+    with httpx.Client(
+        base_url=f"{url.rstrip('/')}/api/",
+        headers={"Authorization": f"Token {token}"},
+        timeout=300,
+    ) as client:
+        for entry in bulk:
+            objects = entry["objects"]
+            for start in range(0, len(objects), chunk):
+                response = client.post(
+                    f"{entry['endpoint']}/", json=objects[start : start + chunk]
+                )
+                if response.is_error:
+                    raise RuntimeError(
+                        f"{entry['endpoint']} [{start}:{start + chunk}]: "
+                        f"{response.status_code} {response.text[:500]}"
+                    )
+            print(f"{entry['endpoint']:<20} {len(objects):>8}", flush=True)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="Generate an inventory file")
+    gen.add_argument("--sites", type=int, default=10)
+    gen.add_argument("--racks", type=int, default=8, help="Racks per site")
+    gen.add_argument("--devices", type=int, default=8, help="Devices per rack")
+    gen.add_argument("--seed", type=int, default=42)
+    gen.add_argument("--format", choices=["snapshot", "bulk"], default="snapshot")
+    gen.add_argument("--output", type=Path, required=True)
+
+    load = commands.add_parser("load", help="Load a bulk file into NetBox")
+    load.add_argument("path", type=Path)
+    load.add_argument("--url", required=True)
+    load.add_argument("--token", required=True)
+    load.add_argument("--chunk", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    if args.command == "load":
+        bulk = json.loads(args.path.read_text(encoding="utf-8"))
+        load_bulk(bulk, args.url, args.token, args.chunk)
+        return
+
+    fake = generate(args.sites, args.racks, args.devices, args.seed)
+    data = fake.snapshot() if args.format == "snapshot" else to_bulk(fake)
+    args.output.write_text(json.dumps(data), encoding="utf-8")
+    for name, table in fake.tables.items():
+        print(f"{name:<20} {len(table.rows):>8}")
+    print(f"Saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""Load test of the API against the fake NetBox, with run-to-run reports.
+
+``run`` starts the fake NetBox and the app under uvicorn, seeds the fake
+with prefixes, then for every uvicorn worker count and concurrency level
+drives each scenario closed-loop (every client sends its next request as
+soon as the previous one returns) for a fixed time with async httpx, and
+saves requests/sec and latency percentiles as JSON. ``report`` compares
+saved runs as a Markdown table, so client or caching changes show up as
+measured deltas. Runs are only comparable on the same kind of machine.
+
+Usage:
+    python -m benchmarks.loadtest run --label main \\
+        [--workers 1,4] [--concurrency 1,8,32] [--duration 10] \\
+        [--netbox-latency-ms 5]
+    python -m benchmarks.loadtest report benchmarks/results/load-main.json \\
+        benchmarks/results/load-branch.json [--output report.md]
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+
+RESULTS_DIR = Path("benchmarks/results")
+SEED_PREFIXES = 500
+ALLOCATION_PARENT = "10.0.0.0/8"
+CREATE_RANGE = ipaddress.ip_network("100.64.0.0/10")
+CREATE_LENGTH = 28
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One request shape; ``build`` maps a request number to (method, path, body)."""
+
+    name: str
+    build: Callable[[int], tuple[str, str, dict | None]]
+
+
+@dataclass
+class Result:
+    """Throughput and latency of one scenario at one workers/concurrency level."""
+
+    scenario: str
+    workers: int
+    concurrency: int
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p99_ms: float
+
+    @property
+    def key(self) -> tuple[str, int, int]:
+        return self.scenario, self.workers, self.concurrency
+
+
+def _scenarios(seeded_ids: list[int], parent_id: int) -> list[Scenario]:
+    def get(n: int) -> tuple[str, str, None]:
+        return "GET", f"/api/v1/prefixes/{seeded_ids[n % len(seeded_ids)]}", None
+
+    def create(n: int) -> tuple[str, str, dict]:
+        address = CREATE_RANGE.network_address + (n << (32 - CREATE_LENGTH))
+        return "POST", "/api/v1/prefixes/", {"prefix": f"{address}/{CREATE_LENGTH}"}
+
+    return [
+        Scenario("list", lambda n: ("GET", "/api/v1/prefixes/?limit=50", None)),
+        Scenario("get", get),
+        Scenario("create", create),
+        Scenario(
+            "allocate",
+            lambda n: (
+                "POST",
+                f"/api/v1/prefixes/{parent_id}/available-prefixes",
+                {"prefix_length": 29},
+            ),
+        ),
+        Scenario(
+            "plan",
+            lambda n: (
+                "POST",
+                "/api/v1/allocation/plan",
+                {"base_network": "10.0", "rack_count": 8},
+            ),
+        ),
+    ]
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values (0 when empty)."""
+    if not ordered:
+        return 0.0
+    rank = max(1, round(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    concurrency: int,
+    duration: float,
+    counter: itertools.count,
+) -> tuple[list[float], int]:
+    """Run a scenario closed-loop; return latencies (s) of successes and errors."""
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def user() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            method, path, body = scenario.build(next(counter))
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            if failed:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(url: str, process: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args} exited with {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def _seed(netbox_url: str) -> tuple[list[int], int]:
+    """Create the prefixes read by list/get and the allocation parent."""
+    with httpx.Client(base_url=f"{netbox_url}/api/", timeout=30) as client:
+        client.put(f"{netbox_url}/_fake/snapshot", json={}).raise_for_status()
+        created = client.post(
+            "ipam/prefixes/",
+            json=[
+                {"prefix": f"172.16.{i // 256}.{i % 256}/32"}
+                for i in range(SEED_PREFIXES)
+            ],
+        )
+        created.raise_for_status()
+        parent = client.post(
+            "ipam/prefixes/", json={"prefix": ALLOCATION_PARENT, "status": "container"}
+        )
+        parent.raise_for_status()
+    return [p["id"] for p in created.json()], parent.json()["id"]
+
+
+def run(args: argparse.Namespace) -> dict:
+    """Run the whole sweep and return the report data."""
+    netbox_port = _free_port()
+    netbox_url = f"http://127.0.0.1:{netbox_port}"
+    netbox = subprocess.Popen(
+        [
+            sys.executable, "-m", "fake_netbox", "--port", str(netbox_port),
+            "--latency-ms", str(args.netbox_latency_ms), "--seed", "0",
+        ]
+    )
+    results: list[Result] = []
+    try:
+        _wait_until_up(f"{netbox_url}/api/status/", netbox)
+        for workers in args.workers:
+            seeded_ids, parent_id = _seed(netbox_url)
+            scenarios = [
+                s for s in _scenarios(seeded_ids, parent_id) if s.name in args.scenarios
+            ]
+            results += _run_workers(args, workers, netbox_url, scenarios)
+    finally:
+        netbox.terminate()
+        netbox.wait()
+
+    return {
+        "label": args.label,
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "cpus": os.cpu_count()},
+        "settings": {
+            "duration": args.duration,
+            "netbox_latency_ms": args.netbox_latency_ms,
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def _run_workers(
+    args: argparse.Namespace, workers: int, netbox_url: str, scenarios: list[Scenario]
+) -> list[Result]:
+    port = _free_port()
+    app_url = f"http://127.0.0.1:{port}"
+    scratch = tempfile.TemporaryDirectory()
+    env = {
+        **os.environ,
+        "NETBOX_URL": netbox_url,
+        "NETBOX_TOKEN": "fake",
+        "LEASE_DB_PATH": str(Path(scratch.name) / "leases.sqlite3"),
+    }
+    app = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+        env=env,
+    )
+    results = []
+    try:
+        _wait_until_up(f"{app_url}/ready", app)
+        limits = httpx.Limits(max_connections=max(args.concurrency))
+        counter = itertools.count()
+
+        async def sweep() -> None:
+            async with httpx.AsyncClient(
+                base_url=app_url, limits=limits, timeout=30
+            ) as client:
+                for scenario in scenarios:
+                    await drive(client, scenario, 1, args.warmup, counter)
+                    for concurrency in args.concurrency:
+                        latencies, errors = await drive(
+                            client, scenario, concurrency, args.duration, counter
+                        )
+                        latencies.sort()
+                        result = Result(
+                            scenario=scenario.name,
+                            workers=workers,
+                            concurrency=concurrency,
+                            requests=len(latencies),
+                            errors=errors,
+                            rps=len(latencies) / args.duration,
+                            p50_ms=percentile(latencies, 50) * 1000,
+                            p99_ms=percentile(latencies, 99) * 1000,
+                        )
+                        results.append(result)
+                        print(
+                            f"{result.scenario:<9} workers={workers:<2} "
+                            f"c={concurrency:<4} {result.rps:9.1f} req/s  "
+                            f"p50 {result.p50_ms:7.1f} ms  p99 {result.p99_ms:7.1f} ms"
+                            f"  errors {errors}",
+                            flush=True,
+                        )
+
+        asyncio.run(sweep())
+    finally:
+        app.terminate()
+        app.wait()
+        scratch.cleanup()
+    return results
+
+
+def _delta(value: float, base: float) -> str:
+    return f"{value / base - 1:+.0%}" if base else "-"
+
+
+def report(runs: list[dict]) -> str:
+    """Markdown table of every run, with deltas against the first one."""
+    labels = [run["label"] for run in runs]
+    by_run = [
+        {Result(**row).key: Result(**row) for row in run["results"]} for run in runs
+    ]
+    keys = list(dict.fromkeys(key for results in by_run for key in results))
+
+    header = ["scenario", "workers", "clients"]
+    for index, label in enumerate(labels):
+        header += [f"{label} req/s", f"{label} p50", f"{label} p99"]
+        if index:
+            header += ["Δ req/s", "Δ p99"]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+
+    for key in keys:
+        base = by_run[0].get(key)
+        cells = [key[0], str(key[1]), str(key[2])]
+        for index, results in enumerate(by_run):
+            result = results.get(key)
+            if result is None:
+                cells += ["-", "-", "-"] + (["-", "-"] if index else [])
+                continue
+            cells += [
+                f"{result.rps:.1f}",
+                f"{result.p50_ms:.1f} ms",
+                f"{result.p99_ms:.1f} ms",
+            ]
+            if index:
+                cells += (
+                    [_delta(result.rps, base.rps), _delta(result.p99_ms, base.p99_ms)]
+                    if base
+                    else ["new", "new"]
+                )
+        lines.append("| " + " | ".join(cells) + " |")
+
+    errors = {
+        run["label"]: sum(row["errors"] for row in run["results"]) for run in runs
+    }
+    footer = ", ".join(f"{label}: {count}" for label, count in errors.items())
+    return "\n".join([*lines, "", f"Errors: {footer}"]) + "\n"
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(item) for item in value.split(",")]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the load test")
+    run_parser.add_argument("--label", default="latest", help="Name of this run")
+    run_parser.add_argument("--workers", type=_int_list, default=[1])
+    run_parser.add_argument("--concurrency", type=_int_list, default=[1, 8, 32])
+    run_parser.add_argument("--duration", type=float, default=10.0)
+    run_parser.add_argument("--warmup", type=float, default=1.0)
+    run_parser.add_argument("--netbox-latency-ms", type=float, default=5.0)
+    run_parser.add_argument(
+        "--scenarios",
+        type=lambda value: value.split(","),
+        default=["list", "get", "create", "allocate", "plan"],
+    )
+    run_parser.add_argument("--output", type=Path, help="Result JSON path")
+
+    report_parser = commands.add_parser("report", help="Compare saved runs")
+    report_parser.add_argument("runs", type=Path, nargs="+", help="Result JSONs")
+    report_parser.add_argument("--output", type=Path, help="Markdown file")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output = args.output or RESULTS_DIR / f"load-{args.label}.json"
+        output.write_text(json.dumps(run(args), indent=2), encoding="utf-8")
+        print(f"Saved {output}")
+        return
+
+    text = report([json.loads(path.read_text(encoding="utf-8")) for path in args.runs])
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
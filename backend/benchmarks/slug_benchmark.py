@@ -0,0 +1,93 @@
+"""Slug engine benchmark: previous implementation vs. app.utils.slug.
+
+Builds a seeded corpus of site, tenant, rack and device style names with
+Portuguese accents and some unusual Unicode, checks that both
+implementations produce identical slugs and times them.
+
+Usage:
+    python -m benchmarks.slug_benchmark [--names 100000] [--seed 42]
+"""
+
+import argparse
+import random
+import re
+import time
+import unicodedata
+
+from app.utils.slug import _cached_slug, generate_slug, generate_slugs
+
+WORDS = [
+    "São", "Paulo", "Produção", "Norte", "Área", "Técnica", "Nordeste",
+    "Ribeirão", "Preto", "Goiânia", "Maceió", "Belém", "Florianópolis",
+    "Niterói", "Itajaí", "Vitória", "Cuiabá", "Macapá", "Jundiaí", "Campinas",
+    "Rack", "Leaf", "Spine", "Armazenamento", "Operações", "Gestão", "Serviço",
+    "DC", "Ñandú", "Straße", "Ｆｕｌｌ", "naïve", "Øresund", "Ærø", "café",
+]
+SEPARATORS = [" ", " ", " ", "-", "_", " / ", ".", " & "]
+
+
+def legacy_generate_slug(name: str) -> str:
+    """The implementation generate_slug replaced, kept for comparison."""
+    normalized = unicodedata.normalize("NFKD", name)
+    ascii_text = normalized.encode("ascii", "ignore").decode("ascii")
+    lowercase = ascii_text.lower()
+    slug_text = re.sub(r"[^a-z0-9]+", "-", lowercase)
+    slug_text = slug_text.strip("-")
+    slug_text = re.sub(r"-+", "-", slug_text)
+    return slug_text
+
+
+def build_corpus(count: int, seed: int) -> list[str]:
+    """Build a reproducible corpus of mostly unique names."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(1, 4))
+        name = rng.choice(SEPARATORS).join(words)
+        if rng.random() < 0.7:
+            name += f" {rng.randint(1, 999):02d}"
+        corpus.append(name)
+    return corpus
+
+
+def _timed(label: str, func, corpus: list[str]) -> list[str]:
+    start = time.perf_counter()
+    result = func(corpus)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f} s  {elapsed / len(corpus) * 1e6:6.2f} us/name")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.names, args.seed)
+    print(f"{len(corpus)} names, {len(set(corpus))} unique\n")
+
+    expected = _timed(
+        "legacy generate_slug", lambda c: [legacy_generate_slug(n) for n in c], corpus
+    )
+    batch = _timed("generate_slugs (batch)", generate_slugs, corpus)
+    _cached_slug.cache_clear()
+    single = _timed(
+        "generate_slug (cold cache)", lambda c: [generate_slug(n) for n in c], corpus
+    )
+    hot = corpus[:1000] * (len(corpus) // 1000)
+    _timed("generate_slug (1k hot names)", lambda c: [generate_slug(n) for n in c], hot)
+
+    mismatches = [
+        (name, old, new)
+        for name, old, new in zip(corpus, expected, batch, strict=True)
+        if old != new
+    ]
+    assert single == batch
+    print(f"\nmismatches: {len(mismatches)}")
+    for name, old, new in mismatches[:10]:
+        print(f"  {name!r}: {old!r} != {new!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Measure API cold start and check it against a time budget.
+
+Starts fresh interpreters that import ``app.main`` and run its lifespan
+startup, then prints the median time to ready and the slowest imports of
+the median run (from the app's own startup report). The NetBox warmup is
+disabled, as it depends on NetBox rather than on this code. Exits with
+status 1 when the median is over the budget, so it can gate CI. Like the
+other benchmarks, budgets only hold on the same kind of machine.
+
+Usage:
+    python -m benchmarks.startup [--runs 5] [--budget-ms 1500] [--top 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# Run in the child interpreter: time import + lifespan startup, print JSON
+_PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+from app.main import app, startup
+
+async def ready():
+    async with app.router.lifespan_context(app):
+        pass
+
+asyncio.run(ready())
+report = startup.as_dict(top={top})
+report["wall_seconds"] = time.perf_counter() - started
+print(json.dumps(report))
+"""
+
+
+def measure(top: int = 10) -> dict:
+    """Start the app once in a fresh interpreter and get its startup report."""
+    # The app's own startup, without the NetBox warmup
+    env = {**os.environ, "WARMUP_ENABLED": "false"}
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(top=top)],
+        cwd=BACKEND,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms", type=float, default=1500.0, help="max median time to ready"
+    )
+    parser.add_argument("--top", type=int, default=10, help="slowest imports shown")
+    args = parser.parse_args(argv)
+
+    reports = sorted(
+        (measure(args.top) for _ in range(args.runs)),
+        key=lambda report: report["wall_seconds"],
+    )
+    median = reports[len(reports) // 2]
+    median_ms = statistics.median(r["wall_seconds"] for r in reports) * 1000
+
+    print(f"Startup over {args.runs} runs: median {median_ms:.0f} ms", end=" ")
+    print(f"(min {reports[0]['wall_seconds'] * 1000:.0f} ms,", end=" ")
+    print(f"max {reports[-1]['wall_seconds'] * 1000:.0f} ms)")
+    print(f"Imports: {median['imports']['seconds'] * 1000:.0f} ms", end=" ")
+    print(f"in {median['imports']['modules']} modules")
+    for name, seconds in median["imports"]["by_package"].items():
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+    for phase in median["phases"]:
+        print(f"Phase {phase['name']}: {phase['duration_seconds'] * 1000:.1f} ms")
+
+    if median_ms > args.budget_ms:
+        print(f"\nOver the {args.budget_ms:.0f} ms startup budget.")
+        return 1
+    print(f"\nWithin the {args.budget_ms:.0f} ms startup budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Micro-benchmarks of the allocation rules and naming conventions.
+
+Run with ``make bench`` (or ``pytest benchmarks``); see benchmarks.compare
+for checking results against a baseline.
+"""
+
+import ipaddress
+
+import pytest
+
+from app.domain.allocation.naming import NamingConvention
+from app.domain.allocation.rules import AllocationRules, VlanCategory
+
+CHILD_LENGTH = 26
+
+
+def _children(parent: str) -> list[str]:
+    network = ipaddress.ip_network(parent)
+    return [str(subnet) for subnet in network.subnets(new_prefix=CHILD_LENGTH)]
+
+
+@pytest.mark.parametrize("slots", [64, 256, 1024])
+@pytest.mark.parametrize("fill", ["sparse", "dense"])
+def test_get_next_available_prefix(benchmark, slots, fill):
+    """Sparse parents have every 16th child used, dense ones all but the last."""
+    parent = f"10.0.0.0/{CHILD_LENGTH - slots.bit_length() + 1}"
+    children = _children(parent)
+    used = children[::16] if fill == "sparse" else children[:-1]
+
+    result = benchmark(
+        AllocationRules.get_next_available_prefix, parent, CHILD_LENGTH, used
+    )
+
+    assert result == (children[1] if fill == "sparse" else children[-1])
+
+
+@pytest.mark.parametrize("rack_count", [1, 8, 32])
+def test_generate_host_subnets(benchmark, rack_count):
+    result = benchmark(
+        lambda: list(AllocationRules.generate_host_subnets("10.0.8.0/21", rack_count))
+    )
+
+    assert len(result) == rack_count
+
+
+@pytest.mark.parametrize("sites", [1, 16])
+def test_generate_vlan_subnets(benchmark, sites):
+    def plan_sites():
+        return [
+            list(AllocationRules.generate_vlan_subnets(f"10.{site}"))
+            for site in range(sites)
+        ]
+
+    result = benchmark(plan_sites)
+
+    assert len(result) == sites
+
+
+@pytest.mark.parametrize("used_count", [0, 50, 99])
+def test_get_available_vlan_vid(benchmark, used_count):
+    used = list(range(100, 100 + used_count))
+
+    result = benchmark(
+        AllocationRules.get_available_vlan_vid, VlanCategory.MANAGEMENT, used
+    )
+
+    assert result == 100 + used_count
+
+
+@pytest.mark.parametrize(
+    ("parser", "value"),
+    [
+        (NamingConvention.parse_tenant_name, "br-ne-12"),
+        (NamingConvention.parse_tenant_name, "not a tenant"),
+        (NamingConvention.parse_facility_code, "NE-DC-03"),
+        (NamingConvention.parse_facility_code, "not a facility"),
+    ],
+    ids=["tenant", "tenant-invalid", "facility", "facility-invalid"],
+)
+def test_naming_parse(benchmark, parser, value):
+    result = benchmark(parser, value)
+
+    assert (result is None) == value.startswith("not")
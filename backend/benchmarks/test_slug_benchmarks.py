@@ -0,0 +1,43 @@
+"""Micro-benchmarks of the slug utilities.
+
+Run with ``make bench`` (or ``pytest benchmarks``); see benchmarks.compare
+for checking results against a baseline.
+"""
+
+import pytest
+
+from app.utils.slug import _build_slug, generate_slug, generate_slugs, validate_slug
+from benchmarks.slug_benchmark import build_corpus
+
+NAMES = {
+    "ascii": "Rack 01 Leaf Spine",
+    "accents": "São Paulo - Produção Norte",
+    "unicode": "Ｆｕｌｌ Straße Ærø",
+}
+
+
+@pytest.mark.parametrize("kind", NAMES)
+def test_generate_slug_cached(benchmark, kind):
+    result = benchmark(generate_slug, NAMES[kind])
+
+    assert validate_slug(result)
+
+
+@pytest.mark.parametrize("kind", NAMES)
+def test_generate_slug_uncached(benchmark, kind):
+    result = benchmark(_build_slug, NAMES[kind])
+
+    assert result == generate_slug(NAMES[kind])
+
+
+@pytest.mark.parametrize("count", [100, 10000])
+def test_generate_slugs(benchmark, count):
+    corpus = build_corpus(count, seed=42)
+
+    result = benchmark(generate_slugs, corpus)
+
+    assert len(result) == count
+
+
+def test_validate_slug(benchmark):
+    assert benchmark(validate_slug, "sao-paulo-producao-norte-01")
@@ -0,0 +1,11 @@
+"""In-memory fake NetBox for offline load tests and integration tests.
+
+Serves prefixes, IP addresses, VLANs, VLAN groups, roles, sites, racks,
+devices, device roles and types, manufacturers, tenants and tags over
+NetBox's REST API, with real pagination, bulk endpoints and injectable
+latency, jitter and errors.
+"""
+
+from fake_netbox.server import FakeNetBox, Faults, create_app
+
+__all__ = ["FakeNetBox", "Faults", "create_app"]
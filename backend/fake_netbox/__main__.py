@@ -0,0 +1,39 @@
+"""Run the fake NetBox with uvicorn.
+
+Usage:
+    python -m fake_netbox [--port 8002] [--latency-ms 20] [--jitter-ms 5] \\
+        [--error-rate 0.01] [--seed 42] [--snapshot inventory.json]
+
+Point the backend at it with NETBOX_URL=http://localhost:8002 (any token).
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import uvicorn
+
+from fake_netbox.server import FakeNetBox, Faults, create_app
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="In-memory fake NetBox")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the jitter")
+    parser.add_argument("--snapshot", type=Path, help="JSON snapshot to load")
+    args = parser.parse_args(argv)
+
+    fake = FakeNetBox(
+        Faults(args.latency_ms, args.jitter_ms, args.error_rate), seed=args.seed
+    )
+    if args.snapshot:
+        fake.load(json.loads(args.snapshot.read_text(encoding="utf-8")))
+    uvicorn.run(create_app(fake), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""ASGI app serving the in-memory tables with NetBox's REST conventions."""
+
+import asyncio
+import random
+from collections import Counter
+from dataclasses import asdict, dataclass, fields
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from fake_netbox.tables import Table, ValidationError, create_tables
+
+NETBOX_VERSION = "4.2.0"
+# Below 4.6, so pynetbox paginates with limit/offset like against a real 4.2
+API_VERSION = "4.2"
+PAGINATE_COUNT = 50
+MAX_PAGE_SIZE = 1000
+
+
+@dataclass
+class Faults:
+    """Injected latency and failures, applied to every /api/ request."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+
+    def update(self, data: dict) -> None:
+        """Set the given fields, keeping the others."""
+        for item in fields(self):
+            if item.name in data:
+                setattr(self, item.name, type(item.default)(data[item.name]))
+
+
+class FakeNetBox:
+    """State of a fake NetBox: tables, fault settings and request counters."""
+
+    def __init__(self, faults: Faults | None = None, seed: int | None = None) -> None:
+        self.tables = create_tables()
+        self.faults = faults or Faults()
+        self.stats: Counter[str] = Counter()
+        self._random = random.Random(seed)
+
+    def table(self, app: str, model: str) -> Table | None:
+        """Table of an /api/{app}/{model}/ endpoint, if supported."""
+        return self.tables.get(f"{app}/{model}")
+
+    async def inject_faults(self) -> Response | None:
+        """Sleep for the configured latency and maybe fail the request."""
+        faults = self.faults
+        delay = faults.latency_ms
+        if faults.jitter_ms:
+            delay += self._random.uniform(-faults.jitter_ms, faults.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if faults.error_rate and self._random.random() < faults.error_rate:
+            self.stats["injected_errors"] += 1
+            return JSONResponse(
+                {"detail": "Injected fault"}, status_code=faults.error_status
+            )
+        return None
+
+    def snapshot(self) -> dict[str, list[dict]]:
+        """Raw rows of every table, with references as IDs."""
+        return {
+            name: [dict(row) for row in table.rows.values()]
+            for name, table in self.tables.items()
+        }
+
+    def load(self, snapshot: dict[str, list[dict]]) -> None:
+        """Replace all tables with a snapshot, keeping IDs and timestamps."""
+        self.tables = create_tables()
+        for name, rows in snapshot.items():
+            if name not in self.tables:
+                raise ValueError(f"Unknown table: {name}")
+            for row in rows:
+                self.tables[name].insert(dict(row), row_id=row["id"])
+
+
+def _base_url(request: Request) -> str:
+    return str(request.base_url) + "api/"
+
+
+def _paginate(request: Request, rows: list) -> tuple[list, str | None, str | None]:
+    """Slice a result set and build NetBox's absolute next/previous links."""
+    params = request.query_params
+    limit = int(params.get("limit", PAGINATE_COUNT))
+    limit = MAX_PAGE_SIZE if limit == 0 else min(limit, MAX_PAGE_SIZE)
+    offset = int(params.get("offset", 0))
+
+    def link(new_offset: int) -> str:
+        return str(request.url.include_query_params(limit=limit, offset=new_offset))
+
+    next_url = link(offset + limit) if offset + limit < len(rows) else None
+    previous = link(max(offset - limit, 0)) if offset > 0 else None
+    return rows[offset : offset + limit], next_url, previous
+
+
+def _render(fake: FakeNetBox, table: Table, request: Request, row: dict) -> dict:
+    if request.query_params.get("brief", "").lower() in ("1", "true"):
+        return table.nested(row, _base_url(request))
+    return table.serialize(row, fake.tables, _base_url(request))
+
+
+def _errors(error: ValidationError) -> JSONResponse:
+    return JSONResponse(error.errors, status_code=400)
+
+
+async def _with_faults(request: Request, handler) -> Response:
+    fake: FakeNetBox = request.app.state.fake
+    fake.stats["requests"] += 1
+    failure = await fake.inject_faults()
+    if failure is not None:
+        return failure
+    return await handler(request, fake)
+
+
+async def api_root(request: Request) -> Response:
+    """API root, whose API-Version header pynetbox uses to pick pagination."""
+
+    async def handler(request: Request, fake: FakeNetBox) -> Response:
+        apps = sorted({name.split("/")[0] for name in fake.tables})
+        return JSONResponse(
+            {app: f"{_base_url(request)}{app}/" for app in apps},
+            headers={"API-Version": API_VERSION},
+        )
+
+    return await _with_faults(request, handler)
+
+
+async def api_status(request: Request) -> Response:
+    """NetBox's /api/status/ endpoint."""
+
+    async def handler(request: Request, fake: FakeNetBox) -> Response:
+        return JSONResponse(
+            {"netbox-version": NETBOX_VERSION, "fake": True},
+            headers={"API-Version": API_VERSION},
+        )
+
+    return await _with_faults(request, handler)
+
+
+async def list_view(request: Request) -> Response:
+    """List, create, bulk update and bulk delete objects of a model."""
+
+    async def handler(request: Request, fake: FakeNetBox) -> Response:
+        table = fake.table(request.path_params["app"], request.path_params["model"])
+        if table is None:
+            return JSONResponse({"detail": "Not found."}, status_code=404)
+        fake.stats[f"{request.method} {table.name}"] += 1
+
+        if request.method == "GET":
+            try:
+                rows = table.filter(
+                    list(request.query_params.multi_items()), fake.tables
+                )
+            except ValidationError as error:
+                return _errors(error)
+            page, next_url, previous = _paginate(request, rows)
+            return JSONResponse(
+                {
+                    "count": len(rows),
+                    "next": next_url,
+                    "previous": previous,
+                    "results": [_render(fake, table, request, row) for row in page],
+                }
+            )
+
+        payload = await request.json()
+        if request.method == "POST":
+            return _create(fake, table, request, payload)
+        if not isinstance(payload, list):
+            return JSONResponse({"detail": "Expected a list of objects."}, 400)
+        if request.method == "DELETE":
+            ids = [item["id"] if isinstance(item, dict) else item for item in payload]
+            missing = [row_id for row_id in ids if row_id not in table.rows]
+            if missing:
+                return JSONResponse({"detail": f"Not found: {missing}"}, 404)
+            for row_id in ids:
+                table.delete(row_id)
+            return Response(status_code=204)
+        return _bulk_update(fake, table, request, payload)
+
+    return await _with_faults(request, handler)
+
+
+def _create(fake: FakeNetBox, table: Table, request: Request, payload) -> Response:
+    """Create one object, or a list of them all-or-nothing."""
+    items = payload if isinstance(payload, list) else [payload]
+    created: list[dict] = []
+    try:
+        for item in items:
+            created.append(table.insert(table.clean(item, fake.tables, None)))
+    except ValidationError as error:
+        for row in created:
+            table.delete(row["id"])
+        if not isinstance(payload, list):
+            return _errors(error)
+        results = [{}] * len(created) + [error.errors]
+        return JSONResponse(results, status_code=400)
+    results = [_render(fake, table, request, row) for row in created]
+    return JSONResponse(results if isinstance(payload, list) else results[0], 201)
+
+
+def _bulk_update(fake: FakeNetBox, table: Table, request: Request, items) -> Response:
+    """Apply a list of {"id": ..., field: value} updates all-or-nothing."""
+    missing = [item.get("id") for item in items if item.get("id") not in table.rows]
+    if missing:
+        return JSONResponse({"detail": f"Not found: {missing}"}, 404)
+    try:
+        cleaned = [table.clean(item, fake.tables, item["id"]) for item in items]
+    except ValidationError as error:
+        return _errors(error)
+    updated = [
+        table.update(item["id"], changes)
+        for item, changes in zip(items, cleaned, strict=True)
+    ]
+    return JSONResponse([_render(fake, table, request, row) for row in updated])
+
+
+async def detail_view(request: Request) -> Response:
+    """Get, update or delete a single object."""
+
+    async def handler(request: Request, fake: FakeNetBox) -> Response:
+        table = fake.table(request.path_params["app"], request.path_params["model"])
+        row_id = request.path_params["id"]
+        if table is None or row_id not in table.rows:
+            return JSONResponse({"detail": "Not found."}, status_code=404)
+        fake.stats[f"{request.method} {table.name}"] += 1
+
+        if request.method == "DELETE":
+            table.delete(row_id)
+            return Response(status_code=204)
+        if request.method in ("PATCH", "PUT"):
+            try:
+                changes = table.clean(await request.json(), fake.tables, row_id)
+            except ValidationError as error:
+                return _errors(error)
+            table.update(row_id, changes)
+        return JSONResponse(_render(fake, table, request, table.rows[row_id]))
+
+    return await _with_faults(request, handler)
+
+
+async def faults_view(request: Request) -> Response:
+    """Read or change the injected faults (never subject to them)."""
+    fake: FakeNetBox = request.app.state.fake
+    if request.method == "PUT":
+        fake.faults.update(await request.json())
+    return JSONResponse(asdict(fake.faults))
+
+
+async def snapshot_view(request: Request) -> Response:
+    """Export all tables, or replace them with an exported snapshot."""
+    fake: FakeNetBox = request.app.state.fake
+    if request.method == "PUT":
+        try:
+            fake.load(await request.json())
+        except (KeyError, ValueError, ValidationError) as error:
+            return JSONResponse({"detail": str(error)}, status_code=400)
+    return JSONResponse(fake.snapshot())
+
+
+async def stats_view(request: Request) -> Response:
+    """Request counters, per method and table; DELETE resets them."""
+    fake: FakeNetBox = request.app.state.fake
+    if request.method == "DELETE":
+        fake.stats.clear()
+    return JSONResponse(dict(fake.stats))
+
+
+def create_app(fake: FakeNetBox | None = None) -> Starlette:
+    """Create the ASGI app; the state is available as ``app.state.fake``."""
+    app = Starlette(
+        routes=[
+            Route("/api/", api_root),
+            Route("/api/status/", api_status),
+            Route(
+                "/api/{app}/{model}/",
+                list_view,
+                methods=["GET", "POST", "PATCH", "PUT", "DELETE"],
+            ),
+            Route(
+                "/api/{app}/{model}/{id:int}/",
+                detail_view,
+                methods=["GET", "PATCH", "PUT", "DELETE"],
+            ),
+            Route("/_fake/faults", faults_view, methods=["GET", "PUT"]),
+            Route("/_fake/snapshot", snapshot_view, methods=["GET", "PUT"]),
+            Route("/_fake/stats", stats_view, methods=["GET", "DELETE"]),
+        ]
+    )
+    app.state.fake = fake or FakeNetBox()
+    return app
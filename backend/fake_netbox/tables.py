@@ -0,0 +1,486 @@
+"""In-memory NetBox tables: storage, nested serialization and filtering."""
+
+import ipaddress
+import operator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+STATUS_LABELS = {
+    "active": "Active",
+    "container": "Container",
+    "deprecated": "Deprecated",
+    "reserved": "Reserved",
+    "planned": "Planned",
+    "staging": "Staging",
+    "offline": "Offline",
+    "failed": "Failed",
+    "decommissioning": "Decommissioning",
+    "retired": "Retired",
+    "available": "Available",
+}
+
+# Query parameters that are not field filters
+CONTROL_PARAMS = {"limit", "offset", "brief", "ordering", "fields", "exclude"}
+# Filters of models with a CIDR field
+NETWORK_FILTERS = {"within", "within_include", "parent", "mask_length"}
+# Comparison lookups, as in last_updated__gte=<ISO timestamp>
+LOOKUPS = {"gt": operator.gt, "gte": operator.ge, "lt": operator.lt, "lte": operator.le}
+
+
+class ValidationError(ValueError):
+    """A write NetBox would reject with 400, as {field: [messages]}."""
+
+    def __init__(self, errors: dict[str, list[str]]) -> None:
+        super().__init__(errors)
+        self.errors = errors
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Shape of a NetBox model."""
+
+    required: tuple[str, ...]
+    defaults: dict[str, Any] = field(default_factory=dict)
+    # Foreign key field -> referenced table
+    foreign: dict[str, str] = field(default_factory=dict)
+    unique: tuple[str, ...] = ()
+    # Fields of the nested (brief) representation, besides id/url/display
+    brief: tuple[str, ...] = ("name", "slug")
+    display: str = "name"
+    network: str | None = None  # CIDR field, for within/parent filters
+    # The CIDR field is a host address with its mask (IP addresses), so
+    # within/parent filters match the address rather than its network
+    host: bool = False
+
+
+_COMMON = {"description": "", "comments": "", "tags": [], "custom_fields": {}}
+
+SPECS: dict[str, TableSpec] = {
+    # NetBox 4.1 prefixes (as pinned in docker-compose.netbox.yml): 4.2
+    # replaced the site field with scope_type/scope_id
+    "ipam/prefixes": TableSpec(
+        required=("prefix",),
+        defaults={
+            **_COMMON,
+            "status": "active",
+            "site": None,
+            "tenant": None,
+            "vlan": None,
+            "role": None,
+            "is_pool": False,
+            "mark_utilized": False,
+        },
+        foreign={
+            "site": "dcim/sites",
+            "tenant": "tenancy/tenants",
+            "vlan": "ipam/vlans",
+            "role": "ipam/roles",
+        },
+        brief=("prefix",),
+        display="prefix",
+        network="prefix",
+    ),
+    "ipam/ip-addresses": TableSpec(
+        required=("address",),
+        defaults={**_COMMON, "status": "active", "tenant": None, "dns_name": ""},
+        foreign={"tenant": "tenancy/tenants"},
+        brief=("address",),
+        display="address",
+        network="address",
+        host=True,
+    ),
+    "ipam/vlans": TableSpec(
+        required=("vid", "name"),
+        defaults={
+            **_COMMON,
+            "status": "active",
+            "site": None,
+            "group": None,
+            "tenant": None,
+            "role": None,
+        },
+        foreign={
+            "site": "dcim/sites",
+            "group": "ipam/vlan-groups",
+            "tenant": "tenancy/tenants",
+            "role": "ipam/roles",
+        },
+        brief=("vid", "name"),
+    ),
+    "ipam/vlan-groups": TableSpec(
+        required=("name", "slug"),
+        defaults={**_COMMON, "min_vid": 1, "max_vid": 4094},
+        unique=("name", "slug"),
+    ),
+    "ipam/roles": TableSpec(
+        required=("name", "slug"),
+        defaults={**_COMMON, "weight": 1000},
+        unique=("name", "slug"),
+    ),
+    "dcim/sites": TableSpec(
+        required=("name", "slug"),
+        defaults={
+            **_COMMON,
+            "status": "active",
+            "facility": "",
+            "tenant": None,
+            "time_zone": None,
+            "physical_address": "",
+        },
+        foreign={"tenant": "tenancy/tenants"},
+        unique=("name", "slug"),
+    ),
+    "dcim/racks": TableSpec(
+        required=("name", "site"),
+        defaults={**_COMMON, "status": "active", "tenant": None, "u_height": 42},
+        foreign={"site": "dcim/sites", "tenant": "tenancy/tenants"},
+        brief=("name",),
+    ),
+    "dcim/devices": TableSpec(
+        required=("device_type", "role", "site"),
+        defaults={
+            **_COMMON,
+            "name": None,
+            "status": "active",
+            "rack": None,
+            "tenant": None,
+            "serial": "",
+            "position": None,
+        },
+        foreign={
+            "device_type": "dcim/device-types",
+            "role": "dcim/device-roles",
+            "site": "dcim/sites",
+            "rack": "dcim/racks",
+            "tenant": "tenancy/tenants",
+        },
+        brief=("name",),
+    ),
+    "dcim/device-roles": TableSpec(
+        required=("name", "slug"),
+        defaults={**_COMMON, "color": "9e9e9e", "vm_role": True},
+        unique=("name", "slug"),
+    ),
+    "dcim/device-types": TableSpec(
+        required=("manufacturer", "model", "slug"),
+        defaults={**_COMMON, "u_height": 1},
+        foreign={"manufacturer": "dcim/manufacturers"},
+        unique=("slug",),
+        brief=("model", "slug"),
+        display="model",
+    ),
+    "dcim/manufacturers": TableSpec(
+        required=("name", "slug"),
+        defaults={**_COMMON},
+        unique=("name", "slug"),
+    ),
+    "tenancy/tenants": TableSpec(
+        required=("name", "slug"),
+        defaults={**_COMMON, "group": None},
+        unique=("name", "slug"),
+    ),
+    "extras/tags": TableSpec(
+        required=("name", "slug"),
+        defaults={"description": "", "color": "9e9e9e"},
+        unique=("name", "slug"),
+        brief=("name", "slug", "color"),
+    ),
+}
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def _network(value: str, host: bool = False) -> tuple[int, int, int]:
+    """(version, first address, last address) of a prefix or interface.
+
+    With ``host``, the range of the interface's own address
+    ("10.0.0.5/16" -> 10.0.0.5 only) instead of its network.
+    """
+    interface = ipaddress.ip_interface(value)
+    if host:
+        return interface.version, int(interface.ip), int(interface.ip)
+    network = interface.network
+    return network.version, int(network.network_address), int(
+        network.broadcast_address
+    )
+
+
+def _filter_field(key: str) -> str:
+    """Field a filter applies to ("last_updated__gte" -> "last_updated")."""
+    name, _, lookup = key.rpartition("__")
+    return name if lookup in LOOKUPS else key
+
+
+def _comparable(key: str, value: Any) -> Any:
+    """Filter value or field in a form ordered as NetBox orders it."""
+    if key in ("created", "last_updated"):
+        return datetime.fromisoformat(str(value))
+    if isinstance(value, str) and value.lstrip("-").isdigit():
+        return int(value)
+    return value
+
+
+class Table:
+    """Records of one NetBox model, keyed by ID in creation order."""
+
+    def __init__(self, name: str, spec: TableSpec) -> None:
+        self.name = name
+        self.spec = spec
+        self.rows: dict[int, dict] = {}
+        self.next_id = 1
+        # CIDR field parsed once per write, for within/parent filters
+        self.networks: dict[int, tuple[int, int, int]] = {}
+
+    def clean(self, data: dict, tables: "dict[str, Table]", row_id: int | None) -> dict:
+        """Validate a create/update payload and normalize its references."""
+        errors: dict[str, list[str]] = {}
+        cleaned = {}
+        for key, value in data.items():
+            if key in ("id", "url", "display", "created", "last_updated"):
+                continue
+            if key in self.spec.foreign and value is not None:
+                ref = tables[self.spec.foreign[key]].resolve(value, tables)
+                if ref is None:
+                    errors[key] = [f"Related object not found using {value}."]
+                    continue
+                value = ref
+            elif key == "tags":
+                value = self._tag_ids(value or [], tables["extras/tags"], errors)
+            elif isinstance(value, dict) and "value" in value:
+                value = value["value"]  # choice fields echoed back by clients
+            cleaned[key] = value
+
+        if row_id is None:
+            for key in self.spec.required:
+                if cleaned.get(key) in (None, ""):
+                    errors[key] = ["This field is required."]
+        if self.spec.network and self.spec.network in cleaned:
+            try:
+                _network(str(cleaned[self.spec.network]))
+            except ValueError:
+                errors[self.spec.network] = ["Enter a valid IPv4 or IPv6 address."]
+        for key in self.spec.unique:
+            if key in cleaned and any(
+                other_id != row_id and row.get(key) == cleaned[key]
+                for other_id, row in self.rows.items()
+            ):
+                errors[key] = [f"{self.name} with this {key} already exists."]
+        if errors:
+            raise ValidationError(errors)
+        return cleaned
+
+    def resolve(self, value, tables: "dict[str, Table]") -> int | None:
+        """ID of a reference given as an ID, {"id": ...} or attributes.
+
+        Attributes may follow foreign keys as NetBox's do, e.g.
+        ``{"vid": 100, "group__slug": "dc-01"}``; the first match wins.
+        """
+        if isinstance(value, dict) and "id" not in value:
+            return next(
+                (
+                    row_id
+                    for row_id, row in self.rows.items()
+                    if all(
+                        self._attribute(row, key, tables) == expected
+                        for key, expected in value.items()
+                    )
+                ),
+                None,
+            )
+        ref = value["id"] if isinstance(value, dict) else value
+        return ref if ref in self.rows else None
+
+    def _attribute(self, row: dict, key: str, tables: "dict[str, Table]"):
+        name, _, attribute = key.partition("__")
+        value = row.get(name)
+        if attribute and name in self.spec.foreign:
+            target = tables[self.spec.foreign[name]]
+            return target.rows[value].get(attribute) if value in target.rows else None
+        return value
+
+    @staticmethod
+    def _tag_ids(tags: list, table: "Table", errors: dict) -> list[int]:
+        ids = []
+        for tag in tags:
+            if isinstance(tag, dict) and "id" not in tag:
+                key = tag.get("slug", tag.get("name"))
+                match = next(
+                    (
+                        tag_id
+                        for tag_id, row in table.rows.items()
+                        if key in (row["slug"], row["name"])
+                    ),
+                    None,
+                )
+            else:
+                match = tag["id"] if isinstance(tag, dict) else tag
+            if match not in table.rows:
+                errors["tags"] = [f"Tag not found: {tag}"]
+            else:
+                ids.append(match)
+        return ids
+
+    def insert(self, cleaned: dict, row_id: int | None = None) -> dict:
+        """Insert a validated row, keeping its ID if given (snapshot loads)."""
+        row_id = row_id or self.next_id
+        self.next_id = max(self.next_id, row_id + 1)
+        now = _now()
+        row = {
+            **self.spec.defaults,
+            **cleaned,
+            "id": row_id,
+            "created": cleaned.get("created", now),
+            "last_updated": cleaned.get("last_updated", now),
+        }
+        self.rows[row_id] = row
+        self._index(row)
+        return row
+
+    def update(self, row_id: int, cleaned: dict) -> dict:
+        """Apply a validated partial update."""
+        row = self.rows[row_id]
+        row.update(cleaned, last_updated=_now())
+        self._index(row)
+        return row
+
+    def delete(self, row_id: int) -> None:
+        """Delete a row."""
+        del self.rows[row_id]
+        self.networks.pop(row_id, None)
+
+    def _index(self, row: dict) -> None:
+        if self.spec.network:
+            self.networks[row["id"]] = _network(
+                str(row[self.spec.network]), self.spec.host
+            )
+
+    def _filters(self) -> set[str]:
+        """Filter names this model accepts, besides comparison lookups."""
+        fields = {"id", "created", "last_updated", "q"}
+        fields |= set(self.spec.required) | set(self.spec.defaults)
+        fields |= {f"{key}_id" for key in self.spec.foreign}
+        if "tags" in fields:
+            fields.add("tag")
+        if self.spec.network:
+            fields |= NETWORK_FILTERS
+        return fields
+
+    def filter(
+        self, params: list[tuple[str, str]], tables: "dict[str, Table]"
+    ) -> list[dict]:
+        """Rows matching NetBox-style filters (repeated keys are ORed).
+
+        Raises:
+            ValidationError: For filters this fake does not implement, so
+                callers relying on one fail rather than get every row
+        """
+        grouped: dict[str, list[str]] = {}
+        for key, value in params:
+            if key not in CONTROL_PARAMS:
+                grouped.setdefault(key, []).append(value)
+
+        known = self._filters()
+        unknown = [key for key in grouped if _filter_field(key) not in known]
+        if unknown:
+            raise ValidationError({key: ["Unknown filter."] for key in unknown})
+
+        rows = list(self.rows.values())
+        for key, values in grouped.items():
+            rows = [row for row in rows if self._matches(row, key, values, tables)]
+        return rows
+
+    def _matches(self, row: dict, key: str, values: list[str], tables) -> bool:
+        if key == "q":
+            needle = values[0].lower()
+            return any(
+                needle in str(row.get(name) or "").lower()
+                for name in (self.spec.display, "description", "slug")
+            )
+        if key in ("within", "within_include", "parent") and self.spec.network:
+            version, first, last = self.networks[row["id"]]
+            for value in values:
+                p_version, p_first, p_last = _network(value)
+                inside = version == p_version and p_first <= first and last <= p_last
+                if key == "within" and (first, last) == (p_first, p_last):
+                    inside = False  # strictly within
+                if inside:
+                    return True
+            return False
+        if key == "mask_length" and self.spec.network:
+            length = str(row[self.spec.network]).split("/")[1]
+            return length in values
+        if key == "tag":
+            tags = tables["extras/tags"].rows
+            slugs = {tags[tag_id]["slug"] for tag_id in row["tags"]}
+            return any(value in slugs for value in values)
+        if key.endswith("_id") and key[:-3] in self.spec.foreign:
+            ref = row.get(key[:-3])
+            return any(
+                ref is None if value == "null" else str(ref) == value
+                for value in values
+            )
+        if key in self.spec.foreign:
+            ref = row.get(key)
+            if ref is None:
+                return "null" in values
+            target = tables[self.spec.foreign[key]].rows[ref]
+            names = (target.get("slug"), target.get("name"))
+            return any(value in names for value in values)
+        name, _, lookup = key.rpartition("__")
+        if lookup in LOOKUPS and name in row:
+            if row[name] is None:
+                return False
+            compare = LOOKUPS[lookup]
+            field_value = _comparable(name, row[name])
+            return any(
+                compare(field_value, _comparable(name, value)) for value in values
+            )
+        return any(
+            row.get(key) is None if value == "null" else str(row.get(key)) == value
+            for value in values
+        )
+
+    def nested(self, row: dict, base_url: str) -> dict:
+        """Brief representation, as used for foreign keys and ?brief=1."""
+        nested = {
+            "id": row["id"],
+            "url": f"{base_url}{self.name}/{row['id']}/",
+            "display": str(row.get(self.spec.display) or row["id"]),
+        }
+        for key in self.spec.brief:
+            nested[key] = row.get(key)
+        return nested
+
+    def serialize(self, row: dict, tables: "dict[str, Table]", base_url: str) -> dict:
+        """Full representation, with nested foreign keys and choice fields."""
+        data = dict(row)
+        data["url"] = f"{base_url}{self.name}/{row['id']}/"
+        data["display"] = str(row.get(self.spec.display) or row["id"])
+        for key, target in self.spec.foreign.items():
+            ref = row.get(key)
+            data[key] = (
+                tables[target].nested(tables[target].rows[ref], base_url)
+                if ref in tables[target].rows
+                else None
+            )
+        if "tags" in row:
+            tags = tables["extras/tags"]
+            data["tags"] = [
+                tags.nested(tags.rows[tag_id], base_url)
+                for tag_id in row["tags"]
+                if tag_id in tags.rows
+            ]
+        if "status" in row and row["status"] is not None:
+            data["status"] = {
+                "value": row["status"],
+                "label": STATUS_LABELS.get(row["status"], row["status"].title()),
+            }
+        return data
+
+
+def create_tables() -> dict[str, Table]:
+    """Create one empty table per supported model."""
+    return {name: Table(name, spec) for name, spec in SPECS.items()}
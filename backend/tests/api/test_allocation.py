@@ -0,0 +1,256 @@
+"""Tests for Allocation API endpoints."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+class TestAllocationPlan:
+    """Tests for allocation plan endpoints."""
+
+    def test_compact_plan_matches_full_plan(self, client):
+        """Test that the compact plan expands to the full plan."""
+        request = {"base_network": "10.0", "rack_count": 50}
+
+        full = client.post("/api/v1/allocation/plan", json=request).json()
+        compact = client.post("/api/v1/allocation/plan/compact", json=request).json()
+
+        assert compact["total_prefixes"] == full["total_prefixes"]
+        assert len(compact["host_subnet_ranges"]) == len(full["vlan_subnets"])
+
+        expanded = []
+        for host_range in compact["host_subnet_ranges"]:
+            response = client.post("/api/v1/allocation/plan/expand", json=host_range)
+            assert response.status_code == 200
+            expanded.extend(response.json())
+
+        assert expanded == full["host_subnets"]
+
+    def test_plan_warns_about_overflow(self, client):
+        """Test that racks beyond a VLAN subnet's capacity are planned."""
+        response = client.post(
+            "/api/v1/allocation/plan", json={"base_network": "10.0", "rack_count": 40}
+        )
+
+        data = response.json()
+        assert len(data["vlan_subnets"]) == 22
+        assert len(data["host_subnets"]) == 11 * 40
+        assert "overflow" in data["warnings"][0]
+
+    def test_plan_rejects_racks_below_minimum_subnet(self, client):
+        """Test that racks fitting only in tiny default subnets are a 400."""
+        response = client.post(
+            "/api/v1/allocation/plan", json={"base_network": "10.0", "rack_count": 257}
+        )
+
+        assert response.status_code == 400
+        assert "hosts_per_rack" in response.json()["detail"]
+
+    def test_expand_invalid_range(self, client):
+        """Test that expanding an out-of-bounds range fails."""
+        response = client.post(
+            "/api/v1/allocation/plan/expand",
+            json={
+                "parent_prefix": "10.0.8.0/21",
+                "prefix_length": 26,
+                "start_index": 0,
+                "count": 33,
+            },
+        )
+        assert response.status_code == 400
+
+    def test_expand_count_capped(self, client):
+        """Test that a range fitting a huge parent is still capped per request."""
+        response = client.post(
+            "/api/v1/allocation/plan/expand",
+            json={
+                "parent_prefix": "10.0.0.0/8",
+                "prefix_length": 30,
+                "start_index": 0,
+                "count": 4194304,
+            },
+        )
+        assert response.status_code == 422
+
+
+class TestCapacitySimulation:
+    """Tests for the capacity planning simulation endpoint."""
+
+    def test_simulate(self, client):
+        """Test simulating sites against a pool."""
+        response = client.post(
+            "/api/v1/allocation/simulate",
+            json={"pool": "10.0.0.0/15", "site_count": 3, "rack_count": 20},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["allocated_sites"] == 2
+        assert data["exhausted_at"] == 2
+        assert data["utilization"] == 100.0
+
+    def test_simulate_invalid_pool(self, client):
+        """Test that an invalid pool is rejected."""
+        response = client.post(
+            "/api/v1/allocation/simulate", json={"pool": "10.0.0.0/24"}
+        )
+        assert response.status_code == 400
+
+    def test_simulate_validates_rack_counts(self, client):
+        """Test that per-site rack counts get the same bounds as rack_count."""
+        response = client.post(
+            "/api/v1/allocation/simulate",
+            json={"pool": "10.0.0.0/8", "rack_counts": [-5, 0, 100000]},
+        )
+        assert response.status_code == 422
+
+    def test_simulate_hosts_per_rack(self, client):
+        """Test that the per-rack host demand sizes the simulated host subnets."""
+        body = {"pool": "10.0.0.0/16", "rack_counts": [20]}
+        default = client.post("/api/v1/allocation/simulate", json=body).json()
+        small = client.post(
+            "/api/v1/allocation/simulate", json={**body, "hosts_per_rack": 12}
+        ).json()
+
+        assert default["host_subnet_addresses"] == 11 * 20 * 64
+        assert small["host_subnet_addresses"] == 11 * 20 * 16
+
+
+class TestAllocationProfiles:
+    """Tests for picking allocation profiles by name."""
+
+    @pytest.fixture
+    def edge_profile(self, tmp_path):
+        """Register an 'edge' profile alongside the default one."""
+        from app.domain.allocation.profiles import get_allocation_profiles
+
+        (tmp_path / "edge.json").write_text(
+            json.dumps(
+                {
+                    "edge": {
+                        "prefix_sizes": {
+                            "container": 20,
+                            "vlan_subnet": 24,
+                            "host_subnet": 27,
+                        },
+                        "vlan_ranges": {"management": {"start": 100, "end": 199}},
+                        "vlans": [
+                            {"vid": 100, "name": "oob_bmc", "category": "management"}
+                        ],
+                    }
+                }
+            )
+        )
+        get_allocation_profiles.cache_clear()
+        with patch("app.domain.allocation.profiles.get_settings") as settings:
+            settings.return_value.allocation_profiles_path = str(tmp_path)
+            yield
+        get_allocation_profiles.cache_clear()
+
+    def test_plan_with_profile(self, client, edge_profile):
+        """Test that a plan follows the requested profile's layout."""
+        response = client.post(
+            "/api/v1/allocation/plan",
+            json={"base_network": "10.1", "rack_count": 2, "profile": "edge"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["container_prefix"] == "10.1.0.0/20"
+        assert [s["prefix"] for s in data["vlan_subnets"]] == ["10.1.1.0/24"]
+        assert [h["prefix"] for h in data["host_subnets"]] == [
+            "10.1.1.0/27",
+            "10.1.1.32/27",
+        ]
+
+        profiles = client.get("/api/v1/allocation/profiles").json()
+        assert [p["name"] for p in profiles] == ["default", "edge"]
+
+    def test_unknown_profile(self, client):
+        """Test that an unknown profile is rejected."""
+        response = client.get("/api/v1/allocation/vlan-ranges?profile=nope")
+        assert response.status_code == 404
+
+
+class TestSiteAllocation:
+    """Tests for complete site allocation."""
+
+    def test_dry_run_numbers_after_existing_sites(
+        self, client, mock_netbox_client, lease_store
+    ):
+        """Test that generated names continue the region's numbering."""
+        from app.domain.services.sequence_service import get_name_index
+
+        tenant, site = MagicMock(), MagicMock()
+        tenant.name, site.facility = "br-ne-1", "NE-DC-01"
+        mock_netbox_client.list_tenants.return_value = [tenant]
+        mock_netbox_client.list_sites.return_value = [site]
+        get_name_index.cache_clear()
+
+        response = client.post(
+            "/api/v1/allocation/site",
+            json={
+                "site_name": "Site Nordeste 2",
+                "region_code": "ne",
+                "base_network": "10.1",
+                "dry_run": True,
+            },
+        )
+        get_name_index.cache_clear()
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["tenant"]["name"] == "br-ne-2"
+        assert data["site"]["facility"] == "NE-DC-02"
+        assert lease_store.leased_keys("tenant:br-ne") == set()
+
+
+class TestBulkNaming:
+    """Tests for bulk name and slug generation."""
+
+    def test_collisions_get_suffixes(self, client, mock_netbox_client):
+        """Test that taken names get deterministic -2, -3 suffixes."""
+        from app.domain.services.naming_service import get_resource_name_index
+
+        rack, device, suffixed = MagicMock(), MagicMock(), MagicMock()
+        rack.name = "NE1-A02"
+        device.name = "leaf-ne1-01"
+        suffixed.name = "leaf-ne1-01-2"
+        mock_netbox_client.list_racks.return_value = [rack]
+        mock_netbox_client.list_devices.return_value = [device, suffixed]
+        get_resource_name_index.cache_clear()
+
+        response = client.post(
+            "/api/v1/allocation/naming/bulk",
+            json={
+                "items": [
+                    {"kind": "rack", "site_code": "ne1", "row": "a", "count": 3},
+                    {"kind": "device", "site_code": "ne1", "role": "leaf", "count": 2},
+                    {"kind": "device", "site_code": "NE1", "role": "LEAF", "count": 1},
+                ]
+            },
+        )
+        get_resource_name_index.cache_clear()
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [n["name"] for n in data["names"]] == [
+            "NE1-A01",
+            "NE1-A02-2",
+            "NE1-A03",
+            "leaf-ne1-01-3",
+            "leaf-ne1-02",
+            "leaf-ne1-01-4",
+        ]
+        assert data["names"][1]["slug"] == "ne1-a02-2"
+        assert data["collisions"] == 3
+        mock_netbox_client.list_racks.assert_called_once_with(brief=True)
+
+    def test_rack_requires_row(self, client):
+        """Test that rack series without a row are rejected."""
+        response = client.post(
+            "/api/v1/allocation/naming/bulk",
+            json={"items": [{"kind": "rack", "site_code": "NE1"}]},
+        )
+        assert response.status_code == 422
@@ -0,0 +1,113 @@
+"""Tests for the per-request NetBox call budget."""
+
+import logging
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.observability.budget import (
+    CallBudgetMiddleware,
+    NetBoxBudgetExceededError,
+    call_signature,
+    expect_netbox_calls,
+    netbox_budget,
+    record_netbox_usage,
+)
+
+
+def _netbox_call(url: str, size: int = 100) -> None:
+    """Feed a fake NetBox response to the response hook."""
+    response = MagicMock()
+    response.request.method = "GET"
+    response.request.url = url
+    response.headers = {"Content-Length": str(size)}
+    response.elapsed = timedelta(milliseconds=5)
+    record_netbox_usage(response)
+
+
+def _app(mode: str = "raise") -> FastAPI:
+    """App whose routes fetch one device per rack, the classic N+1."""
+    app = FastAPI()
+    app.add_middleware(CallBudgetMiddleware, max_calls=5, max_repeats=2, mode=mode)
+
+    @app.get("/racks")
+    async def racks(count: int = 2) -> dict:
+        for device_id in range(count):
+            _netbox_call(f"http://netbox/api/dcim/devices/{device_id}/")
+        return {}
+
+    @app.get("/bulk", dependencies=[Depends(netbox_budget(repeats=None))])
+    async def bulk(count: int = 2) -> dict:
+        return await racks(count)
+
+    @app.get("/expected")
+    async def expected(count: int = 2) -> dict:
+        expect_netbox_calls("GET", "dcim/devices", 5)
+        _netbox_call("http://netbox/api/dcim/racks/1/")
+        return await racks(count)
+
+    return app
+
+
+class TestCallBudget:
+    """Tests for NetBox call tallies, Server-Timing and budgets."""
+
+    def test_server_timing_header(self):
+        """Test that calls and bytes are reported in Server-Timing."""
+        response = TestClient(_app()).get("/racks", params={"count": 2})
+
+        assert response.status_code == 200
+        assert response.headers["server-timing"] == (
+            "netbox;dur=10.0, netbox-calls;desc=2, netbox-bytes;desc=200"
+        )
+
+    def test_repeated_calls_fail_in_raise_mode(self):
+        """Test that an N+1 loop fails the request in test mode."""
+        with pytest.raises(NetBoxBudgetExceededError, match="possible N\\+1"):
+            TestClient(_app()).get("/racks", params={"count": 3})
+
+    def test_repeated_calls_logged(self, caplog):
+        """Test that budget violations are only logged by default."""
+        with caplog.at_level(logging.WARNING, logger="app.observability.budget"):
+            response = TestClient(_app(mode="log")).get(
+                "/racks", params={"count": 6}
+            )
+
+        assert response.status_code == 200
+        assert "6 NetBox calls (budget 5)" in caplog.text
+        assert "6 x GET /api/dcim/devices/{id}/" in caplog.text
+
+    def test_route_budget_override(self):
+        """Test that a route can lift the repeat budget but keep the total."""
+        client = TestClient(_app())
+
+        assert client.get("/bulk", params={"count": 4}).status_code == 200
+        with pytest.raises(NetBoxBudgetExceededError, match="budget 5"):
+            client.get("/bulk", params={"count": 6})
+
+    def test_expected_calls(self):
+        """Test that expected calls scale both budgets for their endpoint only."""
+        client = TestClient(_app())
+
+        assert client.get("/expected", params={"count": 7}).status_code == 200
+        with pytest.raises(NetBoxBudgetExceededError, match="devices.*budget 7"):
+            client.get("/expected", params={"count": 8})
+
+    def test_call_signature(self):
+        """Test that IDs are grouped and follow-up pages are not repeats."""
+        assert call_signature("GET", "http://nb/api/dcim/devices/12/?brief=1") == (
+            "GET /api/dcim/devices/{id}/"
+        )
+        assert call_signature("GET", "http://nb/api/ipam/prefixes/?limit=0") == (
+            "GET /api/ipam/prefixes/"
+        )
+        assert call_signature("GET", "http://nb/api/ipam/prefixes/?offset=1000") is None
+
+    def test_app_reports_server_timing(self, client):
+        """Test that API responses carry the NetBox tally."""
+        response = client.get("/health")
+
+        assert "netbox-calls;desc=0" in response.headers["server-timing"]
@@ -0,0 +1,102 @@
+"""Tests for IP Address API endpoints."""
+
+from unittest.mock import MagicMock
+
+
+def make_ip(address: str) -> MagicMock:
+    """Build a NetBox IP address record."""
+    ip = MagicMock()
+    ip.id = 1
+    ip.address = address
+    ip.status.value = "active"
+    ip.description = ""
+    ip.dns_name = ""
+    ip.tenant = None
+    ip.tags = []
+    ip.created = "2025-12-05T10:00:00+00:00"
+    ip.last_updated = "2025-12-05T10:00:00+00:00"
+    return ip
+
+
+class TestAvailableIps:
+    """Tests for allocating available IPs within a prefix."""
+
+    def test_allocate_skips_used_and_leased(
+        self, client, mock_netbox_client, lease_store
+    ):
+        """Test that used and leased addresses are skipped in one bulk create."""
+        parent = MagicMock()
+        parent.prefix = "10.0.8.0/26"
+        mock_netbox_client.get_prefix.return_value = parent
+        mock_netbox_client.list_ip_addresses.return_value = [make_ip("10.0.8.1/26")]
+        mock_netbox_client.create_ip_addresses.side_effect = lambda data: [
+            make_ip(item["address"]) for item in data
+        ]
+        lease_store.reserve_key("ip", "10.0.8.2")
+
+        response = client.post("/api/v1/prefixes/1/available-ips?count=2")
+        assert response.status_code == 201
+        assert [ip["address"] for ip in response.json()] == [
+            "10.0.8.3/26",
+            "10.0.8.4/26",
+        ]
+        mock_netbox_client.create_ip_addresses.assert_called_once()
+
+    def test_allocate_sees_leases_of_overlapping_parents(
+        self, client, mock_netbox_client, lease_store
+    ):
+        """Test that an address leased from a /24 is skipped in its /26."""
+        parent = MagicMock()
+        parent.prefix = "10.0.8.0/26"
+        mock_netbox_client.get_prefix.return_value = parent
+        mock_netbox_client.list_ip_addresses.return_value = []
+        mock_netbox_client.create_ip_addresses.side_effect = lambda data: [
+            make_ip(item["address"]) for item in data
+        ]
+        lease_store.reserve_key("ip", "10.0.8.1")
+        lease_store.reserve_key("ip", "10.0.9.2")
+
+        response = client.post("/api/v1/prefixes/1/available-ips?count=2")
+        assert response.status_code == 201
+        assert [ip["address"] for ip in response.json()] == [
+            "10.0.8.2/26",
+            "10.0.8.3/26",
+        ]
+
+    def test_allocate_exhausted(self, client, mock_netbox_client, lease_store):
+        """Test that a prefix without enough free addresses returns a conflict."""
+        parent = MagicMock()
+        parent.prefix = "10.0.8.0/30"
+        mock_netbox_client.get_prefix.return_value = parent
+        mock_netbox_client.list_ip_addresses.return_value = []
+
+        response = client.post("/api/v1/prefixes/1/available-ips?count=3")
+        assert response.status_code == 409
+        mock_netbox_client.create_ip_addresses.assert_not_called()
+
+
+class TestUpdateIpAddress:
+    """Tests for updating IP addresses."""
+
+    def test_update_ip_address(self, client, mock_netbox_client):
+        """Test that a PATCH sends only the set fields to NetBox."""
+        ip = make_ip("10.0.8.1/26")
+        ip.description = "gateway"
+        mock_netbox_client.update_ip_address.return_value = ip
+
+        response = client.patch(
+            "/api/v1/ip-addresses/1",
+            json={"description": "gateway", "status": "reserved", "tenant_id": 3},
+        )
+        assert response.status_code == 200
+        assert response.json()["description"] == "gateway"
+        mock_netbox_client.update_ip_address.assert_called_once_with(
+            1, {"description": "gateway", "status": "reserved", "tenant": 3}
+        )
+
+    def test_update_ip_address_not_found(self, client, mock_netbox_client):
+        """Test updating a missing IP address."""
+        mock_netbox_client.update_ip_address.return_value = None
+
+        response = client.patch("/api/v1/ip-addresses/999", json={"dns_name": "x"})
+        assert response.status_code == 404
@@ -0,0 +1,80 @@
+"""Tests for the Prometheus metrics endpoint and instrumentation."""
+
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from prometheus_client import REGISTRY
+
+from app.observability.metrics import (
+    current_route,
+    netbox_endpoint,
+    observe_netbox_response,
+)
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetrics:
+    """Tests for route, NetBox and cache metrics."""
+
+    def test_route_latency_by_template(self, client):
+        """Test that requests are recorded under their route template."""
+        labels = {
+            "method": "POST",
+            "route": "/api/v1/allocation/plan/expand",
+            "status": "400",
+        }
+        before = _sample("ipam_http_request_duration_seconds_count", **labels)
+
+        client.post(
+            "/api/v1/allocation/plan/expand",
+            json={
+                "parent_prefix": "10.0.8.0/21",
+                "prefix_length": 26,
+                "start_index": 40,
+                "count": 1,
+            },
+        )
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert "ipam_http_requests_in_progress" in response.text
+        assert _sample("ipam_http_request_duration_seconds_count", **labels) == (
+            before + 1
+        )
+
+    def test_netbox_calls_by_endpoint(self):
+        """Test that NetBox responses are counted per route and endpoint."""
+        response = MagicMock()
+        response.request.url = "http://netbox/api/ipam/prefixes/12/available-ips/"
+        response.request.method = "POST"
+        response.status_code = 201
+        response.elapsed = timedelta(milliseconds=30)
+        labels = {"route": "/api/v1/prefixes/{prefix_id}", "endpoint": "ipam.prefixes"}
+        before = _sample("ipam_netbox_calls_total", **labels)
+
+        token = current_route.set("/api/v1/prefixes/{prefix_id}")
+        try:
+            observe_netbox_response(response)
+        finally:
+            current_route.reset(token)
+
+        assert _sample("ipam_netbox_calls_total", **labels) == before + 1
+        assert netbox_endpoint("http://nb/api/dcim/devices/?limit=0") == "dcim.devices"
+
+    def test_cache_hits(self, client, mock_netbox_client, sample_prefix_response):
+        """Test that utilization cache lookups are counted."""
+        from app.domain.services import prefix_service
+
+        prefix_service._utilization_cache.invalidate()
+        mock_netbox_client.get_prefix.return_value = sample_prefix_response
+        mock_netbox_client.list_child_prefixes.return_value = []
+        before = _sample("ipam_cache_requests_total", cache="utilization", result="hit")
+
+        client.get("/api/v1/prefixes/1/utilization")
+        client.get("/api/v1/prefixes/1/utilization")
+
+        hits = _sample("ipam_cache_requests_total", cache="utilization", result="hit")
+        assert hits == before + 1
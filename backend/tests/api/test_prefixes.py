@@ -1,5 +1,7 @@
 """Tests for IP Prefix API endpoints."""
 
+import json
+
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -123,3 +125,288 @@ class TestPrefixDelete:
 
         response = client.delete("/api/v1/prefixes/999")
         assert response.status_code == 404
+
+
+class TestPrefixAllocateAvailable:
+    """Tests for allocating the next available child prefix."""
+
+    def test_allocate_skips_used_and_leased(
+        self, client, mock_netbox_client, lease_store, sample_prefix_response
+    ):
+        """Test that used and leased blocks are skipped."""
+        parent = MagicMock()
+        parent.prefix = "10.0.0.0/16"
+        used = MagicMock()
+        used.prefix = "10.0.0.0/24"
+        mock_netbox_client.get_prefix.return_value = parent
+        mock_netbox_client.list_child_prefixes.return_value = [used]
+        mock_netbox_client.create_prefix.return_value = sample_prefix_response
+        lease_store.reserve_key("prefix", "10.0.1.0/24")
+
+        response = client.post(
+            "/api/v1/prefixes/1/available-prefixes", json={"prefix_length": 24}
+        )
+        assert response.status_code == 201
+        payload = mock_netbox_client.create_prefix.call_args.args[0]
+        assert payload["prefix"] == "10.0.2.0/24"
+        assert "10.0.2.0/24" in lease_store.leased_keys("prefix")
+
+    def test_allocate_sees_leases_of_overlapping_parents(
+        self, client, mock_netbox_client, lease_store, sample_prefix_response
+    ):
+        """Test that blocks leased under an enclosing parent are skipped."""
+        parent = MagicMock()
+        parent.prefix = "10.0.0.0/16"
+        mock_netbox_client.get_prefix.return_value = parent
+        mock_netbox_client.list_child_prefixes.return_value = []
+        mock_netbox_client.create_prefix.return_value = sample_prefix_response
+        # Leased by an allocation under 10.0.0.0/8: a /23 here, others elsewhere
+        for block in ("10.0.0.0/23", "10.1.0.0/24", "192.168.0.0/24"):
+            lease_store.reserve_key("prefix", block)
+
+        response = client.post(
+            "/api/v1/prefixes/1/available-prefixes", json={"prefix_length": 24}
+        )
+        assert response.status_code == 201
+        payload = mock_netbox_client.create_prefix.call_args.args[0]
+        assert payload["prefix"] == "10.0.2.0/24"
+
+        lease_store.reserve_key("prefix", "10.0.0.0/12")
+        response = client.post(
+            "/api/v1/prefixes/1/available-prefixes", json={"prefix_length": 24}
+        )
+        assert response.status_code == 409
+
+    def test_allocate_invalid_length(self, client, mock_netbox_client, lease_store):
+        """Test that a length that cannot fit the parent is a bad request."""
+        parent = MagicMock()
+        parent.prefix = "10.0.0.0/16"
+        mock_netbox_client.get_prefix.return_value = parent
+        mock_netbox_client.list_child_prefixes.return_value = []
+
+        response = client.post(
+            "/api/v1/prefixes/1/available-prefixes", json={"prefix_length": 64}
+        )
+        assert response.status_code == 400
+
+    def test_allocate_exhausted(self, client, mock_netbox_client, lease_store):
+        """Test that an exhausted parent returns a conflict."""
+        parent = MagicMock()
+        parent.prefix = "10.0.0.0/24"
+        used = MagicMock()
+        used.prefix = "10.0.0.0/24"
+        mock_netbox_client.get_prefix.return_value = parent
+        mock_netbox_client.list_child_prefixes.return_value = [used]
+
+        response = client.post(
+            "/api/v1/prefixes/1/available-prefixes", json={"prefix_length": 26}
+        )
+        assert response.status_code == 409
+
+
+class TestPrefixUtilization:
+    """Tests for prefix utilization reports."""
+
+    def test_utilization_cached_until_child_changes(
+        self, client, mock_netbox_client, sample_prefix_response
+    ):
+        """Test that reports are cached and invalidated by child creation."""
+        parent = MagicMock()
+        parent.id = 7
+        parent.prefix = "10.77.0.0/16"
+        child = MagicMock()
+        child.prefix = "10.77.0.0/17"
+        mock_netbox_client.get_prefix.return_value = parent
+        mock_netbox_client.list_child_prefixes.return_value = [child]
+
+        response = client.get("/api/v1/prefixes/7/utilization")
+        assert response.status_code == 200
+        assert response.json()["utilization"] == 50.0
+        client.get("/api/v1/prefixes/7/utilization")
+        assert mock_netbox_client.list_child_prefixes.call_count == 1
+
+        sample_prefix_response.prefix = "10.77.128.0/24"
+        mock_netbox_client.create_prefix.return_value = sample_prefix_response
+        client.post("/api/v1/prefixes/", json={"prefix": "10.77.128.0/24"})
+        client.get("/api/v1/prefixes/7/utilization")
+        assert mock_netbox_client.list_child_prefixes.call_count == 2
+
+    def test_utilization_invalidated_when_child_moves(
+        self, client, mock_netbox_client, sample_prefix_response
+    ):
+        """Test that moving a child drops the reports of its old parent."""
+        parent = MagicMock()
+        parent.id = 7
+        parent.prefix = "10.66.0.0/16"
+        child = MagicMock()
+        child.prefix = "10.66.0.0/17"
+        mock_netbox_client.list_child_prefixes.return_value = [child]
+        mock_netbox_client.get_prefix.return_value = parent
+        client.get("/api/v1/prefixes/7/utilization")
+
+        mock_netbox_client.get_prefix.return_value = child
+        sample_prefix_response.prefix = "10.88.0.0/17"
+        mock_netbox_client.update_prefix.return_value = sample_prefix_response
+        response = client.patch(
+            "/api/v1/prefixes/2", json={"prefix": "10.88.0.0/17"}
+        )
+        assert response.status_code == 200
+
+        mock_netbox_client.get_prefix.return_value = parent
+        client.get("/api/v1/prefixes/7/utilization")
+        assert mock_netbox_client.list_child_prefixes.call_count == 2
+
+    def test_site_utilization(self, client, mock_netbox_client):
+        """Test utilization of all containers of a site."""
+        container = MagicMock()
+        container.id = 8
+        container.prefix = "10.78.0.0/16"
+        mock_netbox_client.list_prefixes.return_value = [container]
+        mock_netbox_client.list_child_prefixes.return_value = []
+
+        response = client.get("/api/v1/prefixes/utilization?site_id=1")
+        assert response.status_code == 200
+        assert response.json()[0]["largest_free_block"] == "10.78.0.0/16"
+        mock_netbox_client.list_prefixes.assert_called_once_with(
+            site_id=1, status="container"
+        )
+
+
+class TestPrefixTree:
+    """Tests for the streamed prefix tree."""
+
+    def test_tree_streams_depth_first(self, client, mock_netbox_client):
+        """Test that the tree is streamed as NDJSON in depth-first order."""
+        records = []
+        flat = [(3, "10.0.8.0/26"), (1, "10.0.0.0/16"), (2, "10.0.8.0/21")]
+        for prefix_id, prefix in flat:
+            record = MagicMock()
+            record.id = prefix_id
+            record.prefix = prefix
+            record.status.value = "active"
+            record.description = ""
+            records.append(record)
+        mock_netbox_client.list_prefixes.return_value = records
+
+        response = client.get("/api/v1/prefixes/tree?site_id=1")
+        assert response.status_code == 200
+        nodes = [json.loads(line) for line in response.text.splitlines()]
+        assert [(n["id"], n["parent_id"], n["depth"]) for n in nodes] == [
+            (1, None, 0),
+            (2, 1, 1),
+            (3, 2, 2),
+        ]
+
+    def test_tree_requires_scope(self, client, mock_netbox_client):
+        """Test that a site or root prefix is required."""
+        response = client.get("/api/v1/prefixes/tree")
+        assert response.status_code == 400
+
+
+class TestPrefixLookup:
+    """Tests for batch longest-prefix-match lookups."""
+
+    def test_lookup_batch(self, client, mock_netbox_client):
+        """Test that each address resolves to its most specific prefix."""
+        from app.domain.services.lookup_service import get_prefix_lookup_index
+
+        get_prefix_lookup_index.cache_clear()
+        container = MagicMock()
+        container.id = 1
+        container.prefix = "10.0.0.0/16"
+        container.vlan = None
+        container.site.id = 5
+        container.tenant = None
+        container.last_updated = "2025-12-05T10:00:00+00:00"
+        subnet = MagicMock()
+        subnet.id = 2
+        subnet.prefix = "10.0.8.0/21"
+        subnet.vlan.id = 9
+        subnet.vlan.vid = 100
+        subnet.site.id = 5
+        subnet.tenant = None
+        subnet.last_updated = "2025-12-05T10:00:00+00:00"
+        mock_netbox_client.list_prefixes.return_value = [container, subnet]
+
+        response = client.post(
+            "/api/v1/prefixes/lookup",
+            json={"addresses": ["10.0.8.1", "10.0.1.1", "192.168.0.1"]},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert (data[0]["prefix_id"], data[0]["vlan_vid"]) == (2, 100)
+        assert (data[1]["prefix_id"], data[1]["site_id"]) == (1, 5)
+        assert data[2]["prefix"] is None
+        get_prefix_lookup_index.cache_clear()
+
+    def test_lookup_duplicate_prefix_owners(self):
+        """Test that a duplicated prefix stays indexed until its last owner goes."""
+        from app.domain.services.lookup_service import PrefixLookupIndex
+
+        lookup_index = PrefixLookupIndex(refresh_seconds=60, rebuild_seconds=600)
+        records = []
+        for prefix_id in (7, 3):
+            record = MagicMock()
+            record.id = prefix_id
+            record.prefix = "10.0.8.0/24"
+            record.vlan = record.site = record.tenant = None
+            record.last_updated = "2025-12-05T10:00:00+00:00"
+            records.append(record)
+        client = MagicMock()
+        client.list_prefixes.return_value = records
+        lookup_index.refresh(client)
+
+        assert lookup_index.index.lookup("10.0.8.1")[1].prefix_id == 3
+        lookup_index.remove(3)
+        assert lookup_index.index.lookup("10.0.8.1")[1].prefix_id == 7
+        records[0].prefix = "10.0.9.0/24"
+        client.list_prefixes.return_value = [records[0]]
+        lookup_index._refreshed_at = 0.0
+        lookup_index.refresh(client)
+        assert lookup_index.index.lookup("10.0.8.1") is None
+        assert lookup_index.index.lookup("10.0.9.1")[1].prefix_id == 7
+
+    def test_lookup_invalid_address(self, client):
+        """Test that invalid addresses are rejected."""
+        response = client.post(
+            "/api/v1/prefixes/lookup", json={"addresses": ["not-an-ip"]}
+        )
+        assert response.status_code == 422
+
+
+class TestPrefixSummarize:
+    """Tests for route summarization endpoints."""
+
+    def test_summarize_posted(self, client):
+        """Test summarizing posted prefixes."""
+        response = client.post(
+            "/api/v1/prefixes/summarize",
+            json={"prefixes": ["10.0.0.0/25", "10.0.0.128/25"]},
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "input_count": 2,
+            "summary_count": 1,
+            "prefixes": ["10.0.0.0/24"],
+        }
+
+    def test_summarize_site(self, client, mock_netbox_client):
+        """Test summarizing the prefixes of a site."""
+        records = []
+        for prefix in ["10.0.8.0/22", "10.0.12.0/22"]:
+            record = MagicMock()
+            record.prefix = prefix
+            records.append(record)
+        mock_netbox_client.list_prefixes.return_value = records
+
+        response = client.get("/api/v1/prefixes/summarize?site_id=3")
+        assert response.status_code == 200
+        assert response.json()["prefixes"] == ["10.0.8.0/21"]
+        mock_netbox_client.list_prefixes.assert_called_once_with(site_id=3)
+
+    def test_summarize_invalid(self, client):
+        """Test that invalid prefixes are rejected."""
+        response = client.post(
+            "/api/v1/prefixes/summarize", json={"prefixes": ["bogus"]}
+        )
+        assert response.status_code == 422
@@ -0,0 +1,92 @@
+"""Tests for opt-in request profiling."""
+
+import json
+import pstats
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.domain.allocation.rules import AllocationRules
+from app.observability.profiling import ProfileStore, ProfilingMiddleware
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileStore(str(tmp_path / "profiles"), keep=2)
+
+
+@pytest.fixture
+def profiled_client(store):
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, token="s3cret", store=store)
+
+    @app.get("/plan")
+    async def plan() -> dict:
+        hosts = AllocationRules.plan_host_subnets("10.0", 40, 50)
+        return {"warnings": hosts.warnings}
+
+    return TestClient(app)
+
+
+class TestProfiling:
+    """Tests for profile capture, the ring buffer and downloads."""
+
+    def test_not_profiled_without_token(self, profiled_client, store):
+        """Test that requests without the right token are not profiled."""
+        assert "x-profile-id" not in profiled_client.get("/plan").headers
+        response = profiled_client.get("/plan", headers={"X-Profile-Token": "nope"})
+
+        assert "x-profile-id" not in response.headers
+        assert store.list() == []
+
+    def test_profile_captured(self, profiled_client, store):
+        """Test that a profiled request is stored as pstats and speedscope."""
+        response = profiled_client.get("/plan", headers={"X-Profile-Token": "s3cret"})
+        profile_id = response.headers["x-profile-id"]
+
+        [record] = store.list()
+        assert (record.id, record.path, record.status) == (profile_id, "/plan", 200)
+        stats = pstats.Stats(str(store.path(profile_id, "pstats")))
+        assert any(func[2] == "plan_host_subnets" for func in stats.stats)
+
+        speedscope = json.loads(store.path(profile_id, "speedscope").read_text())
+        [profile] = speedscope["profiles"]
+        assert len(profile["samples"]) == len(profile["weights"]) > 0
+        names = {frame["name"] for frame in speedscope["shared"]["frames"]}
+        assert "plan_host_subnets" in names
+
+    def test_ring_buffer(self, profiled_client, store):
+        """Test that only the newest profiles are kept."""
+        ids = [
+            profiled_client.get("/plan?profile_token=s3cret").headers["x-profile-id"]
+            for _ in range(3)
+        ]
+
+        assert [record.id for record in store.list()] == ids[:0:-1]
+        assert store.path(ids[0], "pstats") is None
+
+    def test_download(self, client, profiled_client, store):
+        """Test that profiles are listed and downloaded with the admin token."""
+        response = profiled_client.get("/plan", headers={"X-Profile-Token": "s3cret"})
+        profile_id = response.headers["x-profile-id"]
+        headers = {"X-Profile-Token": "s3cret"}
+        settings = MagicMock(profiling_token="s3cret")
+
+        with (
+            patch("app.api.debug.get_settings", return_value=settings),
+            patch("app.api.debug.get_profile_store", return_value=store),
+        ):
+            assert client.get("/debug/profiles").status_code == 404
+            listing = client.get("/debug/profiles", headers=headers).json()
+            speedscope = client.get(f"/debug/profiles/{profile_id}", headers=headers)
+            raw = client.get(
+                f"/debug/profiles/{profile_id}?format=pstats", headers=headers
+            )
+            missing = client.get("/debug/profiles/0123456789abcdef", headers=headers)
+
+        assert [record["id"] for record in listing] == [profile_id]
+        assert speedscope.json()["exporter"] == "ipam-backend"
+        assert raw.content == store.path(profile_id, "pstats").read_bytes()
+        assert missing.status_code == 404
@@ -0,0 +1,66 @@
+"""Tests for startup instrumentation and lazily imported routers."""
+
+import json
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+from app.observability.startup import StartupReport
+
+DEFERRED = ("pynetbox", "requests", "numpy", "app.api.debug")
+
+
+class TestStartup:
+    """Tests for the startup report, deferred imports and the lazy router."""
+
+    def test_report(self, tmp_path, monkeypatch):
+        """Test the import breakdown, phases and readiness."""
+        (tmp_path / "startup_outer.py").write_text("import startup_inner\n")
+        (tmp_path / "startup_inner.py").write_text("import time; time.sleep(0.01)\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        report = StartupReport()
+
+        report.imports.install()
+        import startup_outer  # noqa: F401
+        report.imports.uninstall()
+        with report.phase("warmup"):
+            pass
+        report.mark_ready()
+
+        inner, outer = report.imports.modules
+        assert (inner.name, outer.name) == ("startup_inner", "startup_outer")
+        assert inner.self_seconds >= 0.01
+        assert outer.cumulative_seconds >= inner.cumulative_seconds
+        assert outer.self_seconds < inner.self_seconds
+        data = report.as_dict(top=1)
+        assert data["imports"]["slowest"][0]["name"] == "startup_outer"
+        assert list(data["imports"]["by_package"]) == ["startup_inner"]
+        assert [phase["name"] for phase in data["phases"]] == ["warmup"]
+        assert data["ready_seconds"] >= data["phases"][0]["offset_seconds"]
+
+    def test_cold_import_defers_heavy_modules(self):
+        """Test that importing app.main leaves rarely needed modules unimported."""
+        probe = (
+            "import json, sys; import app.main; "
+            f"print(json.dumps([m for m in {DEFERRED!r} if m in sys.modules]))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+        )
+
+        assert json.loads(result.stdout.splitlines()[-1]) == []
+
+    def test_lazy_debug_router(self, client):
+        """Test that /debug is imported on its first request and reports startup."""
+        settings = MagicMock(profiling_token="s3cret")
+        with client, patch("app.api.debug.get_settings", return_value=settings):
+            assert client.get("/debug/startup").status_code == 404
+            response = client.get(
+                "/debug/startup?top=3", headers={"X-Profile-Token": "s3cret"}
+            )
+
+        data = response.json()
+        assert response.status_code == 200
+        assert data["ready_seconds"] is not None
+        assert len(data["imports"]["slowest"]) <= 3
+        assert "/debug/startup" not in client.get("/openapi.json").json()["paths"]
@@ -0,0 +1,147 @@
+"""Tests for OpenTelemetry tracing."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from opentelemetry import trace
+from requests.adapters import HTTPAdapter
+
+from app.api.v1 import allocation
+from app.config import Settings
+from app.observability.tracing import (
+    TracingMiddleware,
+    configure_tracing,
+    trace_session,
+    tracer,
+)
+
+sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+
+_exporter = InMemorySpanExporter()
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+@pytest.fixture
+def spans():
+    """Record finished spans in memory."""
+    if not isinstance(trace.get_tracer_provider(), sdk_trace.TracerProvider):
+        provider = sdk_trace.TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(_exporter))
+        trace.set_tracer_provider(provider)
+    _exporter.clear()
+    yield _exporter
+
+
+@pytest.fixture
+def traced_client():
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware)
+    app.include_router(allocation.router, prefix="/api/v1/allocation")
+    return TestClient(app)
+
+
+def _by_name(exporter):
+    """Finished spans of this app (not FastAPI's own) by name."""
+    return {
+        span.name: span
+        for span in exporter.get_finished_spans()
+        if span.instrumentation_scope.name == "ipam"
+    }
+
+
+def _ancestors(exporter, span):
+    """Span IDs of the ancestors of a span."""
+    by_id = {s.context.span_id: s for s in exporter.get_finished_spans()}
+    ids = []
+    while span.parent is not None:
+        ids.append(span.parent.span_id)
+        span = by_id.get(span.parent.span_id)
+        if span is None:
+            break
+    return ids
+
+
+class TestTracing:
+    """Tests for route, allocation and NetBox spans."""
+
+    def test_route_and_planning_spans(self, traced_client, spans):
+        """Test that planning steps are nested in the route span of the trace."""
+        response = traced_client.post(
+            "/api/v1/allocation/plan",
+            json={"base_network": "10.0", "rack_count": 4},
+            headers={"traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-01"},
+        )
+
+        assert response.status_code == 200
+        recorded = _by_name(spans)
+        server = recorded["POST /api/v1/allocation/plan"]
+        assert format(server.context.trace_id, "032x") == TRACE_ID
+        assert server.attributes["http.response.status_code"] == 200
+        for step in (
+            "AllocationRules.generate_vlan_subnets",
+            "AllocationRules.plan_host_subnets",
+        ):
+            assert server.context.span_id in _ancestors(spans, recorded[step])
+
+    def test_execute_stages(self, traced_client, spans):
+        """Test that each execution stage gets its own span."""
+        with patch("app.api.v1.allocation.get_netbox_client") as get_client:
+            get_client.return_value = MagicMock()
+            response = traced_client.post(
+                "/api/v1/allocation/execute",
+                json={"base_network": "10.0", "rack_count": 2, "dry_run": False},
+            )
+
+        assert response.status_code == 200
+        recorded = _by_name(spans)
+        assert recorded["allocation.execute.host_subnets"].attributes == {
+            "allocation.count": len(response.json()["host_subnets"])
+        }
+        for stage in ("plan", "container", "vlans", "vlan_subnets"):
+            assert f"allocation.execute.{stage}" in recorded
+
+    def test_netbox_call_propagates_context(self, spans):
+        """Test that NetBox calls are traced and carry the trace context."""
+        session = requests.Session()
+        trace_session(session)
+        reply = requests.Response()
+        reply.status_code = 200
+
+        with (
+            patch.object(HTTPAdapter, "send", return_value=reply) as send,
+            tracer.start_as_current_span("route") as parent,
+        ):
+            session.get("http://netbox/api/ipam/prefixes/?limit=0")
+
+        sent = send.call_args.args[0]
+        client_span = _by_name(spans)["NetBox GET ipam.prefixes"]
+        trace_id = format(parent.get_span_context().trace_id, "032x")
+        assert sent.headers["traceparent"].split("-")[1] == trace_id
+        assert client_span.parent.span_id == parent.get_span_context().span_id
+        assert client_span.attributes["http.response.status_code"] == 200
+
+    def test_file_exporter(self, tmp_path):
+        """Test that spans are written to the trace file as JSON lines."""
+        path = tmp_path / "traces.jsonl"
+        settings = Settings(
+            tracing_exporter="file", tracing_file_path=str(path), tracing_sample_ratio=1
+        )
+        with patch("app.observability.tracing.trace.set_tracer_provider") as install:
+            configure_tracing(settings)
+        provider = install.call_args.args[0]
+
+        with provider.get_tracer("test").start_as_current_span("allocation"):
+            pass
+        provider.shutdown()
+
+        [line] = path.read_text().splitlines()
+        assert json.loads(line)["name"] == "allocation"
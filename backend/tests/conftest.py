@@ -1,9 +1,16 @@
 """Pytest fixtures for IPAM Backend tests."""
 
+import os
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock, patch
 
+# Fail requests that exceed their NetBox call budget instead of logging them
+os.environ.setdefault("NETBOX_BUDGET_MODE", "raise")
+# No NetBox to warm up against; tests needing warmup enable it themselves
+os.environ.setdefault("WARMUP_ENABLED", "false")
+
 
 @pytest.fixture
 def client():
@@ -15,12 +22,39 @@ def client():
 @pytest.fixture
 def mock_netbox_client():
     """Mock NetBox client for testing."""
-    with patch("app.domain.services.prefix_service.get_netbox_client") as mock:
-        mock_client = MagicMock()
+    mock_client = MagicMock()
+    with (
+        patch("app.domain.services.prefix_service.get_netbox_client") as mock,
+        patch("app.domain.services.ip_address_service.get_netbox_client") as ip_mock,
+        patch("app.domain.services.lookup_service.get_netbox_client") as lookup_mock,
+        patch("app.domain.services.sequence_service.get_netbox_client") as seq_mock,
+        patch("app.domain.services.naming_service.get_netbox_client") as naming_mock,
+    ):
         mock.return_value = mock_client
+        ip_mock.return_value = mock_client
+        lookup_mock.return_value = mock_client
+        seq_mock.return_value = mock_client
+        naming_mock.return_value = mock_client
         yield mock_client
 
 
+@pytest.fixture
+def lease_store(tmp_path):
+    """Lease store backed by a temporary SQLite file."""
+    from app.infrastructure.leases.store import LeaseStore
+
+    store = LeaseStore(str(tmp_path / "leases.sqlite3"))
+    with (
+        patch("app.domain.services.prefix_service.get_lease_store") as mock,
+        patch("app.domain.services.ip_address_service.get_lease_store") as ip_mock,
+        patch("app.domain.services.sequence_service.get_lease_store") as seq_mock,
+    ):
+        mock.return_value = store
+        ip_mock.return_value = store
+        seq_mock.return_value = store
+        yield store
+
+
 @pytest.fixture
 def sample_prefix_data():
     """Sample prefix data for testing."""
@@ -0,0 +1 @@
+"""Domain layer tests."""
@@ -0,0 +1,85 @@
+"""Tests for the prefix inventory audit."""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.domain.allocation.audit import (  # noqa: E402
+    PrefixArrays,
+    PrefixRecord,
+    audit_prefixes,
+)
+
+
+class TestAuditPrefixes:
+    """Tests for duplicate and overlap detection."""
+
+    def test_duplicates_per_vrf(self):
+        """Test that duplicates are reported only within the same VRF."""
+        report = audit_prefixes(
+            [
+                PrefixRecord(1, "10.0.8.0/21"),
+                PrefixRecord(2, "10.0.8.0/21"),
+                PrefixRecord(3, "10.0.8.0/21", vrf_id=7),
+            ]
+        )
+
+        assert report.duplicate_count == 1
+        finding = report.findings[0]
+        assert (finding.kind, finding.prefix_id, finding.other_prefix_id) == (
+            "duplicate",
+            2,
+            1,
+        )
+
+    def test_overlap_across_sites(self):
+        """Test that nesting is reported only across sites or tenants."""
+        report = audit_prefixes(
+            [
+                PrefixRecord(1, "10.0.0.0/16", site_id=1),
+                PrefixRecord(2, "10.0.8.0/21", site_id=1),
+                PrefixRecord(3, "10.0.8.64/26", site_id=2),
+                PrefixRecord(4, "10.0.8.0/26"),
+                PrefixRecord(5, "2001:db8::/32", tenant_id=1),
+                PrefixRecord(6, "2001:db8:1::/48", tenant_id=2),
+            ]
+        )
+
+        assert report.duplicate_count == 0
+        assert [(f.prefix_id, f.other_prefix_id) for f in report.findings] == [
+            (3, 2),
+            (6, 5),
+        ]
+        assert report.findings[0].detail == "site 2 inside site 1"
+
+    def test_limit(self):
+        """Test that counts stay exact when findings are truncated."""
+        records = [PrefixRecord(i, "10.0.0.0/24") for i in range(5)]
+        report = audit_prefixes(records, limit=2)
+
+        assert report.duplicate_count == 4
+        assert len(report.findings) == 2
+
+    def test_bulk_parse_matches_prefix_parser(self):
+        """Test that bulk-parsed IPv4 prefixes equal the per-prefix parse."""
+        prefixes = ["10.0.8.5/21", "0.0.0.0/0", "255.255.255.255/32", "10.1.2.3/8"]
+        mixed = [*prefixes, "2001:db8::1/64", "10.2.0.0"]
+
+        bulk = PrefixArrays([PrefixRecord(i, p) for i, p in enumerate(prefixes)])
+        slow = PrefixArrays([PrefixRecord(i, p) for i, p in enumerate(mixed)])
+
+        assert bulk.lo.tolist() == slow.lo[:4].tolist() == [
+            0x0A000800,
+            0,
+            0xFFFFFFFF,
+            0x0A000000,
+        ]
+        assert bulk.length.tolist() == [21, 0, 32, 8]
+        assert slow.family.tolist() == [4, 4, 4, 4, 6, 4]
+        assert (slow.lo[5], slow.length[5]) == (0x0A020000, 32)
+
+    def test_invalid_prefix(self):
+        """Test that invalid prefixes are rejected by either parser."""
+        for prefix in ("10.0.0.0/33", "10.0.0/24", "10.0.0.256/32"):
+            with pytest.raises(ValueError):
+                PrefixArrays([PrefixRecord(1, "10.0.0.0/24"), PrefixRecord(2, prefix)])
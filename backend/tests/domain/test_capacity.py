@@ -0,0 +1,58 @@
+"""Tests for capacity planning simulation."""
+
+import pytest
+
+from app.domain.allocation.capacity import simulate_site_capacity
+
+
+class TestSimulateSiteCapacity:
+    """Tests for replaying site allocations against a pool."""
+
+    def test_exhaustion_point(self):
+        """Test that a /14 holds four /16 site containers."""
+        report = simulate_site_capacity("10.0.0.0/14", [20] * 6)
+
+        assert report.allocated_sites == 4
+        assert report.exhausted_at == 4
+        assert report.requested_sites == 6
+        assert report.remaining_sites == 0
+        assert report.free_addresses == 0
+        assert report.free_blocks == {}
+
+    def test_reserved_space_fragments_pool(self):
+        """Test that containers skip around reserved prefixes."""
+        report = simulate_site_capacity(
+            "10.0.0.0/14", [10, 40], reserved=["10.0.5.0/24", "10.2.0.0/16"]
+        )
+
+        # 10.0.0.0/16 and 10.2.0.0/16 are blocked, so sites land on .1 and .3
+        assert report.allocated_sites == 2
+        assert report.exhausted_at is None
+        assert report.remaining_sites == 0
+        assert report.largest_free_block == "10.0.128.0/17"
+        assert report.free_addresses == 65536 - 256
+        # 40 racks spill into one overflow /21 per VLAN
+        assert report.under_provisioned_sites == 0
+        assert report.vlan_subnet_addresses == (11 + 22) * 2048
+        assert report.host_subnet_addresses == 11 * (10 + 40) * 64
+
+    def test_under_provisioned_sites(self):
+        """Test shrinking host subnets, then counting sites that still do not fit."""
+        report = simulate_site_capacity("10.0.0.0/14", [64, 65, 1025])
+
+        assert report.under_provisioned_sites == 1
+        # /26, /27 (65 racks) and /30 host subnets (1024 of 1025 racks)
+        assert report.host_subnet_addresses == 11 * (64 * 64 + 65 * 32 + 1024 * 4)
+
+    def test_remaining_capacity(self):
+        """Test counting the sites that still fit after the replay."""
+        report = simulate_site_capacity("10.0.0.0/8", [20] * 10)
+
+        assert report.exhausted_at is None
+        assert report.remaining_sites == 246
+        assert report.utilization == round(100 * 10 / 256, 2)
+
+    def test_invalid_pool(self):
+        """Test that pools smaller than a container are rejected."""
+        with pytest.raises(ValueError):
+            simulate_site_capacity("10.0.0.0/20", [1])
@@ -0,0 +1,71 @@
+"""Tests for longest-prefix-match lookups."""
+
+from unittest.mock import MagicMock
+
+from app.domain.allocation.lpm import PrefixIndex
+from app.domain.services.lookup_service import PrefixLookupIndex
+
+
+def make_prefix(prefix_id: int, prefix: str, updated: str) -> MagicMock:
+    """Build a NetBox prefix record."""
+    record = MagicMock()
+    record.id = prefix_id
+    record.prefix = prefix
+    record.vlan = None
+    record.site = None
+    record.tenant = None
+    record.last_updated = updated
+    return record
+
+
+class TestPrefixIndex:
+    """Tests for the prefix index."""
+
+    def test_longest_match_wins(self):
+        """Test that the most specific prefix is returned."""
+        index = PrefixIndex()
+        index.insert("10.0.0.0/16", "container")
+        index.insert("10.0.8.0/21", "vlan")
+        index.insert("10.0.8.64/26", "rack")
+        index.insert("2001:db8::/32", "v6")
+
+        assert index.lookup("10.0.8.70") == ("10.0.8.64/26", "rack")
+        assert index.lookup("10.0.9.1/24") == ("10.0.8.0/21", "vlan")
+        assert index.lookup("10.0.200.1") == ("10.0.0.0/16", "container")
+        assert index.lookup("2001:db8::1") == ("2001:db8::/32", "v6")
+        assert index.lookup("192.168.0.1") is None
+
+    def test_remove(self):
+        """Test that removing a prefix falls back to its parent."""
+        index = PrefixIndex()
+        index.insert("10.0.0.0/16", "container")
+        index.insert("10.0.8.0/21", "vlan")
+
+        index.remove("10.0.8.0/21")
+
+        assert index.lookup("10.0.8.1") == ("10.0.0.0/16", "container")
+        assert len(index) == 1
+
+
+class TestPrefixLookupIndex:
+    """Tests for incremental index refresh."""
+
+    def test_incremental_refresh_moves_updated_prefix(self):
+        """Test that refreshes only fetch prefixes changed since the watermark."""
+        client = MagicMock()
+        client.list_prefixes.return_value = [
+            make_prefix(1, "10.0.0.0/16", "2025-12-05T10:00:00+00:00"),
+        ]
+        lookup_index = PrefixLookupIndex(refresh_seconds=0, rebuild_seconds=3600)
+        lookup_index.refresh(client)
+
+        client.list_prefixes.return_value = [
+            make_prefix(1, "10.1.0.0/16", "2025-12-05T11:00:00+00:00"),
+        ]
+        lookup_index.refresh(client)
+
+        client.list_prefixes.assert_called_with(
+            last_updated__gte="2025-12-05T10:00:00+00:00"
+        )
+        assert lookup_index.index.lookup("10.0.0.1") is None
+        assert lookup_index.index.lookup("10.1.0.1")[1].prefix_id == 1
@@ -0,0 +1,87 @@
+"""Tests for data-driven allocation profiles."""
+
+import json
+
+import pytest
+
+from app.domain.allocation.profiles import load_profiles
+from app.domain.allocation.rules import AllocationRules, VlanCategory
+
+EDGE_PROFILE = """
+edge:
+  description: Small edge site
+  prefix_sizes: {container: 20, vlan_subnet: 24, host_subnet: 27}
+  vlan_ranges:
+    management: {start: 100, end: 199, description: Management Fabric}
+  vlans:
+    - {vid: 100, name: oob_bmc, description: OOB/BMC, category: management}
+    - {vid: 102, name: oam, description: OAM, category: management}
+"""
+
+
+class TestDefaultProfile:
+    """Tests for the compiled lookups of the built-in profile."""
+
+    def test_indexed_lookups(self):
+        """Test VLAN definition and category lookups by VID."""
+        assert AllocationRules.get_vlan_definition(253).name == "block_storage"
+        assert AllocationRules.get_vlan_definition(150) is None
+        assert AllocationRules.get_vlan_category(150) == VlanCategory.MANAGEMENT
+        assert AllocationRules.get_vlan_category(299) == VlanCategory.DATA
+        assert AllocationRules.get_vlan_category(200) is None
+        assert AllocationRules.get_vlan_category(5000) is None
+
+
+class TestLoadProfiles:
+    """Tests for loading and compiling profile files."""
+
+    def test_yaml_profile(self, tmp_path):
+        """Test that a YAML profile compiles into its own rules."""
+        pytest.importorskip("yaml")
+        (tmp_path / "edge.yaml").write_text(EDGE_PROFILE)
+
+        edge = load_profiles(tmp_path)["edge"]
+
+        assert edge.PROFILE_NAME == "edge"
+        assert edge.get_vlan_definition(102).name == "oam"
+        assert edge.get_vlan_category(250) is None
+        assert [a.prefix for a in edge.generate_vlan_subnets("10.1")] == [
+            "10.1.0.0/20",
+            "10.1.1.0/24",
+            "10.1.2.0/24",
+        ]
+        # The built-in profile is untouched
+        assert AllocationRules.get_vlan_definition(102).name == "oam"
+        assert AllocationRules.get_vlan_definition(250) is not None
+
+    def test_invalid_profile(self, tmp_path):
+        """Test that VLANs outside their category range are rejected."""
+        profile = {
+            "bad": {
+                "vlan_ranges": {"data": {"start": 250, "end": 299}},
+                "vlans": [{"vid": 100, "name": "oob", "category": "data"}],
+            }
+        }
+        path = tmp_path / "bad.json"
+        path.write_text(json.dumps(profile))
+
+        with pytest.raises(ValueError, match="outside the data range"):
+            load_profiles(path)
+
+    def test_vlan_subnets_must_fit_container(self, tmp_path):
+        """Test that a container too small for its VLAN subnets is rejected."""
+        profile = {
+            "tiny": {
+                "prefix_sizes": {"container": 24, "vlan_subnet": 25},
+                "vlan_ranges": {"data": {"start": 250, "end": 299}},
+                "vlans": [
+                    {"vid": 250, "name": "a", "category": "data"},
+                    {"vid": 251, "name": "b", "category": "data"},
+                ],
+            }
+        }
+        path = tmp_path / "tiny.json"
+        path.write_text(json.dumps(profile))
+
+        with pytest.raises(ValueError, match="do not fit"):
+            load_profiles(path)
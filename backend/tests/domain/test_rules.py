@@ -0,0 +1,106 @@
+"""Tests for allocation rules."""
+
+import pytest
+
+from app.domain.allocation.rules import AllocationRules, PrefixRange
+
+
+class TestHostSubnetRange:
+    """Tests for range-encoded host subnets."""
+
+    def test_range_matches_expansion(self):
+        """Test that expanding a range yields the classic host subnets."""
+        host_range = AllocationRules.generate_host_subnet_range("10.0.8.0/21", 3)
+        hosts = list(AllocationRules.expand_host_subnet_range(host_range))
+
+        assert host_range.count == 3
+        assert [h.prefix for h in hosts] == [
+            "10.0.8.0/26",
+            "10.0.8.64/26",
+            "10.0.8.128/26",
+        ]
+        assert hosts[0].description == "Rack 01 subnet"
+
+    def test_range_rejects_more_than_parent_capacity(self):
+        """Test that a /21 yields at most 32 /26 host subnets."""
+        host_range = AllocationRules.generate_host_subnet_range("10.0.8.0/21", 32)
+        assert host_range.count == 32
+
+        with pytest.raises(ValueError):
+            AllocationRules.generate_host_subnet_range("10.0.8.0/21", 33)
+
+    def test_expand_rejects_out_of_bounds_range(self):
+        """Test that a range larger than its parent is rejected."""
+        with pytest.raises(ValueError):
+            list(
+                AllocationRules.expand_host_subnet_range(
+                    PrefixRange("10.0.8.0/21", 26, start_index=30, count=5)
+                )
+            )
+
+
+class TestPlanHostSubnets:
+    """Tests for variable-size host subnet planning."""
+
+    def test_small_site_fits_vlan_subnets(self):
+        """Test that up to 32 racks need no overflow blocks."""
+        plan = AllocationRules.plan_host_subnets("10.0", 20)
+
+        assert plan.warnings == []
+        assert plan.overflow_subnets == []
+        assert len(plan.host_ranges) == len(AllocationRules.VLAN_DEFINITIONS)
+        assert plan.host_ranges[0].parent_prefix == "10.0.8.0/21"
+
+    def test_large_site_spills_into_overflow_blocks(self):
+        """Test that racks beyond 32 spill into an extra /21 per VLAN."""
+        plan = AllocationRules.plan_host_subnets("10.0", 50)
+        parents = {"10.0.8.0/21", "10.0.96.0/21"}  # VLAN 100 and its overflow
+        hosts = [h for h in plan.iter_host_subnets() if h.parent_prefix in parents]
+
+        assert plan.racks_per_vlan == 50
+        assert plan.overflow_subnets[0].prefix == "10.0.96.0/21"
+        assert plan.overflow_subnets[0].vlan_vid == 100
+        assert len(plan.overflow_subnets) == 11
+        assert len(hosts) == 50
+        assert hosts[32].prefix == "10.0.96.0/26"
+        assert hosts[32].description == "Rack 33 subnet"
+        assert len(plan.warnings) == 1
+
+    def test_host_demand_sizes_subnets(self):
+        """Test that per-rack host demand picks the host subnet length."""
+        assert AllocationRules.host_prefix_length(62) == 26
+        assert AllocationRules.host_prefix_length(63) == 25
+        plan = AllocationRules.plan_host_subnets("10.0", 250, hosts_per_rack=12)
+
+        assert plan.host_prefix_length == 28
+        assert plan.racks_per_vlan == 250
+
+        with pytest.raises(ValueError):
+            AllocationRules.host_prefix_length(4000)
+        with pytest.raises(ValueError, match="Only 256 of 300 racks"):
+            AllocationRules.plan_host_subnets("10.0", 300, hosts_per_rack=12)
+
+    def test_rack_count_shrinks_default_subnets(self):
+        """Test that racks beyond the /26 capacity get smaller host subnets."""
+        assert AllocationRules.plan_host_subnets("10.0", 64).host_prefix_length == 26
+        plan = AllocationRules.plan_host_subnets("10.0", 200)
+        hosts = list(plan.iter_host_subnets())
+
+        assert plan.host_prefix_length == 28
+        assert plan.racks_per_vlan == 200
+        assert len(hosts) == 11 * 200
+        assert "using /28" in plan.warnings[0]
+
+    def test_default_subnets_shrink_to_minimum(self):
+        """Test that default subnets stop shrinking at MIN_HOST_SUBNET_SIZE."""
+        assert AllocationRules.plan_host_subnets("10.0", 256).host_prefix_length == 28
+        with pytest.raises(ValueError, match="257 racks .* pass hosts_per_rack"):
+            AllocationRules.plan_host_subnets("10.0", 257)
+
+        plan = AllocationRules.plan_host_subnets("10.0", 1024, hosts_per_rack=2)
+        assert plan.host_prefix_length == 30
+
+        class TinyRacks(AllocationRules):
+            MIN_HOST_SUBNET_SIZE = 30
+
+        assert TinyRacks.plan_host_subnets("10.0", 1024).host_prefix_length == 30
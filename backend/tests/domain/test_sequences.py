@@ -0,0 +1,77 @@
+"""Tests for tenant and facility sequence numbering."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.domain.services.sequence_service import SequenceService, get_name_index
+
+
+def _named(**attrs):
+    record = MagicMock()
+    for key, value in attrs.items():
+        setattr(record, key, value)
+    return record
+
+
+@pytest.fixture
+def sequences(mock_netbox_client, lease_store):
+    """Sequence service over a fresh name index."""
+    mock_netbox_client.list_tenants.return_value = [
+        _named(name="br-ne-1"),
+        _named(name="br-ne-2"),
+        _named(name="br-ne-4"),
+        _named(name="br-se-1"),
+        _named(name="Acme Corp"),
+    ]
+    mock_netbox_client.list_sites.return_value = [
+        _named(facility="NE-DC-01"),
+        _named(facility=None),
+        _named(facility="SE-DC-03"),
+    ]
+    get_name_index.cache_clear()
+    yield SequenceService()
+    get_name_index.cache_clear()
+
+
+class TestSequenceService:
+    """Tests for handing out the next free numbers."""
+
+    def test_fills_lowest_free_number(self, sequences, mock_netbox_client):
+        """Test that numbers skip existing names and each other's leases."""
+        first, first_lease = sequences.next_tenant_name("br", "ne")
+        second, _ = sequences.next_tenant_name("br", "NE")
+        facility, _ = sequences.next_facility_code("ne")
+
+        assert first == "br-ne-3"
+        assert second == "br-ne-5"
+        assert facility == "NE-DC-02"
+        assert first_lease.scope == "tenant:br-ne"
+        # The index came from one listing of tenants and one of sites
+        mock_netbox_client.list_tenants.assert_called_once_with()
+        mock_netbox_client.list_sites.assert_called_once_with()
+
+    def test_leases_are_shared_across_workers(self, sequences):
+        """Test that a number leased by another worker is not handed out."""
+        other_worker = SequenceService()
+        other_worker.name_index = type(sequences.name_index)(ttl=300)
+
+        name, _ = sequences.next_tenant_name("br", "se")
+        other, _ = other_worker.next_tenant_name("br", "se")
+
+        assert (name, other) == ("br-se-2", "br-se-3")
+
+    def test_preview_does_not_reserve(self, sequences):
+        """Test that previews leave the number free."""
+        preview, lease = sequences.next_tenant_name("br", "n", reserve=False)
+        name, _ = sequences.next_tenant_name("br", "n")
+
+        assert lease is None
+        assert preview == name == "br-n-1"
+
+    def test_release_returns_number(self, sequences):
+        """Test that a released number is handed out again."""
+        name, lease = sequences.next_facility_code("SE")
+        sequences.release(lease)
+
+        assert sequences.next_facility_code("SE")[0] == name == "SE-DC-01"
@@ -0,0 +1,50 @@
+"""Tests for route summarization."""
+
+import ipaddress
+import random
+
+import pytest
+
+from app.domain.allocation.summarize import summarize_prefixes
+
+
+class TestSummarizePrefixes:
+    """Tests for collapsing prefixes into covering CIDRs."""
+
+    def test_merges_adjacent_and_nested(self):
+        """Test that adjacent and nested prefixes collapse per family."""
+        summary = summarize_prefixes(
+            [
+                "2001:db8:8000::/33",
+                "10.0.1.0/24",
+                "10.0.0.128/25",
+                "10.0.0.0/25",
+                "10.0.0.5/32",
+                "2001:db8::/33",
+                "10.0.3.0/24",
+            ]
+        )
+        assert summary == ["10.0.0.0/23", "10.0.3.0/24", "2001:db8::/32"]
+
+    def test_matches_ipaddress_collapse(self):
+        """Test equivalence with ipaddress.collapse_addresses."""
+        rng = random.Random(7)
+        prefixes = []
+        for _ in range(2000):
+            address = f"10.{rng.randrange(4)}.{rng.randrange(256)}.0"
+            length = rng.randint(20, 26)
+            prefixes.append(
+                str(ipaddress.ip_network(f"{address}/{length}", strict=False))
+            )
+        expected = [
+            str(n)
+            for n in ipaddress.collapse_addresses(
+                ipaddress.ip_network(p) for p in prefixes
+            )
+        ]
+        assert summarize_prefixes(prefixes) == expected
+
+    def test_invalid_prefix(self):
+        """Test that invalid prefixes raise an error."""
+        with pytest.raises(ValueError):
+            summarize_prefixes(["10.0.0.0/33"])
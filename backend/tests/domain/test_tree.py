@@ -0,0 +1,38 @@
+"""Tests for prefix tree construction."""
+
+from app.domain.allocation.tree import build_prefix_tree, walk_prefix_tree
+
+
+class TestPrefixTree:
+    """Tests for nesting and walking prefixes."""
+
+    def test_nesting_is_order_independent(self):
+        """Test that prefixes nest correctly regardless of input order."""
+        prefixes = [
+            "10.0.8.64/26",
+            "10.0.16.0/21",
+            "10.0.0.0/16",
+            "10.0.8.0/26",
+            "10.0.8.0/21",
+            "2001:db8::/32",
+        ]
+        walked = [
+            (node.prefix, depth, parent.prefix if parent else None)
+            for node, depth, parent in walk_prefix_tree(build_prefix_tree(prefixes))
+        ]
+
+        assert walked == [
+            ("10.0.0.0/16", 0, None),
+            ("10.0.8.0/21", 1, "10.0.0.0/16"),
+            ("10.0.8.0/26", 2, "10.0.8.0/21"),
+            ("10.0.8.64/26", 2, "10.0.8.0/21"),
+            ("10.0.16.0/21", 1, "10.0.0.0/16"),
+            ("2001:db8::/32", 0, None),
+        ]
+
+    def test_max_depth(self):
+        """Test that walking stops at the requested depth."""
+        roots = build_prefix_tree(["10.0.0.0/16", "10.0.8.0/21", "10.0.8.0/26"])
+        walked = [node.prefix for node, _, _ in walk_prefix_tree(roots, max_depth=1)]
+
+        assert walked == ["10.0.0.0/16", "10.0.8.0/21"]
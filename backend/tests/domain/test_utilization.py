@@ -0,0 +1,45 @@
+"""Tests for prefix utilization reporting."""
+
+from app.domain.allocation.utilization import UtilizationCache, compute_utilization
+
+
+class TestComputeUtilization:
+    """Tests for the utilization sweep."""
+
+    def test_nested_children_counted_once(self):
+        """Test that children nested in other children are not double counted."""
+        report = compute_utilization(
+            "10.0.0.0/16",
+            ["10.0.8.0/21", "10.0.8.0/26", "10.0.16.0/21", "10.0.0.0/26"],
+        )
+
+        assert report.used_addresses == 2 * 2048 + 64
+        assert report.free_addresses == 65536 - 4160
+        assert report.largest_free_block == "10.0.128.0/17"
+        assert report.free_blocks[26] == 1
+
+    def test_empty_and_full(self):
+        """Test reports for an empty and a fully used parent."""
+        empty = compute_utilization("10.0.0.0/24", [])
+        full = compute_utilization("10.0.0.0/24", ["10.0.0.0/25", "10.0.0.128/25"])
+
+        assert empty.free_blocks == {24: 1}
+        assert empty.utilization == 0.0
+        assert full.free_blocks == {}
+        assert full.largest_free_block is None
+        assert full.utilization == 100.0
+
+
+class TestUtilizationCache:
+    """Tests for utilization cache invalidation."""
+
+    def test_invalidate_parents_of_changed_prefix(self):
+        """Test that only parents containing the changed prefix are dropped."""
+        cache = UtilizationCache(ttl=60)
+        cache.put(compute_utilization("10.0.0.0/16", []))
+        cache.put(compute_utilization("10.1.0.0/16", []))
+
+        cache.invalidate("10.0.8.0/26")
+
+        assert cache.get("10.0.0.0/16") is None
+        assert cache.get("10.1.0.0/16") is not None
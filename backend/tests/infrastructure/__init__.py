@@ -0,0 +1 @@
+"""Infrastructure layer tests."""
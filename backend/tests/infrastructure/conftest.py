@@ -0,0 +1,30 @@
+"""Fixtures for infrastructure tests."""
+
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+
+from fake_netbox import FakeNetBox, create_app
+
+
+@pytest.fixture
+def fake():
+    """Fake NetBox served by uvicorn on a free local port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    state = FakeNetBox(seed=1)
+    server = uvicorn.Server(
+        uvicorn.Config(create_app(state), port=port, log_level="error")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    state.url = f"http://127.0.0.1:{port}"
+    yield state
+    server.should_exit = True
+    thread.join()
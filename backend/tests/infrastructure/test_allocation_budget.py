@@ -0,0 +1,50 @@
+"""NetBox call budget of allocation execution, against the fake NetBox."""
+
+from unittest.mock import patch
+
+import pytest
+from pynetbox.core.endpoint import Endpoint
+
+from app.config import Settings
+from app.infrastructure.netbox.client import NetBoxClient
+from app.observability.budget import NetBoxBudgetExceededError
+
+# More racks than the repeat budget, so the creates alone exceed it
+REQUEST = {"base_network": "10.42", "rack_count": 16, "create_vlans": True}
+
+
+@pytest.fixture
+def netbox(fake):
+    """Allocation routes talking to the fake NetBox."""
+    settings = Settings(netbox_url=fake.url, netbox_token="fake")
+    with patch("app.infrastructure.netbox.client.get_settings") as get_settings:
+        get_settings.return_value = settings
+        client = NetBoxClient()
+    with patch("app.api.v1.allocation.get_netbox_client", return_value=client):
+        yield client
+
+
+class TestAllocationBudget:
+    """Tests that execution may create per object but not look up per object."""
+
+    def test_execute_within_budget(self, client, netbox, fake):
+        """Test that one create per planned object fits the budget."""
+        response = client.post("/api/v1/allocation/execute", json=REQUEST)
+
+        assert response.status_code == 200
+        plan = response.json()
+        assert fake.stats["requests"] == plan["total_prefixes"] + plan["total_vlans"]
+
+    def test_execute_per_object_get_fails(self, client, netbox):
+        """Test that re-reading every created object is caught as an N+1."""
+        create = Endpoint.create
+
+        def create_and_reread(self, *args, **kwargs):
+            record = create(self, *args, **kwargs)
+            return self.get(record.id)
+
+        with (
+            patch.object(Endpoint, "create", create_and_reread),
+            pytest.raises(NetBoxBudgetExceededError, match="GET /api/ipam/"),
+        ):
+            client.post("/api/v1/allocation/execute", json=REQUEST)
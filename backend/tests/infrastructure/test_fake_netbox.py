@@ -0,0 +1,173 @@
+"""Tests for the in-memory fake NetBox, driven through pynetbox."""
+
+import time
+from unittest.mock import patch
+
+import httpx
+import pynetbox
+import pytest
+
+from app.config import Settings
+from app.infrastructure.netbox.client import NetBoxClient
+from fake_netbox import FakeNetBox
+
+
+@pytest.fixture
+def api(fake):
+    return pynetbox.api(fake.url, token="fake")
+
+
+class TestFakeNetBox:
+    """Tests for tables, pagination, bulk endpoints and faults."""
+
+    def test_crud_with_nested_references(self, api):
+        """Test that created objects come back with nested foreign keys."""
+        site = api.dcim.sites.create(name="Recife 01", slug="recife-01")
+        tag = api.extras.tags.create(name="Core", slug="core")
+        prefix = api.ipam.prefixes.create(
+            prefix="10.0.0.0/16", status="container", site=site.id, tags=[tag.id]
+        )
+
+        fetched = api.ipam.prefixes.get(prefix.id)
+        assert fetched.site.slug == "recife-01"
+        assert fetched.status.value == "container"
+        assert [t.slug for t in fetched.tags] == ["core"]
+
+        fetched.update({"description": "Region"})
+        assert api.ipam.prefixes.get(prefix.id).description == "Region"
+        assert fetched.delete()
+        assert api.ipam.prefixes.get(prefix.id) is None
+
+    def test_validation_errors(self, api):
+        """Test that missing, duplicate and dangling values are rejected."""
+        api.dcim.sites.create(name="Site", slug="site")
+
+        for data in (
+            {"name": "No slug"},
+            {"name": "Site", "slug": "other"},
+            {"name": "Other", "slug": "other", "tenant": 999},
+        ):
+            with pytest.raises(pynetbox.RequestError) as error:
+                api.dcim.sites.create(**data)
+            assert error.value.req.status_code == 400
+
+    def test_pagination_and_filters(self, api, fake):
+        """Test that pynetbox pages through results and filters apply."""
+        prefixes = [{"prefix": f"10.0.{i}.0/24"} for i in range(120)]
+        prefixes.append({"prefix": "10.1.0.0/24"})
+        api.ipam.prefixes.create(prefixes)
+        fake.stats.clear()
+
+        within = list(api.ipam.prefixes.filter(within="10.0.0.0/16", limit=50))
+        assert len({p.id for p in within}) == 120
+        assert fake.stats["GET ipam/prefixes"] == 3
+
+        page = httpx.get(f"{fake.url}/api/ipam/prefixes/", params={"limit": 50})
+        assert page.json()["count"] == 121
+        assert "offset=50" in page.json()["next"]
+        assert len(list(api.ipam.prefixes.filter(parent="10.1.0.0/16"))) == 1
+        assert len(list(api.ipam.prefixes.filter(mask_length=16))) == 0
+
+    def test_ip_address_filters(self, api):
+        """Test that IP addresses match prefixes by their own address."""
+        api.ipam.ip_addresses.create(address="10.0.0.5/16")
+
+        assert len(list(api.ipam.ip_addresses.filter(parent="10.0.0.0/24"))) == 1
+        assert len(list(api.ipam.ip_addresses.filter(parent="10.0.1.0/24"))) == 0
+
+    def test_last_updated_filter(self, api, fake):
+        """Test that last_updated__gte returns only rows changed since then."""
+        old = api.ipam.prefixes.create(prefix="10.2.0.0/24")
+        since = api.ipam.prefixes.create(prefix="10.2.1.0/24").last_updated
+        old.update({"description": "changed"})
+
+        changed = api.ipam.prefixes.filter(last_updated__gte=since)
+        assert sorted(str(p) for p in changed) == ["10.2.0.0/24", "10.2.1.0/24"]
+        newer = fake.table("ipam", "prefixes").rows[old.id]["last_updated"]
+        changed = api.ipam.prefixes.filter(last_updated__gt=newer)
+        assert list(changed) == []
+
+    def test_unknown_filter_rejected(self, fake):
+        """Test that filters the fake does not implement are a 400."""
+        response = httpx.get(
+            f"{fake.url}/api/ipam/prefixes/", params={"last_seen__gte": "x"}
+        )
+
+        assert response.status_code == 400
+        assert response.json() == {"last_seen__gte": ["Unknown filter."]}
+
+    def test_bulk_create_is_atomic(self, api):
+        """Test that one invalid object rejects the whole bulk create."""
+        with pytest.raises(pynetbox.RequestError):
+            api.ipam.ip_addresses.create(
+                [{"address": "10.0.0.1/24"}, {"address": "not-an-ip"}]
+            )
+
+        assert api.ipam.ip_addresses.count() == 0
+
+    def test_bulk_update_and_delete(self, api, fake):
+        """Test the list endpoint's PATCH and DELETE."""
+        created = api.ipam.vlans.create(
+            [{"vid": 100 + i, "name": f"VLAN{i}"} for i in range(3)]
+        )
+        url = f"{fake.url}/api/ipam/vlans/"
+
+        patched = httpx.patch(
+            url, json=[{"id": v.id, "status": "reserved"} for v in created]
+        )
+        assert {v["status"]["value"] for v in patched.json()} == {"reserved"}
+
+        deleted = httpx.request("DELETE", url, json=[{"id": created[0].id}])
+        assert deleted.status_code == 204
+        assert api.ipam.vlans.count() == 2
+
+    def test_injected_faults(self, fake):
+        """Test that latency and errors are injected into API requests."""
+        httpx.put(
+            f"{fake.url}/_fake/faults", json={"latency_ms": 50, "error_rate": 1}
+        )
+
+        started = time.perf_counter()
+        response = httpx.get(f"{fake.url}/api/ipam/prefixes/")
+
+        assert response.status_code == 503
+        assert time.perf_counter() - started >= 0.05
+        assert httpx.get(f"{fake.url}/_fake/stats").json()["injected_errors"] == 1
+
+    def test_snapshot_round_trip(self, api, fake):
+        """Test that a snapshot restores IDs and references."""
+        tenant = api.tenancy.tenants.create(name="br-ne-01", slug="br-ne-01")
+        api.dcim.sites.create(name="Site", slug="site", tenant=tenant.id)
+        snapshot = httpx.get(f"{fake.url}/_fake/snapshot").json()
+
+        restored = FakeNetBox()
+        restored.load(snapshot)
+
+        assert restored.snapshot() == snapshot
+
+    def test_backend_client(self, fake):
+        """Test the backend's NetBox client against the fake."""
+        settings = Settings(netbox_url=fake.url, netbox_token="fake")
+        with patch("app.infrastructure.netbox.client.get_settings") as get_settings:
+            get_settings.return_value = settings
+            client = NetBoxClient()
+
+        client.create_prefix({"prefix": "10.8.0.0/16", "status": "container"})
+        client.create_prefix({"prefix": "10.8.1.0/24"})
+
+        children = list(client.list_child_prefixes("10.8.0.0/16"))
+        assert [str(p) for p in children] == ["10.8.1.0/24"]
+
+    def test_backend_client_update_prefix(self, fake):
+        """Test that updating a prefix is one GET and one PATCH."""
+        settings = Settings(netbox_url=fake.url, netbox_token="fake")
+        with patch("app.infrastructure.netbox.client.get_settings") as get_settings:
+            get_settings.return_value = settings
+            client = NetBoxClient()
+        created = client.create_prefix({"prefix": "10.9.0.0/24"})
+        fake.stats.clear()
+
+        prefix = client.update_prefix(created.id, {"prefix": "10.9.1.0/24"})
+
+        assert str(prefix.prefix) == "10.9.1.0/24"
+        assert fake.stats["requests"] == 2
@@ -0,0 +1,52 @@
+"""Tests for the synthetic inventory generator."""
+
+import ipaddress
+
+from app.domain.allocation.naming import NamingConvention
+from benchmarks.inventory import generate, load_bulk, to_bulk
+
+
+class TestInventory:
+    """Tests for reproducibility, consistency and both output formats."""
+
+    def test_seed_is_reproducible(self):
+        """Test that a seed always gives the same inventory."""
+        first = generate(sites=3, racks=4, devices=4, seed=7).snapshot()
+
+        assert generate(sites=3, racks=4, devices=4, seed=7).snapshot() == first
+        assert generate(sites=3, racks=4, devices=4, seed=8).snapshot() != first
+
+    def test_scale_and_consistency(self):
+        """Test object counts, naming and prefix nesting per site."""
+        tables = generate(sites=4, racks=40, devices=3).tables
+
+        # Container, 11 VLAN subnets, 11 overflow blocks and 11 x 40 hosts
+        assert len(tables["ipam/prefixes"].rows) == 4 * (1 + 11 + 11 + 11 * 40)
+        assert len(tables["dcim/devices"].rows) == 4 * (2 + 40 * 3)
+
+        containers = {
+            row["site"]: ipaddress.ip_network(row["prefix"])
+            for row in tables["ipam/prefixes"].rows.values()
+            if row["status"] == "container"
+        }
+        assert len(set(containers.values())) == 4
+        for row in tables["ipam/prefixes"].rows.values():
+            assert ipaddress.ip_network(row["prefix"]).subnet_of(
+                containers[row["site"]]
+            )
+        for site in tables["dcim/sites"].rows.values():
+            tenant = tables["tenancy/tenants"].rows[site["tenant"]]
+            assert NamingConvention.parse_facility_code(site["facility"])
+            assert NamingConvention.parse_tenant_name(tenant["name"])
+
+    def test_bulk_file_loads(self, fake):
+        """Test that the bulk format loads through the API, references included."""
+        source = generate(sites=2, racks=2, devices=3)
+
+        load_bulk(to_bulk(source), fake.url, token="fake", chunk=50)
+
+        for name, table in source.tables.items():
+            assert len(fake.tables[name].rows) == len(table.rows), name
+        device = next(iter(fake.tables["dcim/devices"].rows.values()))
+        rack = fake.tables["dcim/racks"].rows[device["rack"]]
+        assert rack["site"] == device["site"]
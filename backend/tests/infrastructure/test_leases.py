@@ -0,0 +1,59 @@
+"""Tests for the cross-worker lease store."""
+
+import threading
+
+from app.infrastructure.leases.store import LeaseStore
+
+
+class TestLeaseStore:
+    """Tests for lease reservation."""
+
+    def test_reserve_key_is_exclusive(self, tmp_path):
+        """Test that a leased key cannot be reserved twice."""
+        path = str(tmp_path / "leases.sqlite3")
+        first, second = LeaseStore(path), LeaseStore(path)
+
+        assert first.reserve_key("prefix:10.0.0.0/16", "10.0.0.0/24") is not None
+        assert second.reserve_key("prefix:10.0.0.0/16", "10.0.0.0/24") is None
+        assert second.reserve_key("prefix:10.1.0.0/16", "10.0.0.0/24") is not None
+
+    def test_expired_lease_is_reclaimed(self, tmp_path):
+        """Test that an expired lease no longer blocks the key."""
+        store = LeaseStore(str(tmp_path / "leases.sqlite3"))
+
+        assert store.reserve_key("scope", "key", ttl=0) is not None
+        assert store.leased_keys("scope") == set()
+        assert store.reserve_key("scope", "key") is not None
+
+    def test_release(self, tmp_path):
+        """Test that releasing a lease frees its key."""
+        store = LeaseStore(str(tmp_path / "leases.sqlite3"))
+        lease = store.reserve_key("scope", "key")
+
+        store.release(lease)
+        assert store.leased_keys("scope") == set()
+
+    def test_concurrent_reservations_are_unique(self, tmp_path):
+        """Test that concurrent allocators never receive the same key."""
+        path = str(tmp_path / "leases.sqlite3")
+        candidates = [f"10.0.{i}.0/24" for i in range(64)]
+        results: list[str] = []
+
+        def allocate() -> None:
+            store = LeaseStore(path)
+            for _ in range(8):
+                lease = store.reserve(
+                    "scope",
+                    lambda leased: next(
+                        (c for c in candidates if c not in leased), None
+                    ),
+                )
+                results.append(lease.key)
+
+        threads = [threading.Thread(target=allocate) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(results) == sorted(candidates)
@@ -0,0 +1,151 @@
+"""Tests for the startup warmup, readiness and the reference data cache."""
+
+import time
+from collections.abc import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+from pynetbox.core.endpoint import Endpoint
+
+from app import main
+from app.config import get_settings
+from app.domain.services.reference_service import get_reference_data
+from app.domain.services.warmup_service import Warmup
+from app.infrastructure.netbox.client import NetBoxClient, get_netbox_client
+
+
+@pytest.fixture
+def netbox(fake, monkeypatch):
+    """Point the NetBox client and the app's reference cache at the fake."""
+    monkeypatch.setenv("NETBOX_URL", fake.url)
+    caches = (get_settings, get_netbox_client, get_reference_data)
+    for cache in caches:
+        cache.cache_clear()
+    yield fake
+    for cache in caches:
+        cache.cache_clear()
+
+
+@pytest.fixture
+def warmup(monkeypatch):
+    """Enable warmup in the app with a fresh, fast-retrying state."""
+    state = Warmup(connections=3, retry_seconds=0.05)
+    monkeypatch.setattr(main.settings, "warmup_enabled", True)
+    monkeypatch.setattr(main, "get_warmup", lambda: state)
+    return state
+
+
+def _wait_for(condition: Callable[[], object]) -> None:
+    """Wait up to 5s for the background warmup to reach a state."""
+    for _ in range(100):
+        if condition():
+            return
+        time.sleep(0.05)
+
+
+def _seed(fake) -> dict:
+    tag = fake.table("extras", "tags").insert({"name": "Core", "slug": "core"})
+    site = fake.table("dcim", "sites").insert(
+        {"name": "Site A", "slug": "site-a", "status": "active"}
+    )
+    fake.table("dcim", "device-roles").insert({"name": "Leaf", "slug": "leaf"})
+    fake.table("ipam", "vlan-groups").insert({"name": "VG A", "slug": "vg-a"})
+    return {"tag": tag["id"], "site": site["id"]}
+
+
+class TestWarmup:
+    """Tests for connection warmup, prefetching and /ready."""
+
+    def test_warm_connections(self, netbox):
+        """Test that warmup leaves one open pooled connection per request."""
+        netbox.faults.latency_ms = 50
+        client = NetBoxClient()
+
+        assert client.warm_connections(3) == 3
+
+        pools = client._api.http_session.get_adapter(netbox.url).poolmanager.pools
+        [pool] = [pools[key] for key in pools.keys()]  # noqa: SIM118 (not iterable)
+        idle = [connection for connection in pool.pool.queue if connection]
+        assert pool.num_connections == len(idle) == 3
+        assert netbox.stats["requests"] == 3
+
+    def test_ready_after_warmup(self, netbox, warmup):
+        """Test that /ready is 200 once warm, and lookups skip NetBox."""
+        ids = _seed(netbox)
+
+        with TestClient(main.app) as client:
+            _wait_for(lambda: warmup.ready)
+            ready = client.get("/ready")
+            netbox.stats.clear()
+            site = client.get(f"/api/v1/sites/{ids['site']}")
+            tag = client.get(f"/api/v1/tags/{ids['tag']}")
+
+        assert ready.status_code == 200
+        body = ready.json()
+        assert (body["status"], body["connections"]) == ("ready", 3)
+        assert body["reference_data"] == {
+            "roles": 1,
+            "tags": 1,
+            "vlan_groups": 1,
+            "sites": 1,
+        }
+        assert (site.json()["slug"], tag.json()["slug"]) == ("site-a", "core")
+        assert netbox.stats["requests"] == 0
+        phases = {phase.name for phase in main.startup.phases}
+        assert {"warmup connections", "warmup sites"} <= phases
+
+    def test_not_ready_until_netbox_answers(self, netbox, warmup):
+        """Test that /ready is 503 while warmup fails, and retries recover."""
+        netbox.faults.error_rate = 1.0
+
+        with TestClient(main.app) as client:
+            _wait_for(lambda: warmup.error)
+            health = client.get("/health")
+            warming = client.get("/ready")
+            netbox.faults.error_rate = 0.0
+            _wait_for(lambda: warmup.ready)
+            ready = client.get("/ready")
+
+        assert health.status_code == 200
+        assert warming.status_code == 503
+        assert warming.json()["status"] == "warming_up"
+        assert "503" in warming.json()["error"]
+        assert ready.status_code == 200
+        assert ready.json()["attempts"] > 1
+
+    def test_reference_cache_follows_writes(self, netbox):
+        """Test that created, updated and deleted sites update the cache."""
+        with TestClient(main.app) as client:
+            created = client.post(
+                "/api/v1/sites/", json={"name": "Site B", "slug": "site-b"}
+            ).json()
+            client.patch(
+                f"/api/v1/sites/{created['id']}", json={"description": "moved"}
+            )
+            netbox.stats.clear()
+            cached = client.get(f"/api/v1/sites/{created['id']}").json()
+            client.delete(f"/api/v1/sites/{created['id']}")
+            missing = client.get(f"/api/v1/sites/{created['id']}")
+
+        assert cached["description"] == "moved"
+        # Cached read; the delete's lookup and DELETE; the 404 from NetBox
+        assert netbox.stats["requests"] == 3
+        assert missing.status_code == 404
+
+    def test_site_deleted_during_update(self, netbox, monkeypatch):
+        """Test that a site gone after its update is a 404, not a cached None."""
+        with TestClient(main.app) as client:
+            created = client.post(
+                "/api/v1/sites/", json={"name": "Site C", "slug": "site-c"}
+            ).json()
+            site = get_netbox_client().dcim.sites.get(created["id"])
+            lookups = iter([site, None])
+            monkeypatch.setattr(
+                Endpoint, "get", lambda endpoint, *args, **kwargs: next(lookups)
+            )
+            updated = client.patch(
+                f"/api/v1/sites/{created['id']}", json={"description": "gone"}
+            )
+
+        assert updated.status_code == 404
+        assert ("sites", created["id"]) not in get_reference_data()._entries
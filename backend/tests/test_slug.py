@@ -0,0 +1,37 @@
+"""Tests for slug generation."""
+
+import pytest
+
+from app.utils.slug import generate_slug, generate_slugs, validate_slug
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("São Paulo", "sao-paulo"),
+        ("Produção Norte", "producao-norte"),
+        ("Área Técnica", "area-tecnica"),
+        ("  --Rack  A01__/ spine--", "rack-a01-spine"),
+        ("Straße Ærø", "strae-r"),  # no ASCII decomposition: dropped
+        ("Ｆｕｌｌ ｗｉｄｔｈ", "full-width"),  # outside the translation table
+        ("Café ½", "cafe-12"),
+        ("€€€", ""),
+    ],
+)
+def test_generate_slug(name, expected):
+    """Test slugs for accented, decomposable and unusual characters."""
+    assert generate_slug(name) == expected
+    assert generate_slugs([name]) == [expected]
+
+
+def test_predefined_slug_is_kept():
+    """Test that an explicit slug is returned as-is."""
+    assert generate_slug("São Paulo", "sp") == "sp"
+
+
+def test_validate_slug():
+    """Test slug format validation."""
+    assert validate_slug("sao-paulo-01")
+    assert not validate_slug("Sao-Paulo")
+    assert not validate_slug("sao--paulo")
+    assert not validate_slug("sao-paulo\n")